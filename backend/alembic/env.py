@@ -1,9 +1,7 @@
-import asyncio
 from logging.config import fileConfig
 
-from sqlalchemy import pool
+from sqlalchemy import engine_from_config, pool
 from sqlalchemy.engine import Connection
-from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
 
@@ -19,6 +17,8 @@ if config.config_file_name is not None:
 # add your model's MetaData object here
 # for 'autogenerate' support
 from app.db.base import Base
+# Registers op.create_materialized_view / op.drop_materialized_view
+import app.db.migration_ops  # noqa
 
 # Get the SQLAlchemy URL from environment or ini file
 from app.core.config import settings
@@ -69,30 +69,21 @@ def do_run_migrations(connection: Connection) -> None:
         context.run_migrations()
 
 
-async def run_async_migrations() -> None:
-    """In this scenario we need to create an Engine
-    and associate a connection with the context.
+def run_migrations_online() -> None:
+    """Run migrations in 'online' mode.
+
+    Alembic runs synchronously, so the migrations use a psycopg2 engine
+    on `sync_url` rather than the application's asyncpg engine.
 
     """
-    # Use sync engine instead of async for Alembic migrations
-    from sqlalchemy import create_engine
-    connectable = create_engine(sync_url)
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection,
-            target_metadata=target_metadata,
-            compare_type=True,
-        )
-
-        with context.begin_transaction():
-            context.run_migrations()
-
-
-def run_migrations_online() -> None:
-    """Run migrations in 'online' mode."""
-    # Use run_migrations directly rather than through async
-    run_async_migrations()
+        do_run_migrations(connection)
 
 
 if context.is_offline_mode():
@@ -0,0 +1,38 @@
+"""Composite indexes for keyset pagination
+
+Revision ID: 0002_keyset_pagination_indexes
+Revises: 0001_initial_tables
+Create Date: 2026-10-17 09:12:40.118310
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0002_keyset_pagination_indexes'
+down_revision = '0001_initial_tables'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns) for every allow-listed sort key
+INDEXES = [
+    ('ix_politician_name_id', 'politician', ['name', 'id']),
+    ('ix_politician_created_at_id', 'politician', ['created_at', 'id']),
+    ('ix_bill_created_at_id', 'bill', ['created_at', 'id']),
+    ('ix_bill_bill_number_id', 'bill', ['bill_number', 'id']),
+    ('ix_vote_vote_date_id', 'vote', ['vote_date', 'id']),
+    ('ix_vote_created_at_id', 'vote', ['created_at', 'id']),
+    ('ix_political_contribution_contribution_date_id', 'political_contribution', ['contribution_date', 'id']),
+    ('ix_political_contribution_amount_id', 'political_contribution', ['amount', 'id']),
+    ('ix_political_contribution_created_at_id', 'political_contribution', ['created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,44 @@
+"""Trigram indexes for accent-insensitive name search
+
+Revision ID: 0003_trigram_name_search
+Revises: 0002_keyset_pagination_indexes
+Create Date: 2026-10-17 10:03:52.640917
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0003_trigram_name_search'
+down_revision = '0002_keyset_pagination_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+
+    # unaccent() is only STABLE (it depends on the dictionary search path), so
+    # it cannot be used in an index; pinning the dictionary makes it immutable
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION immutable_unaccent(text) RETURNS text AS $$
+            SELECT public.unaccent('public.unaccent'::regdictionary, $1)
+        $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        """
+    )
+
+    op.execute(
+        'CREATE INDEX ix_politician_name_trgm ON politician '
+        'USING gin (immutable_unaccent(name) gin_trgm_ops)'
+    )
+    op.execute(
+        'CREATE INDEX ix_political_contribution_contributor_name_trgm ON political_contribution '
+        'USING gin (immutable_unaccent(contributor_name) gin_trgm_ops)'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_political_contribution_contributor_name_trgm', table_name='political_contribution')
+    op.drop_index('ix_politician_name_trgm', table_name='politician')
+    op.execute('DROP FUNCTION IF EXISTS immutable_unaccent(text)')
@@ -0,0 +1,37 @@
+"""Full-text search vector for bills
+
+Revision ID: 0004_bill_full_text_search
+Revises: 0003_trigram_name_search
+Create Date: 2026-10-17 10:41:18.275034
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0004_bill_full_text_search'
+down_revision = '0003_trigram_name_search'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Stemmed Portuguese lexemes for title (A) and description (B), plus
+    # unstemmed 'simple' lexemes (C) so acronyms, bill numbers and words the
+    # stemmer mangles still match. Accents are stripped on both sides.
+    op.execute(
+        """
+        ALTER TABLE bill ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('portuguese', immutable_unaccent(coalesce(title, ''))), 'A') ||
+            setweight(to_tsvector('portuguese', immutable_unaccent(coalesce(description, ''))), 'B') ||
+            setweight(to_tsvector('simple', immutable_unaccent(
+                bill_number || ' ' || coalesce(title, '') || ' ' || coalesce(description, '')
+            )), 'C')
+        ) STORED
+        """
+    )
+    op.execute('CREATE INDEX ix_bill_search_vector ON bill USING gin (search_vector)')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bill_search_vector', table_name='bill')
+    op.drop_column('bill', 'search_vector')
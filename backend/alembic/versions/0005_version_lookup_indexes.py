@@ -0,0 +1,43 @@
+"""Indexes answering ETag/Last-Modified version lookups
+
+Revision ID: 0005_version_lookup_indexes
+Revises: 0004_bill_full_text_search
+Create Date: 2026-10-17 13:05:52.640211
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0005_version_lookup_indexes'
+down_revision = '0004_bill_full_text_search'
+branch_labels = None
+depends_on = None
+
+
+TABLES = ['politician', 'bill', 'vote', 'political_contribution']
+
+# (index name, table, columns) for related collections and filtered lists
+COLLECTION_INDEXES = [
+    ('ix_bill_sponsor_id_updated_at', 'bill', ['sponsor_id', 'updated_at']),
+    ('ix_vote_politician_id_updated_at', 'vote', ['politician_id', 'updated_at']),
+    ('ix_vote_bill_id_updated_at', 'vote', ['bill_id', 'updated_at']),
+    ('ix_political_contribution_politician_id_updated_at', 'political_contribution', ['politician_id', 'updated_at']),
+]
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        # Record versions by id with an index-only scan
+        op.create_index(f'ix_{table}_id_updated_at', table, ['id'], postgresql_include=['updated_at'])
+        # Latest change of the whole table
+        op.create_index(f'ix_{table}_updated_at', table, ['updated_at'])
+    for name, table, columns in COLLECTION_INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(COLLECTION_INDEXES):
+        op.drop_index(name, table_name=table)
+    for table in reversed(TABLES):
+        op.drop_index(f'ix_{table}_updated_at', table_name=table)
+        op.drop_index(f'ix_{table}_id_updated_at', table_name=table)
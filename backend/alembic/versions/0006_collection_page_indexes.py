@@ -0,0 +1,37 @@
+"""Indexes serving pages of a politician's votes, bills and contributions
+
+Revision ID: 0006_collection_page_indexes
+Revises: 0005_version_lookup_indexes
+Create Date: 2026-10-17 14:21:08.318402
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0006_collection_page_indexes'
+down_revision = '0005_version_lookup_indexes'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns): the parent key followed by each sort key,
+# so a page of one parent's records is a top-N index scan
+INDEXES = [
+    ('ix_vote_politician_id_vote_date_id', 'vote', ['politician_id', 'vote_date', 'id']),
+    ('ix_vote_politician_id_created_at_id', 'vote', ['politician_id', 'created_at', 'id']),
+    ('ix_bill_sponsor_id_created_at_id', 'bill', ['sponsor_id', 'created_at', 'id']),
+    ('ix_bill_sponsor_id_bill_number_id', 'bill', ['sponsor_id', 'bill_number', 'id']),
+    ('ix_political_contribution_politician_id_contribution_date_id', 'political_contribution', ['politician_id', 'contribution_date', 'id']),
+    ('ix_political_contribution_politician_id_amount_id', 'political_contribution', ['politician_id', 'amount', 'id']),
+    ('ix_political_contribution_politician_id_created_at_id', 'political_contribution', ['politician_id', 'created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
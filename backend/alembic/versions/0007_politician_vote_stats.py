@@ -0,0 +1,189 @@
+"""Vote counts per politician maintained by triggers on vote
+
+Revision ID: 0007_politician_vote_stats
+Revises: 0006_collection_page_indexes
+Create Date: 2026-10-17 15:02:37.904416
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0007_politician_vote_stats'
+down_revision = '0006_collection_page_indexes'
+branch_labels = None
+depends_on = None
+
+
+# One function for the three statement-level triggers: the rows that left
+# and entered `vote` (transition tables) become signed deltas, and the
+# counters of each affected politician are adjusted by their sums.
+#
+# A politician's bill count moves when the number of their votes on a bill
+# goes from 0 to 1 or back. That number is kept per (politician, bill) in
+# politician_bill_votes and read from what the upsert RETURNs: the row it
+# locked and updated, so two transactions adding the first vote on the same
+# pair see each other's count instead of both seeing 0 in their snapshot.
+# Both upserts take their row locks in key order, so concurrent statements
+# wait for each other instead of deadlocking.
+APPLY_FUNCTION = """
+CREATE OR REPLACE FUNCTION politician_vote_stats_apply() RETURNS trigger AS $$
+DECLARE
+    delta text;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        delta := 'SELECT politician_id, bill_id, vote_position, 1 AS sign FROM new_rows';
+    ELSIF TG_OP = 'DELETE' THEN
+        delta := 'SELECT politician_id, bill_id, vote_position, -1 AS sign FROM old_rows';
+    ELSE
+        delta := 'SELECT politician_id, bill_id, vote_position, -1 AS sign FROM old_rows '
+              || 'UNION ALL SELECT politician_id, bill_id, vote_position, 1 FROM new_rows';
+    END IF;
+
+    EXECUTE format($sql$
+        WITH delta AS (%s),
+        counts AS (
+            SELECT politician_id,
+                   sum(sign) AS total_votes,
+                   coalesce(sum(sign) FILTER (WHERE vote_position = 'yea'), 0) AS yea_votes,
+                   coalesce(sum(sign) FILTER (WHERE vote_position = 'nay'), 0) AS nay_votes
+            FROM delta
+            GROUP BY politician_id
+        ),
+        change AS (
+            SELECT politician_id, bill_id, sum(sign) AS change
+            FROM delta
+            GROUP BY politician_id, bill_id
+            HAVING sum(sign) <> 0
+        ),
+        pair AS (
+            INSERT INTO politician_bill_votes AS pair (politician_id, bill_id, votes)
+            SELECT politician_id, bill_id, change
+            FROM change
+            ORDER BY politician_id, bill_id
+            ON CONFLICT (politician_id, bill_id) DO UPDATE SET
+                votes = pair.votes + excluded.votes
+            RETURNING pair.politician_id, pair.bill_id, pair.votes
+        ),
+        bills AS (
+            SELECT pair.politician_id,
+                   sum((pair.votes > 0)::int - (pair.votes - change.change > 0)::int) AS bills_voted
+            FROM pair JOIN change USING (politician_id, bill_id)
+            GROUP BY pair.politician_id
+        )
+        INSERT INTO politician_vote_stats AS stats
+            (politician_id, total_votes, yea_votes, nay_votes, bills_voted)
+        SELECT counts.politician_id, counts.total_votes, counts.yea_votes,
+               counts.nay_votes, coalesce(bills.bills_voted, 0)
+        FROM counts LEFT JOIN bills USING (politician_id)
+        WHERE (counts.total_votes, counts.yea_votes, counts.nay_votes, coalesce(bills.bills_voted, 0))
+              <> (0, 0, 0, 0)
+          -- Votes deleted along with their politician leave nothing to count
+          AND EXISTS (SELECT 1 FROM politician WHERE politician.id = counts.politician_id)
+        ORDER BY counts.politician_id
+        ON CONFLICT (politician_id) DO UPDATE SET
+            total_votes = stats.total_votes + excluded.total_votes,
+            yea_votes = stats.yea_votes + excluded.yea_votes,
+            nay_votes = stats.nay_votes + excluded.nay_votes,
+            bills_voted = stats.bills_voted + excluded.bills_voted
+    $sql$, delta);
+    -- Only this transaction's emptied pairs are visible with votes = 0
+    DELETE FROM politician_bill_votes WHERE votes = 0;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+TRUNCATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION politician_vote_stats_truncate() RETURNS trigger AS $$
+BEGIN
+    TRUNCATE politician_vote_stats, politician_bill_votes;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+TRIGGERS = [
+    'CREATE TRIGGER vote_stats_insert AFTER INSERT ON vote '
+    'REFERENCING NEW TABLE AS new_rows '
+    'FOR EACH STATEMENT EXECUTE FUNCTION politician_vote_stats_apply()',
+    'CREATE TRIGGER vote_stats_update AFTER UPDATE ON vote '
+    'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows '
+    'FOR EACH STATEMENT EXECUTE FUNCTION politician_vote_stats_apply()',
+    'CREATE TRIGGER vote_stats_delete AFTER DELETE ON vote '
+    'REFERENCING OLD TABLE AS old_rows '
+    'FOR EACH STATEMENT EXECUTE FUNCTION politician_vote_stats_apply()',
+    'CREATE TRIGGER vote_stats_truncate AFTER TRUNCATE ON vote '
+    'FOR EACH STATEMENT EXECUTE FUNCTION politician_vote_stats_truncate()',
+]
+
+POPULATE = [
+    """
+    INSERT INTO politician_bill_votes (politician_id, bill_id, votes)
+    SELECT politician_id, bill_id, count(*)
+    FROM vote
+    GROUP BY politician_id, bill_id
+    """,
+    """
+    INSERT INTO politician_vote_stats (politician_id, total_votes, yea_votes, nay_votes, bills_voted)
+    SELECT politician_id,
+           count(*),
+           count(*) FILTER (WHERE vote_position = 'yea'),
+           count(*) FILTER (WHERE vote_position = 'nay'),
+           count(DISTINCT bill_id)
+    FROM vote
+    GROUP BY politician_id
+    """,
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'politician_bill_votes',
+        sa.Column('politician_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('bill_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('votes', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('politician_id', 'bill_id'),
+    )
+    op.create_index(
+        'ix_politician_bill_votes_empty',
+        'politician_bill_votes',
+        ['votes'],
+        postgresql_where=sa.text('votes = 0'),
+    )
+
+    op.create_table(
+        'politician_vote_stats',
+        sa.Column('politician_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('total_votes', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('yea_votes', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('nay_votes', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('bills_voted', sa.BigInteger(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['politician_id'], ['politician.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('politician_id'),
+    )
+    op.create_index(
+        'ix_politician_vote_stats_total_votes',
+        'politician_vote_stats',
+        ['total_votes', 'politician_id'],
+    )
+
+    op.execute(APPLY_FUNCTION)
+    op.execute(TRUNCATE_FUNCTION)
+    # Block vote writes between the initial count and the triggers taking over
+    op.execute('LOCK TABLE vote IN SHARE MODE')
+    for trigger in TRIGGERS:
+        op.execute(trigger)
+    for statement in POPULATE:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for name in ('vote_stats_truncate', 'vote_stats_delete', 'vote_stats_update', 'vote_stats_insert'):
+        op.execute(f'DROP TRIGGER IF EXISTS {name} ON vote')
+    op.execute('DROP FUNCTION IF EXISTS politician_vote_stats_truncate()')
+    op.execute('DROP FUNCTION IF EXISTS politician_vote_stats_apply()')
+    op.drop_index('ix_politician_vote_stats_total_votes', table_name='politician_vote_stats')
+    op.drop_table('politician_vote_stats')
+    op.drop_table('politician_bill_votes')
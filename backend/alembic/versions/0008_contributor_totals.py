@@ -0,0 +1,246 @@
+"""Contributor rollups maintained by triggers on political_contribution
+
+Revision ID: 0008_contributor_totals
+Revises: 0007_politician_vote_stats
+Create Date: 2026-10-17 15:48:12.517036
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0008_contributor_totals'
+down_revision = '0007_politician_vote_stats'
+branch_labels = None
+depends_on = None
+
+
+# Statement-level maintenance of the rollups, like politician_vote_stats:
+# 1. the signed deltas of the statement are added to the monthly buckets
+#    of each (contributor, politician), and emptied buckets are removed;
+# 2. the same deltas are added to the contribution count of each
+#    (contributor, politician) pair, whose upsert returns the locked, latest
+#    count: a contributor's politician count moves when it goes from 0 to 1
+#    or back, even when concurrent transactions add the first contribution
+#    of the same pair;
+# 3. the per-contributor totals get the sums and those moves.
+# Every upsert takes its row locks in key order, so concurrent statements
+# wait for each other instead of deadlocking. A NULL contributor_type is
+# stored as '' so it can be part of the keys.
+APPLY_FUNCTION = """
+CREATE OR REPLACE FUNCTION contributor_totals_apply() RETURNS trigger AS $$
+DECLARE
+    delta text;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        delta := 'SELECT contributor_name, coalesce(contributor_type, '''') AS contributor_type, '
+              || 'politician_id, contribution_date, amount, 1 AS sign FROM new_rows';
+    ELSIF TG_OP = 'DELETE' THEN
+        delta := 'SELECT contributor_name, coalesce(contributor_type, '''') AS contributor_type, '
+              || 'politician_id, contribution_date, amount, -1 AS sign FROM old_rows';
+    ELSE
+        delta := 'SELECT contributor_name, coalesce(contributor_type, '''') AS contributor_type, '
+              || 'politician_id, contribution_date, amount, -1 AS sign FROM old_rows '
+              || 'UNION ALL SELECT contributor_name, coalesce(contributor_type, ''''), '
+              || 'politician_id, contribution_date, amount, 1 FROM new_rows';
+    END IF;
+
+    EXECUTE format($sql$
+        INSERT INTO contributor_monthly_totals AS totals
+            (contributor_name, contributor_type, politician_id, month, total_amount, contribution_count)
+        SELECT contributor_name, contributor_type, politician_id,
+               date_trunc('month', contribution_date)::date, sum(sign * amount), sum(sign)
+        FROM (%s) AS delta
+        GROUP BY 1, 2, 3, 4
+        HAVING sum(sign) <> 0 OR sum(sign * amount) <> 0
+        ORDER BY 1, 2, 3, 4
+        ON CONFLICT (contributor_name, contributor_type, politician_id, month) DO UPDATE SET
+            total_amount = totals.total_amount + excluded.total_amount,
+            contribution_count = totals.contribution_count + excluded.contribution_count
+    $sql$, delta);
+    DELETE FROM contributor_monthly_totals WHERE contribution_count = 0;
+
+    EXECUTE format($sql$
+        WITH change AS (
+            SELECT contributor_name, contributor_type, politician_id,
+                   sum(sign) AS change, sum(sign * amount) AS amount
+            FROM (%s) AS delta
+            GROUP BY contributor_name, contributor_type, politician_id
+        ),
+        pair AS (
+            INSERT INTO contributor_politician_totals AS pair
+                (contributor_name, contributor_type, politician_id, contribution_count)
+            SELECT contributor_name, contributor_type, politician_id, change
+            FROM change
+            WHERE change <> 0
+            ORDER BY contributor_name, contributor_type, politician_id
+            ON CONFLICT (contributor_name, contributor_type, politician_id) DO UPDATE SET
+                contribution_count = pair.contribution_count + excluded.contribution_count
+            RETURNING pair.contributor_name, pair.contributor_type, pair.politician_id,
+                      pair.contribution_count
+        ),
+        changes AS (
+            SELECT change.contributor_name, change.contributor_type,
+                   sum(change.amount) AS total_amount,
+                   sum(change.change) AS contribution_count,
+                   coalesce(sum((pair.contribution_count > 0)::int
+                                - (pair.contribution_count - change.change > 0)::int), 0)
+                       AS politicians_supported
+            FROM change
+            LEFT JOIN pair USING (contributor_name, contributor_type, politician_id)
+            GROUP BY change.contributor_name, change.contributor_type
+        )
+        INSERT INTO contributor_totals AS totals
+            (contributor_name, contributor_type, total_amount, contribution_count, politicians_supported)
+        SELECT contributor_name, contributor_type, total_amount, contribution_count, politicians_supported
+        FROM changes
+        WHERE (total_amount, contribution_count, politicians_supported) <> (0, 0, 0)
+        ORDER BY contributor_name, contributor_type
+        ON CONFLICT (contributor_name, contributor_type) DO UPDATE SET
+            total_amount = totals.total_amount + excluded.total_amount,
+            contribution_count = totals.contribution_count + excluded.contribution_count,
+            politicians_supported = totals.politicians_supported + excluded.politicians_supported
+    $sql$, delta);
+    DELETE FROM contributor_politician_totals WHERE contribution_count = 0;
+    DELETE FROM contributor_totals WHERE contribution_count = 0;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+TRUNCATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION contributor_totals_truncate() RETURNS trigger AS $$
+BEGIN
+    TRUNCATE contributor_monthly_totals, contributor_politician_totals, contributor_totals;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+TRIGGERS = [
+    'CREATE TRIGGER contributor_totals_insert AFTER INSERT ON political_contribution '
+    'REFERENCING NEW TABLE AS new_rows '
+    'FOR EACH STATEMENT EXECUTE FUNCTION contributor_totals_apply()',
+    'CREATE TRIGGER contributor_totals_update AFTER UPDATE ON political_contribution '
+    'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows '
+    'FOR EACH STATEMENT EXECUTE FUNCTION contributor_totals_apply()',
+    'CREATE TRIGGER contributor_totals_delete AFTER DELETE ON political_contribution '
+    'REFERENCING OLD TABLE AS old_rows '
+    'FOR EACH STATEMENT EXECUTE FUNCTION contributor_totals_apply()',
+    'CREATE TRIGGER contributor_totals_truncate AFTER TRUNCATE ON political_contribution '
+    'FOR EACH STATEMENT EXECUTE FUNCTION contributor_totals_truncate()',
+]
+
+POPULATE = [
+    """
+    INSERT INTO contributor_monthly_totals
+        (contributor_name, contributor_type, politician_id, month, total_amount, contribution_count)
+    SELECT contributor_name, coalesce(contributor_type, ''), politician_id,
+           date_trunc('month', contribution_date)::date, sum(amount), count(*)
+    FROM political_contribution
+    GROUP BY 1, 2, 3, 4
+    """,
+    """
+    INSERT INTO contributor_politician_totals
+        (contributor_name, contributor_type, politician_id, contribution_count)
+    SELECT contributor_name, contributor_type, politician_id, sum(contribution_count)
+    FROM contributor_monthly_totals
+    GROUP BY contributor_name, contributor_type, politician_id
+    """,
+    """
+    INSERT INTO contributor_totals
+        (contributor_name, contributor_type, total_amount, contribution_count, politicians_supported)
+    SELECT contributor_name, contributor_type, sum(total_amount), sum(contribution_count),
+           count(DISTINCT politician_id)
+    FROM contributor_monthly_totals
+    GROUP BY contributor_name, contributor_type
+    """,
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'contributor_monthly_totals',
+        sa.Column('contributor_name', sa.String(255), nullable=False),
+        sa.Column('contributor_type', sa.String(100), server_default='', nullable=False),
+        sa.Column('politician_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('total_amount', sa.Numeric(18, 2), server_default='0', nullable=False),
+        sa.Column('contribution_count', sa.BigInteger(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('contributor_name', 'contributor_type', 'politician_id', 'month'),
+    )
+    op.create_index(
+        'ix_contributor_monthly_totals_politician_id_month',
+        'contributor_monthly_totals',
+        ['politician_id', 'month'],
+    )
+    op.create_index(
+        'ix_contributor_monthly_totals_contributor_type_month',
+        'contributor_monthly_totals',
+        ['contributor_type', 'month'],
+    )
+    op.create_index('ix_contributor_monthly_totals_month', 'contributor_monthly_totals', ['month'])
+    op.create_index(
+        'ix_contributor_monthly_totals_empty',
+        'contributor_monthly_totals',
+        ['contribution_count'],
+        postgresql_where=sa.text('contribution_count = 0'),
+    )
+
+    op.create_table(
+        'contributor_politician_totals',
+        sa.Column('contributor_name', sa.String(255), nullable=False),
+        sa.Column('contributor_type', sa.String(100), server_default='', nullable=False),
+        sa.Column('politician_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('contribution_count', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('contributor_name', 'contributor_type', 'politician_id'),
+    )
+    op.create_index(
+        'ix_contributor_politician_totals_empty',
+        'contributor_politician_totals',
+        ['contribution_count'],
+        postgresql_where=sa.text('contribution_count = 0'),
+    )
+
+    op.create_table(
+        'contributor_totals',
+        sa.Column('contributor_name', sa.String(255), nullable=False),
+        sa.Column('contributor_type', sa.String(100), server_default='', nullable=False),
+        sa.Column('total_amount', sa.Numeric(18, 2), server_default='0', nullable=False),
+        sa.Column('contribution_count', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('politicians_supported', sa.BigInteger(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('contributor_name', 'contributor_type'),
+    )
+    op.create_index('ix_contributor_totals_total_amount', 'contributor_totals', ['total_amount'])
+    op.create_index(
+        'ix_contributor_totals_empty',
+        'contributor_totals',
+        ['contribution_count'],
+        postgresql_where=sa.text('contribution_count = 0'),
+    )
+
+    op.execute(APPLY_FUNCTION)
+    op.execute(TRUNCATE_FUNCTION)
+    # Block contribution writes between the initial rollup and the triggers taking over
+    op.execute('LOCK TABLE political_contribution IN SHARE MODE')
+    for trigger in TRIGGERS:
+        op.execute(trigger)
+    for statement in POPULATE:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for name in (
+        'contributor_totals_truncate',
+        'contributor_totals_delete',
+        'contributor_totals_update',
+        'contributor_totals_insert',
+    ):
+        op.execute(f'DROP TRIGGER IF EXISTS {name} ON political_contribution')
+    op.execute('DROP FUNCTION IF EXISTS contributor_totals_truncate()')
+    op.execute('DROP FUNCTION IF EXISTS contributor_totals_apply()')
+    op.drop_table('contributor_totals')
+    op.drop_table('contributor_politician_totals')
+    op.drop_table('contributor_monthly_totals')
@@ -0,0 +1,53 @@
+"""Materialized views for analytics and their refresh state
+
+Revision ID: 0009_materialized_views
+Revises: 0008_contributor_totals
+Create Date: 2026-10-17 16:31:45.228190
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0009_materialized_views'
+down_revision = '0008_contributor_totals'
+branch_labels = None
+depends_on = None
+
+
+PARTY_CONTRIBUTIONS_MONTHLY = """
+SELECT coalesce(politician.party, '') AS party,
+       date_trunc('month', political_contribution.contribution_date)::date AS month,
+       sum(political_contribution.amount) AS total_amount,
+       count(*) AS contribution_count,
+       count(DISTINCT political_contribution.politician_id) AS politicians_supported,
+       count(DISTINCT political_contribution.contributor_name) AS contributors
+FROM political_contribution
+JOIN politician ON politician.id = political_contribution.politician_id
+GROUP BY 1, 2
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        'materialized_view_refresh',
+        sa.Column('view_name', sa.String(63), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('duration_ms', sa.Float(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('last_error_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('view_name'),
+    )
+
+    # A NULL party is stored as '' so every row has a unique key
+    op.create_materialized_view(
+        'mv_party_contributions_monthly',
+        PARTY_CONTRIBUTIONS_MONTHLY,
+        unique=['party', 'month'],
+        indexes=[['month']],
+    )
+
+
+def downgrade() -> None:
+    op.drop_materialized_view('mv_party_contributions_monthly')
+    op.drop_table('materialized_view_refresh')
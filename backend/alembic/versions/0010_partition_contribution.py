@@ -0,0 +1,319 @@
+"""Range-partition political_contribution by contribution_date, one partition per year
+
+Revision ID: 0010_partition_contribution
+Revises: 0009_materialized_views
+Create Date: 2026-10-17 17:12:08.340921
+
+"""
+import logging
+import time
+
+from alembic import op
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+# revision identifiers, used by Alembic.
+revision = '0010_partition_contribution'
+down_revision = '0009_materialized_views'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+# The table is rebuilt online:
+# 1. a partitioned copy `political_contribution_new` is created with the
+#    yearly partitions of the existing data, and a row trigger mirrors every
+#    write to the old table into it;
+# 2. existing rows are copied in batches, each in its own transaction, so
+#    writes only wait for the batch touching their row (FOR SHARE makes a
+#    batch wait for, and then copy, concurrent updates of its rows);
+# 3. in one short transaction the old table is dropped and the copy takes
+#    its name, indexes, rollup triggers and materialized view.
+
+BATCH_SIZE = 10000
+SWITCH_ATTEMPTS = 10
+
+# Yearly partitions political_contribution_y<year> between the two years;
+# rows of such a year that went to the DEFAULT partition are moved into
+# its new partition. Returns the number of partitions created.
+ENSURE_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION ensure_contribution_partitions(
+    first_year int,
+    last_year int,
+    parent text DEFAULT 'political_contribution'
+) RETURNS int AS $$
+DECLARE
+    year int;
+    partition text;
+    default_partition regclass;
+    created int := 0;
+BEGIN
+    SELECT nullif(partdefid, 0)::regclass INTO default_partition
+    FROM pg_partitioned_table
+    WHERE partrelid = parent::regclass;
+
+    FOR year IN first_year..last_year LOOP
+        partition := format('political_contribution_y%s', year);
+        CONTINUE WHEN to_regclass(partition) IS NOT NULL;
+
+        IF default_partition IS NOT NULL THEN
+            EXECUTE format('CREATE TEMP TABLE moved_contributions AS SELECT * FROM %s WITH NO DATA',
+                           default_partition);
+            EXECUTE format($sql$
+                WITH moved AS (
+                    DELETE FROM %s WHERE contribution_date >= %L AND contribution_date < %L
+                    RETURNING *
+                )
+                INSERT INTO moved_contributions SELECT * FROM moved
+            $sql$, default_partition, make_date(year, 1, 1), make_date(year + 1, 1, 1));
+        END IF;
+
+        EXECUTE format('CREATE TABLE %I PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',
+                       partition, parent::regclass, make_date(year, 1, 1), make_date(year + 1, 1, 1));
+
+        IF default_partition IS NOT NULL THEN
+            -- Straight into the partition: the rows only move, so the rollup
+            -- triggers on the parent must not see them
+            EXECUTE format('INSERT INTO %I SELECT * FROM moved_contributions', partition);
+            DROP TABLE moved_contributions;
+        END IF;
+        created := created + 1;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# From the year of the oldest contribution (at most 30 years back, older
+# rows stay in the default partition) to two years ahead
+INITIAL_PARTITIONS = """
+SELECT ensure_contribution_partitions(
+    greatest(
+        coalesce(
+            (SELECT extract(year FROM min(contribution_date))::int FROM political_contribution),
+            extract(year FROM current_date)::int
+        ),
+        extract(year FROM current_date)::int - 30
+    ),
+    extract(year FROM current_date)::int + 2,
+    'political_contribution_new'
+)
+"""
+
+MIRROR_FUNCTION = """
+CREATE OR REPLACE FUNCTION political_contribution_mirror() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM political_contribution_new
+        WHERE id = OLD.id AND contribution_date = OLD.contribution_date;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO political_contribution_new SELECT (NEW).* ON CONFLICT DO NOTHING;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+BACKFILL_BATCH = """
+WITH batch AS (
+    SELECT * FROM political_contribution
+    WHERE id > CAST(:after AS uuid)
+    ORDER BY id
+    LIMIT :size
+    FOR SHARE
+),
+copied AS (
+    INSERT INTO political_contribution_new SELECT * FROM batch ON CONFLICT DO NOTHING
+)
+SELECT id FROM batch ORDER BY id DESC LIMIT 1
+"""
+
+# Index name suffix after `ix_political_contribution_` and definition, as
+# declared on the model
+INDEXES = [
+    ('id', '(id)'),
+    ('politician_id', '(politician_id)'),
+    ('contributor_name', '(contributor_name)'),
+    ('amount', '(amount)'),
+    ('contribution_date', '(contribution_date)'),
+    ('contribution_date_id', '(contribution_date, id)'),
+    ('amount_id', '(amount, id)'),
+    ('created_at_id', '(created_at, id)'),
+    ('id_updated_at', '(id) INCLUDE (updated_at)'),
+    ('updated_at', '(updated_at)'),
+    ('politician_id_updated_at', '(politician_id, updated_at)'),
+    ('politician_id_contribution_date_id', '(politician_id, contribution_date, id)'),
+    ('politician_id_amount_id', '(politician_id, amount, id)'),
+    ('politician_id_created_at_id', '(politician_id, created_at, id)'),
+    ('contributor_name_trgm', 'USING gin (immutable_unaccent(contributor_name) gin_trgm_ops)'),
+]
+
+# The rollup triggers of 0008_contributor_totals; statement-level triggers
+# on the partitioned table see the rows of every partition
+TRIGGERS = [
+    'CREATE TRIGGER contributor_totals_insert AFTER INSERT ON political_contribution '
+    'REFERENCING NEW TABLE AS new_rows '
+    'FOR EACH STATEMENT EXECUTE FUNCTION contributor_totals_apply()',
+    'CREATE TRIGGER contributor_totals_update AFTER UPDATE ON political_contribution '
+    'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows '
+    'FOR EACH STATEMENT EXECUTE FUNCTION contributor_totals_apply()',
+    'CREATE TRIGGER contributor_totals_delete AFTER DELETE ON political_contribution '
+    'REFERENCING OLD TABLE AS old_rows '
+    'FOR EACH STATEMENT EXECUTE FUNCTION contributor_totals_apply()',
+    'CREATE TRIGGER contributor_totals_truncate AFTER TRUNCATE ON political_contribution '
+    'FOR EACH STATEMENT EXECUTE FUNCTION contributor_totals_truncate()',
+]
+
+# The view of 0009_materialized_views, over a given table
+PARTY_CONTRIBUTIONS_MONTHLY = """
+SELECT coalesce(politician.party, '') AS party,
+       date_trunc('month', political_contribution.contribution_date)::date AS month,
+       sum(political_contribution.amount) AS total_amount,
+       count(*) AS contribution_count,
+       count(DISTINCT political_contribution.politician_id) AS politicians_supported,
+       count(DISTINCT political_contribution.contributor_name) AS contributors
+FROM {table} AS political_contribution
+JOIN politician ON politician.id = political_contribution.politician_id
+GROUP BY 1, 2
+"""
+
+
+def index_name(suffix: str) -> str:
+    return f'ix_political_contribution_{suffix}'
+
+
+def new_index_name(suffix: str) -> str:
+    # Short enough for the 63 character limit; renamed in the switch
+    return f'ix_pc_new_{suffix}'
+
+
+def create_partitioned_copy() -> None:
+    op.execute(
+        'CREATE TABLE political_contribution_new '
+        '(LIKE political_contribution INCLUDING DEFAULTS INCLUDING COMMENTS) '
+        'PARTITION BY RANGE (contribution_date)'
+    )
+    # The partition key has to be part of the primary key
+    op.execute(
+        'ALTER TABLE political_contribution_new '
+        'ADD CONSTRAINT political_contribution_new_pkey PRIMARY KEY (id, contribution_date), '
+        'ADD CONSTRAINT political_contribution_politician_id_fkey FOREIGN KEY (politician_id) '
+        'REFERENCES politician (id) ON DELETE CASCADE'
+    )
+    op.execute('CREATE TABLE political_contribution_default PARTITION OF political_contribution_new DEFAULT')
+    op.execute(INITIAL_PARTITIONS)
+    for suffix, definition in INDEXES:
+        op.execute(f'CREATE INDEX {new_index_name(suffix)} ON political_contribution_new {definition}')
+
+
+def backfill() -> None:
+    if op.get_context().as_sql:
+        op.execute('INSERT INTO political_contribution_new SELECT * FROM political_contribution ON CONFLICT DO NOTHING')
+        return
+
+    bind = op.get_bind()
+    after, copied, started = '00000000-0000-0000-0000-000000000000', 0, time.monotonic()
+    while True:
+        last = bind.execute(text(BACKFILL_BATCH), {'after': after, 'size': BATCH_SIZE}).scalar()
+        if last is None:
+            break
+        after, copied = str(last), copied + BATCH_SIZE
+        logger.info('Copied about %d contributions in %.0f s', copied, time.monotonic() - started)
+
+
+def lock_for_switch() -> None:
+    # The advisory lock of app.db.matviews: no refresh of the view meanwhile
+    locks = [
+        "SELECT pg_advisory_xact_lock(28022, hashtext('mv_party_contributions_monthly'))",
+        'LOCK TABLE political_contribution, political_contribution_new IN ACCESS EXCLUSIVE MODE',
+    ]
+    if op.get_context().as_sql:
+        for lock in locks:
+            op.execute(lock)
+        return
+
+    # Do not queue writes behind the lock for long: retry instead
+    bind = op.get_bind()
+    bind.execute(text("SET LOCAL lock_timeout = '5s'"))
+    for attempt in range(1, SWITCH_ATTEMPTS + 1):
+        try:
+            with bind.begin_nested():
+                for lock in locks:
+                    bind.execute(text(lock))
+            return
+        except OperationalError:
+            if attempt == SWITCH_ATTEMPTS:
+                raise
+            logger.info('political_contribution is busy, retrying the switch (%d)', attempt)
+            time.sleep(attempt)
+
+
+def upgrade() -> None:
+    op.execute(ENSURE_PARTITIONS_FUNCTION)
+    create_partitioned_copy()
+    op.execute(MIRROR_FUNCTION)
+    op.execute(
+        'CREATE TRIGGER political_contribution_mirror '
+        'AFTER INSERT OR UPDATE OR DELETE ON political_contribution '
+        'FOR EACH ROW EXECUTE FUNCTION political_contribution_mirror()'
+    )
+
+    with op.get_context().autocommit_block():
+        backfill()
+        # Built ahead of the switch; the refresher brings it up to date
+        op.create_materialized_view(
+            'mv_party_contributions_monthly_new',
+            PARTY_CONTRIBUTIONS_MONTHLY.format(table='political_contribution_new'),
+            unique=['party', 'month'],
+            indexes=[['month']],
+        )
+
+    lock_for_switch()
+    op.execute('DROP MATERIALIZED VIEW mv_party_contributions_monthly')
+    op.execute('DROP TABLE political_contribution')
+    op.execute('DROP FUNCTION political_contribution_mirror()')
+    op.execute('ALTER TABLE political_contribution_new RENAME TO political_contribution')
+    op.execute(
+        'ALTER TABLE political_contribution '
+        'RENAME CONSTRAINT political_contribution_new_pkey TO political_contribution_pkey'
+    )
+    for suffix, _ in INDEXES:
+        op.execute(f'ALTER INDEX {new_index_name(suffix)} RENAME TO {index_name(suffix)}')
+    for trigger in TRIGGERS:
+        op.execute(trigger)
+    op.execute('ALTER MATERIALIZED VIEW mv_party_contributions_monthly_new RENAME TO mv_party_contributions_monthly')
+    op.execute('ALTER INDEX uq_mv_party_contributions_monthly_new RENAME TO uq_mv_party_contributions_monthly')
+    op.execute(
+        'ALTER INDEX ix_mv_party_contributions_monthly_new_month RENAME TO ix_mv_party_contributions_monthly_month'
+    )
+
+
+def downgrade() -> None:
+    # Not online: writes wait until the plain table is rebuilt
+    op.execute('LOCK TABLE political_contribution IN ACCESS EXCLUSIVE MODE')
+    op.execute(
+        'CREATE TABLE political_contribution_plain '
+        '(LIKE political_contribution INCLUDING DEFAULTS INCLUDING COMMENTS)'
+    )
+    op.execute('INSERT INTO political_contribution_plain SELECT * FROM political_contribution')
+    op.drop_materialized_view('mv_party_contributions_monthly')
+    op.execute('DROP TABLE political_contribution')
+    op.execute('DROP FUNCTION IF EXISTS ensure_contribution_partitions(int, int, text)')
+    op.execute('ALTER TABLE political_contribution_plain RENAME TO political_contribution')
+    op.execute(
+        'ALTER TABLE political_contribution '
+        'ADD CONSTRAINT political_contribution_pkey PRIMARY KEY (id), '
+        'ADD CONSTRAINT political_contribution_politician_id_fkey FOREIGN KEY (politician_id) '
+        'REFERENCES politician (id) ON DELETE CASCADE'
+    )
+    for suffix, definition in INDEXES:
+        op.execute(f'CREATE INDEX {index_name(suffix)} ON political_contribution {definition}')
+    for trigger in TRIGGERS:
+        op.execute(trigger)
+    op.create_materialized_view(
+        'mv_party_contributions_monthly',
+        PARTY_CONTRIBUTIONS_MONTHLY.format(table='political_contribution'),
+        unique=['party', 'month'],
+        indexes=[['month']],
+    )
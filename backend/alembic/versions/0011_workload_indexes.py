@@ -0,0 +1,184 @@
+"""Composite and covering indexes for the main access paths, redundant indexes dropped
+
+Revision ID: 0011_workload_indexes
+Revises: 0010_partition_contribution
+Create Date: 2026-10-17 17:58:40.117254
+
+"""
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision = '0011_workload_indexes'
+down_revision = '0010_partition_contribution'
+branch_labels = None
+depends_on = None
+
+
+# Built with CREATE INDEX CONCURRENTLY (and dropped with DROP INDEX
+# CONCURRENTLY) outside of a transaction, so writes go on meanwhile. An
+# interrupted concurrent build leaves an invalid index behind, which is
+# dropped before building it again.
+#
+# `political_contribution` is partitioned, and partitioned tables build no
+# index concurrently: its index is created on the parent only (invalid),
+# built concurrently on each partition and attached partition by partition;
+# it becomes valid with the last one. Dropping a partitioned index cannot be
+# concurrent either; it waits at most a few seconds for the table lock.
+
+# (name, table, definition)
+NEW_INDEXES = [
+    # Votes on a bill, optionally by position, newest first; covering the
+    # updated_at so the version lookups of a bill's votes are index-only scans
+    (
+        'ix_vote_bill_id_vote_position_vote_date_id',
+        'vote',
+        '(bill_id, vote_position, vote_date, id) INCLUDE (updated_at)',
+    ),
+    # A sponsor's bills by introduction date
+    ('ix_bill_sponsor_id_introduced_date_id', 'bill', '(sponsor_id, introduced_date, id)'),
+]
+
+# Rebuilt under a temporary name, then swapped in:
+# (name, table, definition, previous definition)
+REBUILT_INDEXES = [
+    # A politician's votes by date, covering the updated_at so the version
+    # lookups of a politician's votes are index-only scans
+    (
+        'ix_vote_politician_id_vote_date_id',
+        'vote',
+        '(politician_id, vote_date, id) INCLUDE (updated_at)',
+        '(politician_id, vote_date, id)',
+    ),
+]
+
+# A politician's contributions by date, covering the amount so the
+# per-politician sums and date-range totals are index-only scans
+CONTRIBUTION_INDEX = 'ix_political_contribution_politician_id_contribution_date_id'
+CONTRIBUTION_INDEX_BUILT = 'ix_pc_politician_id_contribution_date_id_amount'
+CONTRIBUTION_INDEX_CHILD = 'pid_date_id_amount'
+CONTRIBUTION_DEFINITION = '(politician_id, contribution_date, id) INCLUDE (amount)'
+CONTRIBUTION_PREVIOUS_DEFINITION = '(politician_id, contribution_date, id)'
+
+# Covered by another index (or the primary key), with their definitions
+# for the downgrade (None: not created by a migration). Both the names of
+# the migrations and of the db/init script are listed; they are dropped if
+# they exist.
+REDUNDANT_INDEXES = [
+    # The primary key (from create_all of the models, never from migrations)
+    ('ix_politician_id', 'politician', None),
+    ('ix_bill_id', 'bill', None),
+    ('ix_vote_id', 'vote', None),
+    # The primary key again: a version lookup by id reads one heap tuple
+    # after it, and every write paid for a second index on id
+    ('ix_politician_id_updated_at', 'politician', '(id) INCLUDE (updated_at)'),
+    ('ix_bill_id_updated_at', 'bill', '(id) INCLUDE (updated_at)'),
+    ('ix_vote_id_updated_at', 'vote', '(id) INCLUDE (updated_at)'),
+    # ix_politician_name_id
+    ('ix_politician_name', 'politician', '(name)'),
+    ('idx_politician_name', 'politician', None),
+    # ix_bill_bill_number_id
+    ('ix_bill_bill_number', 'bill', '(bill_number)'),
+    ('idx_bill_bill_number', 'bill', None),
+    # ix_bill_sponsor_id_updated_at and the other sponsor_id indexes
+    ('ix_bill_sponsor_id', 'bill', '(sponsor_id)'),
+    ('idx_bill_sponsor_id', 'bill', None),
+    # ix_vote_politician_id_vote_date_id (and ix_vote_politician_id_created_at_id)
+    ('ix_vote_politician_id', 'vote', '(politician_id)'),
+    ('idx_vote_politician_id', 'vote', None),
+    ('ix_vote_politician_id_updated_at', 'vote', '(politician_id, updated_at)'),
+    # ix_vote_bill_id_vote_position_vote_date_id, the one bill_id index of vote
+    ('ix_vote_bill_id', 'vote', '(bill_id)'),
+    ('idx_vote_bill_id', 'vote', None),
+    ('ix_vote_bill_id_updated_at', 'vote', '(bill_id, updated_at)'),
+    # ix_vote_vote_date_id
+    ('ix_vote_vote_date', 'vote', '(vote_date)'),
+    ('idx_vote_vote_date', 'vote', None),
+]
+
+# Same on the partitioned table: the primary key (id, contribution_date),
+# the politician_id indexes, (contribution_date, id) and (amount, id)
+REDUNDANT_CONTRIBUTION_INDEXES = [
+    ('ix_political_contribution_id', '(id)'),
+    ('ix_political_contribution_id_updated_at', '(id) INCLUDE (updated_at)'),
+    ('ix_political_contribution_politician_id', '(politician_id)'),
+    ('ix_political_contribution_contribution_date', '(contribution_date)'),
+    ('ix_political_contribution_amount', '(amount)'),
+]
+
+PARTITIONS = """
+SELECT inhrelid::regclass::text
+FROM pg_inherits
+WHERE inhparent = CAST(:table AS regclass)
+ORDER BY 1
+"""
+
+
+def create_index_concurrently(name: str, table: str, definition: str) -> None:
+    op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+    op.execute(f'CREATE INDEX CONCURRENTLY {name} ON {table} {definition}')
+
+
+def create_partitioned_index(name: str, table: str, definition: str, child_suffix: str) -> None:
+    if op.get_context().as_sql:
+        # The partitions are only known when connected
+        op.execute(f'CREATE INDEX {name} ON {table} {definition}')
+        return
+
+    op.execute(f'CREATE INDEX IF NOT EXISTS {name} ON ONLY {table} {definition}')
+    partitions = op.get_bind().execute(text(PARTITIONS), {'table': table}).scalars().all()
+    for partition in partitions:
+        child = f'{partition}_{child_suffix}'
+        valid = op.get_bind().execute(
+            text('SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)'),
+            {'name': child},
+        ).scalar()
+        if not valid:
+            create_index_concurrently(child, partition, definition)
+        op.execute(f'ALTER INDEX {name} ATTACH PARTITION {child}')
+
+
+def rebuild_index_concurrently(name: str, table: str, definition: str) -> None:
+    op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}_new')
+    op.execute(f'CREATE INDEX CONCURRENTLY {name}_new ON {table} {definition}')
+    op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+    op.execute(f'ALTER INDEX {name}_new RENAME TO {name}')
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, definition in NEW_INDEXES:
+            create_index_concurrently(name, table, definition)
+        for name, table, definition, _ in REBUILT_INDEXES:
+            rebuild_index_concurrently(name, table, definition)
+        create_partitioned_index(
+            CONTRIBUTION_INDEX_BUILT,
+            'political_contribution',
+            CONTRIBUTION_DEFINITION,
+            CONTRIBUTION_INDEX_CHILD,
+        )
+        for name, _, _ in REDUNDANT_INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    op.execute(f'DROP INDEX IF EXISTS {CONTRIBUTION_INDEX}')
+    op.execute(f'ALTER INDEX {CONTRIBUTION_INDEX_BUILT} RENAME TO {CONTRIBUTION_INDEX}')
+    for name, _ in REDUNDANT_CONTRIBUTION_INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+def downgrade() -> None:
+    # Not online for political_contribution: its indexes are built in one go
+    for name, definition in REDUNDANT_CONTRIBUTION_INDEXES:
+        op.execute(f'CREATE INDEX {name} ON political_contribution {definition}')
+    op.execute(f'DROP INDEX {CONTRIBUTION_INDEX}')
+    op.execute(f'CREATE INDEX {CONTRIBUTION_INDEX} ON political_contribution {CONTRIBUTION_PREVIOUS_DEFINITION}')
+
+    with op.get_context().autocommit_block():
+        for name, table, definition in REDUNDANT_INDEXES:
+            if definition is not None:
+                create_index_concurrently(name, table, definition)
+        for name, table, _, previous in REBUILT_INDEXES:
+            rebuild_index_concurrently(name, table, previous)
+        for name, _, _ in reversed(NEW_INDEXES):
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
@@ -0,0 +1,87 @@
+"""
+Response caching for read endpoints.
+
+Endpoints opt in with the `cached` decorator, naming the tags their
+response depends on; routers opt in by using `CachedRoute` as route class.
+The serialized body produced by FastAPI is stored, so a hit skips the
+database, ORM hydration and response validation altogether.
+"""
+from typing import Any, Callable, Hashable, Tuple
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from app.api.conditional import VALIDATOR_HEADERS, etag_matches, not_modified
+from app.core.cache import response_cache
+
+CACHE_TAGS_ATTRIBUTE = "__cache_tags__"
+
+
+def cached(*tags: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Mark an endpoint's responses as cacheable.
+
+    Args:
+        tags: Tags the response depends on; `{name}` placeholders are filled
+            from the path parameters, e.g. "politician:{id}"
+
+    Returns:
+        Decorator returning the endpoint unchanged
+    """
+
+    def decorator(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+        setattr(endpoint, CACHE_TAGS_ATTRIBUTE, tags)
+        return endpoint
+
+    return decorator
+
+
+def cache_key(route: APIRoute, request: Request) -> Hashable:
+    """Build the cache key of a request: route plus normalized parameters."""
+    path_params = tuple(sorted((k, str(v)) for k, v in request.path_params.items()))
+    query_params = tuple(sorted(request.query_params.multi_items()))
+    return (route.path, path_params, query_params)
+
+
+class CachedRoute(APIRoute):
+    """Route class serving `cached` endpoints from the response cache."""
+
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        handler = super().get_route_handler()
+        tags: Tuple[str, ...] = getattr(self.endpoint, CACHE_TAGS_ATTRIBUTE, None)
+        if tags is None:
+            return handler
+
+        async def cached_handler(request: Request) -> Response:
+            key = cache_key(self, request)
+            entry = response_cache.get(key)
+            if entry is not None:
+                etag = entry.headers.get("etag")
+                if etag and etag_matches(request.headers.get("if-none-match"), etag):
+                    return not_modified(entry.headers)
+                return Response(
+                    entry.body,
+                    media_type=entry.media_type,
+                    headers={**entry.headers, "X-Cache": "HIT"},
+                )
+
+            generation = response_cache.generation
+            response = await handler(request)
+            body = getattr(response, "body", None)
+            if response.status_code == 200 and body is not None:
+                response_cache.set(
+                    key,
+                    body,
+                    media_type=response.media_type,
+                    tags=[tag.format(**request.path_params) for tag in tags],
+                    generation=generation,
+                    headers={
+                        name: response.headers[name]
+                        for name in VALIDATOR_HEADERS
+                        if name in response.headers
+                    },
+                )
+            response.headers["X-Cache"] = "MISS"
+            return response
+
+        return cached_handler
@@ -0,0 +1,157 @@
+"""
+HTTP conditional requests (ETag / Last-Modified).
+
+Endpoints compute a cheap version of the data behind a response (see
+`CRUDBase.version` and `CRUDBase.list_version`) before loading it. When
+the client already holds that version, a 304 is returned right away,
+without loading records or serializing the response.
+"""
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Iterable, Optional
+
+from fastapi import Request, Response
+
+# Headers describing the validators of a response, kept with cached responses
+VALIDATOR_HEADERS = ("etag", "last-modified")
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a weak ETag from the values identifying a response's content."""
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Compare an If-None-Match header with an ETag (weak comparison).
+
+    Args:
+        if_none_match: Header value, a list of tags or "*"
+        etag: Current ETag of the resource
+
+    Returns:
+        True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def not_modified(headers: Dict[str, str]) -> Response:
+    """Build an empty 304 response carrying the given validator headers."""
+    return Response(status_code=304, headers=headers)
+
+
+@dataclass
+class Validators:
+    """ETag and Last-Modified of a response."""
+
+    etag: str
+    last_modified: Optional[datetime] = None
+    # Last-Modified can only answer If-Modified-Since when every change,
+    # deletes included, moves it forward
+    use_modified_since: bool = True
+
+    @classmethod
+    def for_record(
+        cls,
+        version: Iterable[Any],
+        request: Optional[Request] = None,
+        collections: bool = False,
+    ) -> "Validators":
+        """
+        Validators of a detail response, from `CRUDBase.version`.
+
+        Pass the request when query parameters select what the response
+        includes (e.g. pages of related collections), to make them part of
+        the ETag. Pass `collections=True` when the version covers related
+        collections: deleting one of their rows changes the response but
+        not the latest `updated_at`, so only the ETag can validate it, as
+        for lists.
+        """
+        version = tuple(version)
+        if request is not None:
+            version += (sorted(request.query_params.multi_items()),)
+        timestamps = [value for value in version if isinstance(value, datetime)]
+        return cls(
+            make_etag(version),
+            max(timestamps) if timestamps else None,
+            use_modified_since=not collections,
+        )
+
+    @classmethod
+    def for_list(
+        cls, version: Iterable[Any], request: Request, related: Iterable[Any] = ()
+    ) -> "Validators":
+        """
+        Validators of a list response, from `CRUDBase.list_version`.
+
+        The query string is part of the ETag, since every page, sort order
+        and filter of the same list has its own content. `related` holds
+        the versions of other tables included in the items (see
+        `CRUDBase.last_updated`).
+        """
+        count, last_updated = version
+        query = sorted(request.query_params.multi_items())
+        etag = make_etag(count, last_updated, tuple(related), query)
+        return cls(etag, last_updated, use_modified_since=False)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Response headers carrying the validators."""
+        headers = {"ETag": self.etag}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(
+                self.last_modified.astimezone(timezone.utc), usegmt=True
+            )
+        return headers
+
+    def is_current(self, request: Request) -> bool:
+        """
+        Tell whether the client's cached copy is still current.
+
+        If-None-Match takes precedence; If-Modified-Since is only used when
+        the request has no If-None-Match.
+        """
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            return etag_matches(if_none_match, self.etag)
+        if_modified_since = request.headers.get("if-modified-since")
+        if not (if_modified_since and self.use_modified_since and self.last_modified):
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates have a resolution of one second
+        return self.last_modified.replace(microsecond=0) <= since
+
+    def apply(self, request: Request, response: Response) -> Optional[Response]:
+        """
+        Answer with 304 if the client's copy is current, else add the headers.
+
+        Args:
+            request: Incoming request
+            response: Response object injected into the endpoint
+
+        Returns:
+            A 304 response to return, or None to build the full response
+        """
+        if self.is_current(request):
+            return not_modified(self.headers)
+        response.headers.update(self.headers)
+        return None
@@ -0,0 +1,158 @@
+"""
+Relation expansion for list endpoints (`expand=` query parameter).
+
+List items carry the ids of the records they reference (`politician_id`,
+`bill_id`, `sponsor_id`). With `expand`, each named relation is resolved
+for the whole page at once: the referenced ids are collected and
+deduplicated, looked up in the hot record cache, and the rest is loaded
+with one `id = ANY(...)` query per relation. The number of queries
+depends on the number of expanded relations, never on the page size.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, create_model
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.serialization import normalize_urls, schema_columns
+from app.core.cache import entity_cache
+from app.crud.base import CRUDBase
+
+EXPAND_DESCRIPTION = "Comma-separated relations to include with each item"
+
+
+@dataclass(frozen=True)
+class Expansion:
+    """
+    A many-to-one relation list items can be expanded with.
+
+    `schema` is the regular response schema of the related records; the
+    hot record cache holds records with the columns of that schema.
+    """
+
+    foreign_key: str
+    crud: CRUDBase
+    schema: Type[BaseModel]
+
+
+def parse_expand(value: Optional[str], expansions: Mapping[str, Expansion]) -> Tuple[str, ...]:
+    """
+    Parse an `expand` query parameter.
+
+    Args:
+        value: Comma-separated relation names, None or empty for none
+        expansions: Relations that may be expanded, by name
+
+    Returns:
+        The requested names, in the order of `expansions`
+
+    Raises:
+        HTTPException: 400 if a name is not allowed
+    """
+    if not value:
+        return ()
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = requested.difference(expansions)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown relations: {', '.join(sorted(unknown))}; allowed: {', '.join(expansions)}",
+        )
+    return tuple(name for name in expansions if name in requested)
+
+
+def with_foreign_keys(
+    fields: Tuple[str, ...],
+    names: Sequence[str],
+    expansions: Mapping[str, Expansion],
+    allowed: Sequence[str],
+) -> Tuple[str, ...]:
+    """Add the foreign keys of expanded relations to a sparse field set, in `allowed` order."""
+    keys = {expansions[name].foreign_key for name in names}
+    return tuple(name for name in allowed if name in fields or name in keys)
+
+
+def expanded_schema(
+    schema: Type[BaseModel], names: Sequence[str], expansions: Mapping[str, Expansion]
+) -> Type[BaseModel]:
+    """
+    Derive an item schema with optional fields for expanded relations.
+
+    Args:
+        schema: Item schema of the list
+        names: Relations to expand, from `parse_expand`
+        expansions: Relations that may be expanded, by name
+
+    Returns:
+        Schema class, the same object for the same arguments
+    """
+    return _expanded_schema(schema, tuple((name, expansions[name].schema) for name in names))
+
+
+@lru_cache(maxsize=256)
+def _expanded_schema(
+    schema: Type[BaseModel], relations: Tuple[Tuple[str, Type[BaseModel]], ...]
+) -> Type[BaseModel]:
+    return create_model(
+        f"{schema.__name__}Expanded",
+        __base__=schema,
+        **{name: (Optional[related], None) for name, related in relations},
+    )
+
+
+async def load_records(
+    db: AsyncSession,
+    crud: CRUDBase,
+    schema: Type[BaseModel],
+    ids: Iterable[Hashable],
+) -> Dict[Hashable, Dict[str, Any]]:
+    """
+    Get records by id, from the hot record cache or in one query.
+
+    Args:
+        db: Database session
+        crud: CRUD object of the records' table
+        schema: Response schema of the records, selecting their columns
+        ids: Distinct record ids
+
+    Returns:
+        Dictionaries of column values by id; ids not found are missing
+    """
+    ids = list(ids)
+    table = crud.model.__table__.name
+    records = entity_cache.get_many(table, ids)
+    missing = [id for id in ids if id not in records]
+    if missing:
+        generation = entity_cache.generation
+        loaded = await crud.get_many(db, missing, columns=schema_columns(schema, crud.model))
+        normalize_urls(list(loaded.values()), schema)
+        entity_cache.set_many(table, loaded, generation=generation)
+        records.update(loaded)
+    return records
+
+
+async def expand_items(
+    db: AsyncSession,
+    items: List[Dict[str, Any]],
+    names: Sequence[str],
+    expansions: Mapping[str, Expansion],
+) -> None:
+    """
+    Add the records of expanded relations to list items, in place.
+
+    Args:
+        db: Database session
+        items: Items as dictionaries of column values, including the
+            foreign keys of the expanded relations
+        names: Relations to expand, from `parse_expand`
+        expansions: Relations that may be expanded, by name
+    """
+    for name in names:
+        expansion = expansions[name]
+        ids = {item[expansion.foreign_key] for item in items} - {None}
+        records = await load_records(db, expansion.crud, expansion.schema, ids)
+        for item in items:
+            id = item[expansion.foreign_key]
+            item[name] = records.get(id) if id is not None else None
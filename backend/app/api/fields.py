@@ -0,0 +1,103 @@
+"""
+Sparse fieldsets for read endpoints (`fields=` query parameter).
+
+A request names the fields it needs and the endpoint selects only the
+matching columns: Core column rows for lists, `load_only` for records,
+and no query at all for relations that were not asked for. The result is
+validated against a schema derived from the endpoint's response schema,
+built once per field set.
+"""
+from functools import lru_cache
+from typing import Any, Mapping, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ConfigDict, create_model
+
+# Always part of a sparse response, so items can still be told apart
+ID_FIELD = "id"
+
+FIELDS_DESCRIPTION = "Comma-separated fields to include (id is always included)"
+
+
+def parse_fields(value: Optional[str], allowed: Sequence[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a `fields` query parameter.
+
+    Args:
+        value: Comma-separated field names, None or empty for all fields
+        allowed: Names that may be requested, in response order
+
+    Returns:
+        The requested names plus "id", in the order of `allowed`, or None
+        for all fields
+
+    Raises:
+        HTTPException: 400 if a name is not allowed
+    """
+    if not value:
+        return None
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}; allowed: {', '.join(allowed)}",
+        )
+    requested.add(ID_FIELD)
+    return tuple(name for name in allowed if name in requested)
+
+
+def column_fields(fields: Sequence[str], model: Any) -> Tuple[str, ...]:
+    """Get the names among `fields` that are columns of a model's table."""
+    return tuple(name for name in fields if name in model.__table__.columns)
+
+
+@lru_cache(maxsize=256)
+def sparse_schema(
+    schema: Type[BaseModel],
+    fields: Tuple[str, ...],
+    nested: Tuple[Tuple[str, Any], ...] = (),
+) -> Type[BaseModel]:
+    """
+    Derive a schema with only some fields of another one.
+
+    Args:
+        schema: Response schema to derive from
+        fields: Names of the fields to keep, in output order
+        nested: Pairs of (field name, annotation) replacing the annotation
+            of kept fields, e.g. with sparse schemas of nested objects
+
+    Returns:
+        Schema class, the same object for the same arguments
+    """
+    annotations = dict(nested)
+    definitions = {
+        name: (annotations.get(name, schema.model_fields[name].annotation), schema.model_fields[name])
+        for name in fields
+    }
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **definitions,
+    )
+
+
+def sparse_response(
+    content: Any,
+    schema: Type[BaseModel],
+    headers: Optional[Mapping[str, str]] = None,
+) -> JSONResponse:
+    """
+    Validate content against a derived schema and render it as FastAPI would.
+
+    Args:
+        content: Model instance or dictionary to send
+        schema: Schema from `sparse_schema`
+        headers: Headers to send, e.g. those set on the injected `Response`
+
+    Returns:
+        JSON response with only the fields of `schema`
+    """
+    body = schema.model_validate(content).model_dump(mode="json")
+    return JSONResponse(body, headers=dict(headers or {}))
@@ -1,94 +1,192 @@
 from typing import Any, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.batch import IDS_DESCRIPTION, batch_get, parse_ids
+from app.api.cache import CachedRoute, cached
+from app.api.conditional import Validators
+from app.api.expand import EXPAND_DESCRIPTION, Expansion, expand_items, expanded_schema, parse_expand, with_foreign_keys
+from app.api.fields import FIELDS_DESCRIPTION, column_fields, parse_fields, sparse_response, sparse_schema
+from app.api.serialization import page_response, schema_columns
+from app.core.config import settings
+from app.crud.base import CountMode, PaginationError
+from app.crud.crud_bill import bill as crud_bill
+from app.crud.crud_politician import politician as crud_politician
 from app.db.session import get_db
 from app.models.bill import Bill
+from app.schemas.politician.politician import Politician as PoliticianSchema
+from app.schemas.batch.batch import BatchGetRequest
 from app.schemas.bill.bill import (
     Bill as BillSchema,
     BillCreate,
     BillUpdate,
     BillPage,
+    BillSearchPage,
     BillWithSponsor,
+    BillBatch,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
+
+EXPANSIONS = {
+    "sponsor": Expansion("sponsor_id", crud_politician, PoliticianSchema),
+}
 
 
 @router.get("", response_model=BillPage, summary="Get bills")
 async def read_bills(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     skip: int = Query(0, ge=0, description="Skip items"),
     limit: int = Query(100, ge=1, le=100, description="Limit items"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page (replaces skip)"),
+    sort: Optional[str] = Query(None, description="Sort order: created_at, bill_number (prefix - for descending)"),
+    count_mode: CountMode = Query("exact", description="How to compute total: exact, estimate or none"),
     status: Optional[str] = Query(None, description="Filter by status"),
     sponsor_id: Optional[UUID] = Query(None, description="Filter by sponsor ID"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION),
 ) -> Any:
     """
     Retrieve bills with pagination and filtering options.
     """
-    # For now, return a simple response
-    # In a real implementation, we would use proper CRUD methods
-    from sqlalchemy import select, func
-    from sqlalchemy.orm import joinedload
-
-    query = select(Bill)
-
-    # Apply filters
-    if status:
-        query = query.filter(Bill.status == status)
-    if sponsor_id:
-        query = query.filter(Bill.sponsor_id == sponsor_id)
-
-    # Get count
-    count_query = select(func.count()).select_from(Bill)
-    if status:
-        count_query = count_query.filter(Bill.status == status)
-    if sponsor_id:
-        count_query = count_query.filter(Bill.sponsor_id == sponsor_id)
+    allowed = schema_columns(BillSchema, Bill)
+    selected = parse_fields(fields, allowed)
+    expanded = parse_expand(expand, EXPANSIONS)
+    if selected and expanded:
+        selected = with_foreign_keys(selected, expanded, EXPANSIONS, allowed)
+    filters = {
+        "status": status or None,
+        "sponsor_id": sponsor_id,
+    }
+    if count_mode == "exact":
+        # The list version costs the same as the exact total it also provides
+        version = await crud_bill.list_version(db, filters=filters)
+        related = [await EXPANSIONS[relation].crud.last_updated(db) for relation in expanded]
+        not_modified = Validators.for_list(version, request, related).apply(request, response)
+        if not_modified:
+            return not_modified
+
+    try:
+        fast = settings.FAST_LIST_SERIALIZATION
+        schema = sparse_schema(BillSchema, selected) if selected else BillSchema
+        if expanded:
+            schema = expanded_schema(schema, expanded, EXPANSIONS)
+        rows = fast or selected or expanded
+        page = await crud_bill.get_page(
+            db,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            filters=filters,
+            count_mode=count_mode,
+            columns=schema_columns(schema, Bill) if rows else None,
+        )
+    except PaginationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if expanded:
+        await expand_items(db, page.items, expanded, EXPANSIONS)
+    if rows:
+        return page_response(
+            page, skip=skip, limit=limit, schema=schema, headers=response.headers
+        )
+    return page.to_response(skip=skip, limit=limit)
+
+
+@router.get("/search", response_model=BillSearchPage, summary="Search bills")
+async def search_bills(
+    db: AsyncSession = Depends(get_db),
+    q: str = Query(..., min_length=1, description="Search terms (supports \"phrases\", -exclusion and OR)"),
+    limit: int = Query(20, ge=1, le=100, description="Limit items"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    sponsor_id: Optional[UUID] = Query(None, description="Filter by sponsor ID"),
+) -> Any:
+    """
+    Full-text search over bill titles and descriptions.
 
-    result = await db.execute(count_query)
-    total_count = result.scalar_one()
+    Results are ordered by relevance and include a highlighted snippet.
+    """
+    try:
+        return await crud_bill.search(
+            db,
+            q=q,
+            limit=limit,
+            cursor=cursor,
+            filters={"status": status or None, "sponsor_id": sponsor_id},
+        )
+    except PaginationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/batch-get", response_model=BillBatch, summary="Get bills by IDs")
+async def batch_get_bills(
+    *,
+    db: AsyncSession = Depends(get_db),
+    batch: BatchGetRequest,
+) -> Any:
+    """
+    Get many bills by ID at once, in request order, with the IDs not found.
+    """
+    return await batch_get(db, crud_bill, BillSchema, batch.ids)
 
-    # Apply pagination
-    query = query.offset(skip).limit(limit)
 
-    result = await db.execute(query)
-    items = result.scalars().all()
-
-    # Calculate pagination values
-    total_pages = (total_count + limit - 1) // limit if total_count > 0 else 0
-    current_page = skip // limit + 1 if skip % limit == 0 else skip // limit + 1
-
-    return {
-        "items": items,
-        "total": total_count,
-        "page": current_page,
-        "size": limit,
-        "pages": total_pages,
-    }
+@router.get("/batch-get", response_model=BillBatch, summary="Get bills by IDs")
+async def read_bills_by_ids(
+    *,
+    db: AsyncSession = Depends(get_db),
+    ids: str = Query(..., description=IDS_DESCRIPTION),
+) -> Any:
+    """
+    Get many bills by ID at once, in request order, with the IDs not found.
+    """
+    return await batch_get(db, crud_bill, BillSchema, parse_ids(ids))
 
 
 @router.get("/{id}", response_model=BillWithSponsor, summary="Get bill by ID")
+@cached("bill:{id}", "politician")
 async def read_bill(
     *,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     id: UUID = Path(..., description="The UUID of the bill"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
 ) -> Any:
     """
     Get a specific bill by ID.
     """
+    selected = parse_fields(fields, schema_columns(BillWithSponsor, Bill) + ("sponsor",))
+    version = await crud_bill.version(db, id, related=(Bill.sponsor,))
+    if version is None:
+        raise HTTPException(status_code=404, detail="Bill not found")
+    not_modified = Validators.for_record(version, request).apply(request, response)
+    if not_modified:
+        return not_modified
+
     from sqlalchemy import select
     from sqlalchemy.orm import joinedload
 
-    query = select(Bill).options(joinedload(Bill.sponsor)).filter(Bill.id == id)
+    query = select(Bill).filter(Bill.id == id)
+    if not selected or "sponsor" in selected:
+        query = query.options(joinedload(Bill.sponsor))
+    if selected:
+        query = query.options(crud_bill.load_only(column_fields(selected, Bill)))
     result = await db.execute(query)
     db_obj = result.scalars().first()
 
     if not db_obj:
         raise HTTPException(status_code=404, detail="Bill not found")
 
+    if selected:
+        return sparse_response(
+            db_obj, sparse_schema(BillWithSponsor, selected), headers=response.headers
+        )
     return db_obj
 
 
@@ -106,7 +204,7 @@ async def create_bill(
 
     db_obj = Bill(**bill_in.dict())
     db.add(db_obj)
-    await db.commit()
+    await crud_bill.commit_write(db, db_obj)
     await db.refresh(db_obj)
 
     return db_obj
@@ -136,7 +234,7 @@ async def update_bill(
         setattr(db_obj, field, value)
 
     db.add(db_obj)
-    await db.commit()
+    await crud_bill.commit_write(db, db_obj)
     await db.refresh(db_obj)
 
     return db_obj
@@ -161,6 +259,6 @@ async def delete_bill(
         raise HTTPException(status_code=404, detail="Bill not found")
 
     await db.delete(db_obj)
-    await db.commit()
+    await crud_bill.commit_write(db, db_obj)
 
     return db_obj
@@ -1,118 +1,242 @@
-from typing import Any, List, Optional
+from typing import Any, List, Literal, Optional
 from uuid import UUID
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.orm import joinedload
 
+from app.api.batch import IDS_DESCRIPTION, batch_get, parse_ids
+from app.api.cache import CachedRoute, cached
+from app.api.conditional import Validators
+from app.api.expand import EXPAND_DESCRIPTION, Expansion, expand_items, expanded_schema, parse_expand, with_foreign_keys
+from app.api.fields import FIELDS_DESCRIPTION, column_fields, parse_fields, sparse_response, sparse_schema
+from app.api.serialization import page_response, schema_columns
+from app.core.config import settings
+from app.crud.base import CountMode, PaginationError
+from app.crud.bulk import DEFAULT_BATCH_SIZE, bulk_copy, parser_for
+from app.crud.crud_contribution import contribution as crud_contribution
+from app.crud.crud_politician import politician as crud_politician
+from app.crud.export import EXPORT_MEDIA_TYPES, ExportFormat, export_rows, wants_gzip
+from app.db.invalidation import publish_now
 from app.db.session import get_db
+from app.schemas.bulk.bulk import BulkReport
 from app.models.political_contribution import PoliticalContribution
+from app.schemas.politician.politician import Politician as PoliticianSchema
+from app.schemas.batch.batch import BatchGetRequest
 from app.schemas.contribution.contribution import (
     Contribution as ContributionSchema,
     ContributionCreate,
     ContributionUpdate,
     ContributionPage,
     ContributionWithPolitician,
+    ContributionBatch,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
+
+EXPANSIONS = {
+    "politician": Expansion("politician_id", crud_politician, PoliticianSchema),
+}
 
 
 @router.get("", response_model=ContributionPage, summary="Get contributions")
 async def read_contributions(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     skip: int = Query(0, ge=0, description="Skip items"),
     limit: int = Query(100, ge=1, le=100, description="Limit items"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page (replaces skip)"),
+    sort: Optional[str] = Query(None, description="Sort order: contribution_date, amount, created_at (prefix - for descending)"),
+    count_mode: CountMode = Query("exact", description="How to compute total: exact, estimate or none"),
     politician_id: Optional[UUID] = Query(None, description="Filter by politician ID"),
     contributor_name: Optional[str] = Query(None, description="Filter by contributor name"),
+    match: Literal["partial", "fuzzy"] = Query(
+        "partial", description="Contributor name matching: partial (substring) or fuzzy (ranked by similarity)"
+    ),
     contributor_type: Optional[str] = Query(None, description="Filter by contributor type"),
     min_amount: Optional[float] = Query(None, ge=0, description="Minimum contribution amount"),
     max_amount: Optional[float] = Query(None, ge=0, description="Maximum contribution amount"),
     from_date: Optional[date] = Query(None, description="Filter contributions from this date"),
     to_date: Optional[date] = Query(None, description="Filter contributions to this date"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION),
 ) -> Any:
     """
     Retrieve political contributions with pagination and filtering options.
     """
-    query = select(PoliticalContribution)
-
-    # Apply filters
-    if politician_id:
-        query = query.filter(PoliticalContribution.politician_id == politician_id)
-    if contributor_name:
-        query = query.filter(PoliticalContribution.contributor_name.ilike(f"%{contributor_name}%"))
-    if contributor_type:
-        query = query.filter(PoliticalContribution.contributor_type == contributor_type)
-    if min_amount is not None:
-        query = query.filter(PoliticalContribution.amount >= min_amount)
-    if max_amount is not None:
-        query = query.filter(PoliticalContribution.amount <= max_amount)
-    if from_date:
-        query = query.filter(PoliticalContribution.contribution_date >= from_date)
-    if to_date:
-        query = query.filter(PoliticalContribution.contribution_date <= to_date)
-
-    # Get count
-    count_query = select(func.count()).select_from(PoliticalContribution)
-    if politician_id:
-        count_query = count_query.filter(PoliticalContribution.politician_id == politician_id)
-    if contributor_name:
-        count_query = count_query.filter(PoliticalContribution.contributor_name.ilike(f"%{contributor_name}%"))
-    if contributor_type:
-        count_query = count_query.filter(PoliticalContribution.contributor_type == contributor_type)
-    if min_amount is not None:
-        count_query = count_query.filter(PoliticalContribution.amount >= min_amount)
-    if max_amount is not None:
-        count_query = count_query.filter(PoliticalContribution.amount <= max_amount)
-    if from_date:
-        count_query = count_query.filter(PoliticalContribution.contribution_date >= from_date)
-    if to_date:
-        count_query = count_query.filter(PoliticalContribution.contribution_date <= to_date)
-
-    result = await db.execute(count_query)
-    total_count = result.scalar_one()
-
-    # Apply pagination
-    query = query.offset(skip).limit(limit)
-
-    result = await db.execute(query)
-    items = result.scalars().all()
-
-    # Calculate pagination values
-    total_pages = (total_count + limit - 1) // limit if total_count > 0 else 0
-    current_page = skip // limit + 1 if skip % limit == 0 else skip // limit + 1
-
-    return {
-        "items": items,
-        "total": total_count,
-        "page": current_page,
-        "size": limit,
-        "pages": total_pages,
+    allowed = schema_columns(ContributionSchema, PoliticalContribution)
+    selected = parse_fields(fields, allowed)
+    expanded = parse_expand(expand, EXPANSIONS)
+    if selected and expanded:
+        selected = with_foreign_keys(selected, expanded, EXPANSIONS, allowed)
+    filters = {
+        "politician_id": politician_id,
+        "contributor_name": (contributor_name or None) if match == "partial" else None,
+        "contributor_name_fuzzy": (contributor_name or None) if match == "fuzzy" else None,
+        "contributor_type": contributor_type or None,
+        "min_amount": min_amount,
+        "max_amount": max_amount,
+        "from_date": from_date,
+        "to_date": to_date,
     }
+    if count_mode == "exact":
+        # The list version costs the same as the exact total it also provides
+        version = await crud_contribution.list_version(db, filters=filters)
+        related = [await EXPANSIONS[relation].crud.last_updated(db) for relation in expanded]
+        not_modified = Validators.for_list(version, request, related).apply(request, response)
+        if not_modified:
+            return not_modified
+
+    try:
+        fast = settings.FAST_LIST_SERIALIZATION
+        schema = sparse_schema(ContributionSchema, selected) if selected else ContributionSchema
+        if expanded:
+            schema = expanded_schema(schema, expanded, EXPANSIONS)
+        rows = fast or selected or expanded
+        page = await crud_contribution.get_page(
+            db,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            filters=filters,
+            count_mode=count_mode,
+            columns=schema_columns(schema, PoliticalContribution) if rows else None,
+        )
+    except PaginationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if expanded:
+        await expand_items(db, page.items, expanded, EXPANSIONS)
+    if rows:
+        return page_response(
+            page, skip=skip, limit=limit, schema=schema, headers=response.headers
+        )
+    return page.to_response(skip=skip, limit=limit)
+
+
+@router.get(
+    "/export",
+    summary="Export contributions",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}},
+)
+async def export_contributions(
+    request: Request,
+    format: ExportFormat = Query("ndjson", description="Output format: ndjson or csv"),
+    sort: Optional[str] = Query(None, description="Sort order: contribution_date, amount, created_at (prefix - for descending)"),
+    politician_id: Optional[UUID] = Query(None, description="Filter by politician ID"),
+    contributor_name: Optional[str] = Query(None, description="Filter by contributor name"),
+    match: Literal["partial", "fuzzy"] = Query(
+        "partial", description="Contributor name matching: partial (substring) or fuzzy (similar words)"
+    ),
+    contributor_type: Optional[str] = Query(None, description="Filter by contributor type"),
+    min_amount: Optional[float] = Query(None, ge=0, description="Minimum contribution amount"),
+    max_amount: Optional[float] = Query(None, ge=0, description="Maximum contribution amount"),
+    from_date: Optional[date] = Query(None, description="Filter contributions from this date"),
+    to_date: Optional[date] = Query(None, description="Filter contributions to this date"),
+) -> Any:
+    """
+    Stream all political contributions matching the filters as NDJSON or CSV.
+
+    The response is gzip-compressed when the client accepts it.
+    """
+    gzip = wants_gzip(request)
+    try:
+        rows = export_rows(
+            crud_contribution,
+            filters={
+                "politician_id": politician_id,
+                "contributor_name": (contributor_name or None) if match == "partial" else None,
+                "contributor_name_fuzzy": (contributor_name or None) if match == "fuzzy" else None,
+                "contributor_type": contributor_type or None,
+                "min_amount": min_amount,
+                "max_amount": max_amount,
+                "from_date": from_date,
+                "to_date": to_date,
+            },
+            sort=sort,
+            file_format=format,
+            gzip=gzip,
+        )
+    except PaginationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    headers = {"Content-Disposition": f'attachment; filename="contributions.{format}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(rows, media_type=EXPORT_MEDIA_TYPES[format], headers=headers)
+
+
+@router.post("/batch-get", response_model=ContributionBatch, summary="Get contributions by IDs")
+async def batch_get_contributions(
+    *,
+    db: AsyncSession = Depends(get_db),
+    batch: BatchGetRequest,
+) -> Any:
+    """
+    Get many contributions by ID at once, in request order, with the IDs not found.
+    """
+    return await batch_get(db, crud_contribution, ContributionSchema, batch.ids)
+
+
+@router.get("/batch-get", response_model=ContributionBatch, summary="Get contributions by IDs")
+async def read_contributions_by_ids(
+    *,
+    db: AsyncSession = Depends(get_db),
+    ids: str = Query(..., description=IDS_DESCRIPTION),
+) -> Any:
+    """
+    Get many contributions by ID at once, in request order, with the IDs not found.
+    """
+    return await batch_get(db, crud_contribution, ContributionSchema, parse_ids(ids))
 
 
 @router.get("/{id}", response_model=ContributionWithPolitician, summary="Get contribution by ID")
+@cached("political_contribution:{id}", "politician")
 async def read_contribution(
     *,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     id: UUID = Path(..., description="The UUID of the contribution"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
 ) -> Any:
     """
     Get a specific contribution by ID with related politician information.
     """
-    query = (
-        select(PoliticalContribution)
-        .options(joinedload(PoliticalContribution.politician))
-        .filter(PoliticalContribution.id == id)
+    selected = parse_fields(
+        fields,
+        schema_columns(ContributionWithPolitician, PoliticalContribution) + ("politician",),
     )
+    version = await crud_contribution.version(db, id, related=(PoliticalContribution.politician,))
+    if version is None:
+        raise HTTPException(status_code=404, detail="Contribution not found")
+    not_modified = Validators.for_record(version, request).apply(request, response)
+    if not_modified:
+        return not_modified
+
+    query = select(PoliticalContribution).filter(PoliticalContribution.id == id)
+    if not selected or "politician" in selected:
+        query = query.options(joinedload(PoliticalContribution.politician))
+    if selected:
+        query = query.options(
+            crud_contribution.load_only(column_fields(selected, PoliticalContribution))
+        )
     result = await db.execute(query)
     db_obj = result.scalars().first()
 
     if not db_obj:
         raise HTTPException(status_code=404, detail="Contribution not found")
 
+    if selected:
+        return sparse_response(
+            db_obj, sparse_schema(ContributionWithPolitician, selected), headers=response.headers
+        )
     return db_obj
 
 
@@ -127,12 +251,56 @@ async def create_contribution(
     """
     db_obj = PoliticalContribution(**contribution_in.dict())
     db.add(db_obj)
-    await db.commit()
+    await crud_contribution.commit_write(db, db_obj)
     await db.refresh(db_obj)
 
     return db_obj
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkReport,
+    summary="Bulk load contributions",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string"}},
+                "text/csv": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def bulk_create_contributions(
+    request: Request,
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=50000, description="Rows per batch"),
+) -> Any:
+    """
+    Load many contribution records from an NDJSON or CSV request body.
+
+    Each line (or CSV row, with a header) must match the create schema. The
+    body is streamed and written with COPY in batches; the response reports
+    rejected rows and failed batches instead of failing the whole request.
+    """
+    content_type = request.headers.get("content-type")
+    try:
+        parser_for(content_type)
+    except ValueError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+
+    report = await bulk_copy(
+        PoliticalContribution,
+        ContributionCreate,
+        request.stream(),
+        content_type=content_type,
+        batch_size=batch_size,
+    )
+    if report["inserted"]:
+        crud_contribution.invalidate_cache()
+        await publish_now(crud_contribution.model.__table__.name)
+    return report
+
+
 @router.put("/{id}", response_model=ContributionSchema, summary="Update contribution")
 async def update_contribution(
     *,
@@ -155,7 +323,7 @@ async def update_contribution(
         setattr(db_obj, field, value)
 
     db.add(db_obj)
-    await db.commit()
+    await crud_contribution.commit_write(db, db_obj)
     await db.refresh(db_obj)
 
     return db_obj
@@ -178,46 +346,77 @@ async def delete_contribution(
         raise HTTPException(status_code=404, detail="Contribution not found")
 
     await db.delete(db_obj)
-    await db.commit()
+    await crud_contribution.commit_write(db, db_obj)
 
     return db_obj
 
 
 @router.get("/statistics/top-contributors", summary="Get top contributors")
+@cached("political_contribution")
 async def top_contributors(
     db: AsyncSession = Depends(get_db),
     limit: int = Query(10, ge=1, le=100, description="Limit results"),
+    contributor_type: Optional[str] = Query(None, description="Filter by contributor type"),
+    from_date: Optional[date] = Query(None, description="Contributions from the month of this date"),
+    to_date: Optional[date] = Query(None, description="Contributions up to the month of this date"),
+    politician_id: Optional[UUID] = Query(None, description="Filter by politician ID"),
 ) -> Any:
     """
     Get statistics about top contributors across all politicians.
+
+    Date filters apply to whole calendar months.
     """
-    query = (
-        select(
-            PoliticalContribution.contributor_name,
-            PoliticalContribution.contributor_type,
-            func.sum(PoliticalContribution.amount).label("total_amount"),
-            func.count().label("contribution_count"),
-            func.count(func.distinct(PoliticalContribution.politician_id)).label("politicians_supported")
-        )
-        .group_by(
-            PoliticalContribution.contributor_name,
-            PoliticalContribution.contributor_type
-        )
-        .order_by(func.sum(PoliticalContribution.amount).desc())
-        .limit(limit)
+    stats = await crud_contribution.top_contributors(
+        db,
+        limit=limit,
+        contributor_type=contributor_type,
+        from_date=from_date,
+        to_date=to_date,
+        politician_id=politician_id,
     )
 
-    result = await db.execute(query)
-    stats = result.all()
+    return [
+        {
+            "contributor_name": row["contributor_name"],
+            "contributor_type": row["contributor_type"],
+            "total_amount": float(row["total_amount"]),
+            "contribution_count": row["contribution_count"],
+            "politicians_supported": row["politicians_supported"],
+            "average_contribution": (
+                float(row["total_amount"]) / row["contribution_count"] if row["contribution_count"] > 0 else 0
+            ),
+        }
+        for row in stats
+    ]
+
+
+@router.get("/statistics/by-party", summary="Get contribution totals by party and month")
+@cached("mv_party_contributions_monthly")
+async def contributions_by_party(
+    db: AsyncSession = Depends(get_db),
+    party: Optional[str] = Query(None, description="Filter by party (empty for no party)"),
+    from_date: Optional[date] = Query(None, description="Months from the month of this date"),
+    to_date: Optional[date] = Query(None, description="Months up to the month of this date"),
+    limit: int = Query(500, ge=1, le=5000, description="Limit results"),
+) -> Any:
+    """
+    Get contribution totals per party and month.
+
+    Served from a materialized view refreshed every few minutes; see
+    /health/matviews for when it was last refreshed.
+    """
+    stats = await crud_contribution.party_totals(
+        db, party=party, from_date=from_date, to_date=to_date, limit=limit
+    )
 
     return [
         {
-            "contributor_name": row[0],
-            "contributor_type": row[1],
-            "total_amount": float(row[2]),
-            "contribution_count": row[3],
-            "politicians_supported": row[4],
-            "average_contribution": float(row[2]) / row[3] if row[3] > 0 else 0,
+            "party": row["party"] or None,
+            "month": row["month"].isoformat(),
+            "total_amount": float(row["total_amount"]),
+            "contribution_count": row["contribution_count"],
+            "politicians_supported": row["politicians_supported"],
+            "contributors": row["contributors"],
         }
         for row in stats
     ]
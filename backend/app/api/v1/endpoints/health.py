@@ -1,8 +1,13 @@
 from fastapi import APIRouter, Depends
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import text
 
+from app.core.cache import entity_cache, response_cache
+from app.db.invalidation import invalidation_listener
+from app.db.matviews import MATERIALIZED_VIEWS, matview_refresher
 from app.db.session import get_db
+from app.models.materialized_views import materialized_view_refresh
 
 router = APIRouter()
 
@@ -48,3 +53,43 @@ async def db_health_check(db: AsyncSession = Depends(get_db)):
             "database": "error",
             "message": f"Database connection error: {str(e)}"
         }
+
+
+@router.get("/cache", summary="Response cache statistics")
+async def cache_stats():
+    """
+    Response cache statistics for the worker process serving the request.
+
+    Returns hit, miss, eviction and invalidation counters, the current
+    size of the cache, the same for the hot record cache, and the state of
+    the cross-process invalidation listener.
+    """
+    return {
+        **response_cache.stats(),
+        "entities": entity_cache.stats(),
+        "listener": invalidation_listener.stats(),
+    }
+
+
+@router.get("/matviews", summary="Materialized view refresh status")
+async def matview_stats(db: AsyncSession = Depends(get_db)):
+    """
+    Refresh status of the materialized views.
+
+    For each registered view: its refresh interval, when it was last
+    refreshed (by any worker) and how long that took, and the last refresh
+    error; plus the state of this worker's refresher.
+    """
+    result = await db.execute(select(materialized_view_refresh))
+    refreshes = {row["view_name"]: row for row in result.mappings()}
+    views = {}
+    for name, view in MATERIALIZED_VIEWS.items():
+        refresh = refreshes.get(name, {})
+        views[name] = {
+            "interval_seconds": view.refresh_interval,
+            "refreshed_at": refresh.get("refreshed_at"),
+            "duration_ms": refresh.get("duration_ms"),
+            "last_error": refresh.get("last_error"),
+            "last_error_at": refresh.get("last_error_at"),
+        }
+    return {"views": views, "refresher": matview_refresher.stats()}
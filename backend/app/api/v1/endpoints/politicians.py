@@ -1,60 +1,93 @@
-from typing import Any, List, Optional
+from typing import Any, List, Literal, Optional, Tuple, Type
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Path, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, Response, status
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 import logging
 
+from app.api.batch import IDS_DESCRIPTION, batch_get, parse_ids
+from app.api.cache import CachedRoute, cached
+from app.api.conditional import Validators
+from app.api.fields import FIELDS_DESCRIPTION, parse_fields, sparse_response, sparse_schema
+from app.api.serialization import page_response, schema_columns
 from app.db.session import get_db
+from app.core.config import settings
+from app.crud.base import CollectionParams, CountMode, PaginationError
 from app.crud.crud_politician import politician
+from app.models.politician import Politician as PoliticianModel
+from app.schemas.batch.batch import BatchGetRequest
 from app.schemas.politician.politician import (
     Politician,
     PoliticianCreate,
     PoliticianUpdate,
     PoliticianPage,
     PoliticianDetail,
+    DetailCollections,
+    PoliticianBatch,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
 
 @router.get("", response_model=PoliticianPage, summary="Get politicians")
 async def read_politicians(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     skip: int = Query(0, ge=0, description="Skip items"),
     limit: int = Query(100, ge=1, le=100, description="Limit items"),
-    name: Optional[str] = Query(None, description="Filter by name (partial match)"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page (replaces skip)"),
+    sort: Optional[str] = Query(None, description="Sort order: name, created_at (prefix - for descending)"),
+    count_mode: CountMode = Query("exact", description="How to compute total: exact, estimate or none"),
+    name: Optional[str] = Query(None, description="Filter by name (accent-insensitive)"),
+    match: Literal["partial", "fuzzy"] = Query(
+        "partial", description="Name matching: partial (substring) or fuzzy (ranked by similarity)"
+    ),
     party: Optional[str] = Query(None, description="Filter by party"),
     country: Optional[str] = Query(None, description="Filter by country"),
     state_province: Optional[str] = Query(None, description="Filter by state/province"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
 ) -> Any:
     """
     Retrieve politicians with pagination and filtering options.
     """
+    selected = parse_fields(fields, schema_columns(Politician, PoliticianModel))
+    filters = {
+        "name": (name or None) if match == "partial" else None,
+        "name_fuzzy": (name or None) if match == "fuzzy" else None,
+        "party": party or None,
+        "country": country or None,
+        "state_province": state_province or None,
+    }
     try:
-        items = await politician.get_by_filters(
+        if count_mode == "exact":
+            # The list version costs the same as the exact total it also provides
+            version = await politician.list_version(db, filters=filters)
+            not_modified = Validators.for_list(version, request).apply(request, response)
+            if not_modified:
+                return not_modified
+
+        fast = settings.FAST_LIST_SERIALIZATION
+        schema = sparse_schema(Politician, selected) if selected else Politician
+        page = await politician.get_page(
             db,
             skip=skip,
             limit=limit,
-            name=name,
-            party=party,
-            country=country,
-            state_province=state_province
+            cursor=cursor,
+            sort=sort,
+            filters=filters,
+            count_mode=count_mode,
+            columns=schema_columns(schema, PoliticianModel) if fast or selected else None,
         )
-        count = await politician.count(db)
-
-        # Calculate pagination values
-        total_pages = (count + limit - 1) // limit if count > 0 else 0
-        current_page = skip // limit + 1 if skip % limit == 0 else skip // limit + 1
-
-        return {
-            "items": items,
-            "total": count,
-            "page": current_page,
-            "size": limit,
-            "pages": total_pages,
-        }
+        if fast or selected:
+            return page_response(
+                page, skip=skip, limit=limit, schema=schema, headers=response.headers
+            )
+        return page.to_response(skip=skip, limit=limit)
+    except PaginationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except SQLAlchemyError as e:
         logging.error(f"Database error when fetching politicians: {str(e)}")
         raise HTTPException(
@@ -94,22 +127,65 @@ async def create_politician(
         )
 
 
+@router.post("/batch-get", response_model=PoliticianBatch, summary="Get politicians by IDs")
+async def batch_get_politicians(
+    *,
+    db: AsyncSession = Depends(get_db),
+    batch: BatchGetRequest,
+) -> Any:
+    """
+    Get many politicians by ID at once, in request order, with the IDs not found.
+    """
+    return await batch_get(db, politician, Politician, batch.ids)
+
+
+@router.get("/batch-get", response_model=PoliticianBatch, summary="Get politicians by IDs")
+async def read_politicians_by_ids(
+    *,
+    db: AsyncSession = Depends(get_db),
+    ids: str = Query(..., description=IDS_DESCRIPTION),
+) -> Any:
+    """
+    Get many politicians by ID at once, in request order, with the IDs not found.
+    """
+    return await batch_get(db, politician, Politician, parse_ids(ids))
+
+
 @router.get("/{id}", response_model=Politician, summary="Get politician by ID")
+@cached("politician:{id}")
 async def read_politician(
     *,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     id: UUID = Path(..., description="The UUID of the politician"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
 ) -> Any:
     """
     Get a specific politician by ID.
     """
+    selected = parse_fields(fields, schema_columns(Politician, PoliticianModel))
     try:
-        result = await politician.get(db, id=id)
+        version = await politician.version(db, id)
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Politician not found"
+            )
+        not_modified = Validators.for_record(version, request).apply(request, response)
+        if not_modified:
+            return not_modified
+
+        result = await politician.get(db, id=id, columns=selected)
         if not result:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Politician not found"
             )
+        if selected:
+            return sparse_response(
+                result, sparse_schema(Politician, selected), headers=response.headers
+            )
         return result
     except SQLAlchemyError as e:
         logging.error(f"Database error when fetching politician ID {id}: {str(e)}")
@@ -127,23 +203,104 @@ async def read_politician(
         )
 
 
+def _sparse_detail_schema(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """Derive the details schema for a field set, with entries for included collections only."""
+    included = tuple(name for name in fields if name in politician.detail_collections)
+    if not included:
+        return sparse_schema(PoliticianDetail, fields)
+    return sparse_schema(
+        PoliticianDetail,
+        fields + ("collections",),
+        (("collections", sparse_schema(DetailCollections, included)),),
+    )
+
+
 @router.get("/{id}/details", response_model=PoliticianDetail, summary="Get politician with related data")
+@cached("politician:{id}", "vote", "bill", "political_contribution")
 async def read_politician_with_relations(
     *,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     id: UUID = Path(..., description="The UUID of the politician"),
+    votes_limit: int = Query(20, ge=1, le=100, description="Votes per page"),
+    votes_cursor: Optional[str] = Query(None, description="Cursor of the next page of votes"),
+    votes_sort: Optional[str] = Query(None, description="Sort order of votes: vote_date, created_at; prefix with - for descending"),
+    sponsored_bills_limit: int = Query(20, ge=1, le=100, description="Sponsored bills per page"),
+    sponsored_bills_cursor: Optional[str] = Query(None, description="Cursor of the next page of sponsored bills"),
+    sponsored_bills_sort: Optional[str] = Query(None, description="Sort order of sponsored bills: created_at, bill_number; prefix with - for descending"),
+    contributions_limit: int = Query(20, ge=1, le=100, description="Contributions per page"),
+    contributions_cursor: Optional[str] = Query(None, description="Cursor of the next page of contributions"),
+    contributions_sort: Optional[str] = Query(None, description="Sort order of contributions: contribution_date, amount, created_at; prefix with - for descending"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION + "; collections not listed are not loaded"),
 ) -> Any:
     """
     Get a specific politician by ID with related data (votes, bills, contributions).
+
+    Each collection holds one page; `collections` reports its total and the
+    cursor of the next page, to pass back as `<collection>_cursor`.
     """
+    selected = parse_fields(
+        fields,
+        schema_columns(PoliticianDetail, PoliticianModel) + tuple(politician.detail_collections),
+    )
+    collections = {
+        "votes": CollectionParams(votes_limit, votes_cursor, votes_sort),
+        "sponsored_bills": CollectionParams(
+            sponsored_bills_limit, sponsored_bills_cursor, sponsored_bills_sort
+        ),
+        "contributions": CollectionParams(
+            contributions_limit, contributions_cursor, contributions_sort
+        ),
+    }
     try:
-        result = await politician.get_with_relations(db, id=id)
+        version = await politician.version(
+            db,
+            id,
+            related=(
+                PoliticianModel.votes,
+                PoliticianModel.sponsored_bills,
+                PoliticianModel.contributions,
+            ),
+        )
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Politician not found"
+            )
+        not_modified = Validators.for_record(version, request, collections=True).apply(request, response)
+        if not_modified:
+            return not_modified
+
+        if settings.DETAIL_JSON_ENGINE == "postgres":
+            document = await politician.get_details_json(
+                db, id=id, collections=collections, fields=selected
+            )
+            if document is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Politician not found"
+                )
+            # Rendered to match PoliticianDetail, sent without re-validation
+            return Response(
+                document.encode(),
+                media_type="application/json",
+                headers=dict(response.headers),
+            )
+
+        result = await politician.get_with_relations(
+            db, id=id, collections=collections, fields=selected
+        )
         if not result:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Politician not found"
             )
+        if selected:
+            return sparse_response(result, _sparse_detail_schema(selected), headers=response.headers)
         return result
+    except PaginationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except SQLAlchemyError as e:
         logging.error(f"Database error when fetching politician relations for ID {id}: {str(e)}")
         raise HTTPException(
@@ -161,14 +318,24 @@ async def read_politician_with_relations(
 
 
 @router.get("/{id}/contributions", summary="Get politician's contribution statistics")
+@cached("politician:{id}", "political_contribution")
 async def read_politician_contributions(
     *,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     id: UUID = Path(..., description="The UUID of the politician"),
 ) -> Any:
     """
     Get a specific politician with their contribution statistics.
     """
+    version = await politician.version(db, id, related=(PoliticianModel.contributions,))
+    if version is None:
+        raise HTTPException(status_code=404, detail="Politician not found")
+    not_modified = Validators.for_record(version, collections=True).apply(request, response)
+    if not_modified:
+        return not_modified
+
     result = await politician.get_with_contribution_stats(db, id=id)
     if not result:
         raise HTTPException(status_code=404, detail="Politician not found")
@@ -2,115 +2,231 @@ from typing import Any, List, Optional
 from uuid import UUID
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.orm import joinedload
 
+from app.api.batch import IDS_DESCRIPTION, batch_get, parse_ids
+from app.api.cache import CachedRoute, cached
+from app.api.conditional import Validators
+from app.api.expand import EXPAND_DESCRIPTION, Expansion, expand_items, expanded_schema, parse_expand, with_foreign_keys
+from app.api.fields import FIELDS_DESCRIPTION, column_fields, parse_fields, sparse_response, sparse_schema
+from app.api.serialization import page_response, schema_columns
+from app.core.config import settings
+from app.crud.base import CountMode, PaginationError
+from app.crud.bulk import DEFAULT_BATCH_SIZE, bulk_copy, parser_for
+from app.crud.crud_bill import bill as crud_bill
+from app.crud.crud_politician import politician as crud_politician
+from app.crud.crud_vote import vote as crud_vote
+from app.crud.export import EXPORT_MEDIA_TYPES, ExportFormat, export_rows, wants_gzip
+from app.db.invalidation import publish_now
 from app.db.session import get_db
+from app.schemas.bulk.bulk import BulkReport
 from app.models.vote import Vote
+from app.schemas.bill.bill import Bill as BillSchema
+from app.schemas.politician.politician import Politician as PoliticianSchema
+from app.schemas.batch.batch import BatchGetRequest
 from app.schemas.vote.vote import (
     Vote as VoteSchema,
     VoteCreate,
     VoteUpdate,
     VotePage,
     VoteWithRelations,
+    VoteBatch,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
+
+EXPANSIONS = {
+    "politician": Expansion("politician_id", crud_politician, PoliticianSchema),
+    "bill": Expansion("bill_id", crud_bill, BillSchema),
+}
 
 
 @router.get("", response_model=VotePage, summary="Get votes")
 async def read_votes(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     skip: int = Query(0, ge=0, description="Skip items"),
     limit: int = Query(100, ge=1, le=100, description="Limit items"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page (replaces skip)"),
+    sort: Optional[str] = Query(None, description="Sort order: vote_date, created_at (prefix - for descending)"),
+    count_mode: CountMode = Query("exact", description="How to compute total: exact, estimate or none"),
     politician_id: Optional[UUID] = Query(None, description="Filter by politician ID"),
     bill_id: Optional[UUID] = Query(None, description="Filter by bill ID"),
     vote_position: Optional[str] = Query(None, description="Filter by vote position"),
     vote_result: Optional[str] = Query(None, description="Filter by vote result"),
     from_date: Optional[date] = Query(None, description="Filter votes from this date"),
     to_date: Optional[date] = Query(None, description="Filter votes to this date"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION),
 ) -> Any:
     """
     Retrieve votes with pagination and filtering options.
     """
-    query = select(Vote)
-
-    # Apply filters
-    if politician_id:
-        query = query.filter(Vote.politician_id == politician_id)
-    if bill_id:
-        query = query.filter(Vote.bill_id == bill_id)
-    if vote_position:
-        query = query.filter(Vote.vote_position == vote_position)
-    if vote_result:
-        query = query.filter(Vote.vote_result == vote_result)
-    if from_date:
-        query = query.filter(Vote.vote_date >= from_date)
-    if to_date:
-        query = query.filter(Vote.vote_date <= to_date)
-
-    # Get count
-    count_query = select(func.count()).select_from(Vote)
-    if politician_id:
-        count_query = count_query.filter(Vote.politician_id == politician_id)
-    if bill_id:
-        count_query = count_query.filter(Vote.bill_id == bill_id)
-    if vote_position:
-        count_query = count_query.filter(Vote.vote_position == vote_position)
-    if vote_result:
-        count_query = count_query.filter(Vote.vote_result == vote_result)
-    if from_date:
-        count_query = count_query.filter(Vote.vote_date >= from_date)
-    if to_date:
-        count_query = count_query.filter(Vote.vote_date <= to_date)
-
-    result = await db.execute(count_query)
-    total_count = result.scalar_one()
-
-    # Apply pagination
-    query = query.offset(skip).limit(limit)
-
-    result = await db.execute(query)
-    items = result.scalars().all()
-
-    # Calculate pagination values
-    total_pages = (total_count + limit - 1) // limit if total_count > 0 else 0
-    current_page = skip // limit + 1 if skip % limit == 0 else skip // limit + 1
-
-    return {
-        "items": items,
-        "total": total_count,
-        "page": current_page,
-        "size": limit,
-        "pages": total_pages,
+    allowed = schema_columns(VoteSchema, Vote)
+    selected = parse_fields(fields, allowed)
+    expanded = parse_expand(expand, EXPANSIONS)
+    if selected and expanded:
+        selected = with_foreign_keys(selected, expanded, EXPANSIONS, allowed)
+    filters = {
+        "politician_id": politician_id,
+        "bill_id": bill_id,
+        "vote_position": vote_position or None,
+        "vote_result": vote_result or None,
+        "from_date": from_date,
+        "to_date": to_date,
     }
+    if count_mode == "exact":
+        # The list version costs the same as the exact total it also provides
+        version = await crud_vote.list_version(db, filters=filters)
+        related = [await EXPANSIONS[relation].crud.last_updated(db) for relation in expanded]
+        not_modified = Validators.for_list(version, request, related).apply(request, response)
+        if not_modified:
+            return not_modified
+
+    try:
+        fast = settings.FAST_LIST_SERIALIZATION
+        schema = sparse_schema(VoteSchema, selected) if selected else VoteSchema
+        if expanded:
+            schema = expanded_schema(schema, expanded, EXPANSIONS)
+        rows = fast or selected or expanded
+        page = await crud_vote.get_page(
+            db,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            filters=filters,
+            count_mode=count_mode,
+            columns=schema_columns(schema, Vote) if rows else None,
+        )
+    except PaginationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if expanded:
+        await expand_items(db, page.items, expanded, EXPANSIONS)
+    if rows:
+        return page_response(
+            page, skip=skip, limit=limit, schema=schema, headers=response.headers
+        )
+    return page.to_response(skip=skip, limit=limit)
+
+
+@router.get(
+    "/export",
+    summary="Export votes",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}},
+)
+async def export_votes(
+    request: Request,
+    format: ExportFormat = Query("ndjson", description="Output format: ndjson or csv"),
+    sort: Optional[str] = Query(None, description="Sort order: vote_date, created_at (prefix - for descending)"),
+    politician_id: Optional[UUID] = Query(None, description="Filter by politician ID"),
+    bill_id: Optional[UUID] = Query(None, description="Filter by bill ID"),
+    vote_position: Optional[str] = Query(None, description="Filter by vote position"),
+    vote_result: Optional[str] = Query(None, description="Filter by vote result"),
+    from_date: Optional[date] = Query(None, description="Filter votes from this date"),
+    to_date: Optional[date] = Query(None, description="Filter votes to this date"),
+) -> Any:
+    """
+    Stream all votes matching the filters as NDJSON or CSV.
+
+    The response is gzip-compressed when the client accepts it.
+    """
+    gzip = wants_gzip(request)
+    try:
+        rows = export_rows(
+            crud_vote,
+            filters={
+                "politician_id": politician_id,
+                "bill_id": bill_id,
+                "vote_position": vote_position or None,
+                "vote_result": vote_result or None,
+                "from_date": from_date,
+                "to_date": to_date,
+            },
+            sort=sort,
+            file_format=format,
+            gzip=gzip,
+        )
+    except PaginationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    headers = {"Content-Disposition": f'attachment; filename="votes.{format}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(rows, media_type=EXPORT_MEDIA_TYPES[format], headers=headers)
+
+
+@router.post("/batch-get", response_model=VoteBatch, summary="Get votes by IDs")
+async def batch_get_votes(
+    *,
+    db: AsyncSession = Depends(get_db),
+    batch: BatchGetRequest,
+) -> Any:
+    """
+    Get many votes by ID at once, in request order, with the IDs not found.
+    """
+    return await batch_get(db, crud_vote, VoteSchema, batch.ids)
+
+
+@router.get("/batch-get", response_model=VoteBatch, summary="Get votes by IDs")
+async def read_votes_by_ids(
+    *,
+    db: AsyncSession = Depends(get_db),
+    ids: str = Query(..., description=IDS_DESCRIPTION),
+) -> Any:
+    """
+    Get many votes by ID at once, in request order, with the IDs not found.
+    """
+    return await batch_get(db, crud_vote, VoteSchema, parse_ids(ids))
 
 
 @router.get("/{id}", response_model=VoteWithRelations, summary="Get vote by ID")
+@cached("vote:{id}", "politician", "bill")
 async def read_vote(
     *,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     id: UUID = Path(..., description="The UUID of the vote"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
 ) -> Any:
     """
     Get a specific vote by ID with related politician and bill information.
     """
-    query = (
-        select(Vote)
-        .options(
-            joinedload(Vote.politician),
-            joinedload(Vote.bill)
-        )
-        .filter(Vote.id == id)
+    selected = parse_fields(
+        fields, schema_columns(VoteWithRelations, Vote) + ("politician", "bill")
     )
+    version = await crud_vote.version(db, id, related=(Vote.politician, Vote.bill))
+    if version is None:
+        raise HTTPException(status_code=404, detail="Vote not found")
+    not_modified = Validators.for_record(version, request).apply(request, response)
+    if not_modified:
+        return not_modified
+
+    query = select(Vote).filter(Vote.id == id)
+    if not selected or "politician" in selected:
+        query = query.options(joinedload(Vote.politician))
+    if not selected or "bill" in selected:
+        query = query.options(joinedload(Vote.bill))
+    if selected:
+        query = query.options(crud_vote.load_only(column_fields(selected, Vote)))
     result = await db.execute(query)
     db_obj = result.scalars().first()
 
     if not db_obj:
         raise HTTPException(status_code=404, detail="Vote not found")
 
+    if selected:
+        return sparse_response(
+            db_obj, sparse_schema(VoteWithRelations, selected), headers=response.headers
+        )
     return db_obj
 
 
@@ -125,12 +241,56 @@ async def create_vote(
     """
     db_obj = Vote(**vote_in.dict())
     db.add(db_obj)
-    await db.commit()
+    await crud_vote.commit_write(db, db_obj)
     await db.refresh(db_obj)
 
     return db_obj
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkReport,
+    summary="Bulk load votes",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string"}},
+                "text/csv": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def bulk_create_votes(
+    request: Request,
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=50000, description="Rows per batch"),
+) -> Any:
+    """
+    Load many vote records from an NDJSON or CSV request body.
+
+    Each line (or CSV row, with a header) must match the create schema. The
+    body is streamed and written with COPY in batches; the response reports
+    rejected rows and failed batches instead of failing the whole request.
+    """
+    content_type = request.headers.get("content-type")
+    try:
+        parser_for(content_type)
+    except ValueError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+
+    report = await bulk_copy(
+        Vote,
+        VoteCreate,
+        request.stream(),
+        content_type=content_type,
+        batch_size=batch_size,
+    )
+    if report["inserted"]:
+        crud_vote.invalidate_cache()
+        await publish_now(crud_vote.model.__table__.name)
+    return report
+
+
 @router.put("/{id}", response_model=VoteSchema, summary="Update vote")
 async def update_vote(
     *,
@@ -153,7 +313,7 @@ async def update_vote(
         setattr(db_obj, field, value)
 
     db.add(db_obj)
-    await db.commit()
+    await crud_vote.commit_write(db, db_obj)
     await db.refresh(db_obj)
 
     return db_obj
@@ -176,12 +336,13 @@ async def delete_vote(
         raise HTTPException(status_code=404, detail="Vote not found")
 
     await db.delete(db_obj)
-    await db.commit()
+    await crud_vote.commit_write(db, db_obj)
 
     return db_obj
 
 
 @router.get("/statistics/by-politician", summary="Get vote statistics by politician")
+@cached("vote", "politician")
 async def vote_statistics_by_politician(
     db: AsyncSession = Depends(get_db),
     limit: int = Query(10, ge=1, le=100, description="Limit results"),
@@ -189,38 +350,18 @@ async def vote_statistics_by_politician(
     """
     Get voting statistics grouped by politician.
     """
-    from sqlalchemy import func, case, distinct
-    from app.models.politician import Politician
-
-    query = (
-        select(
-            Politician.id,
-            Politician.name,
-            Politician.party,
-            func.count(Vote.id).label("total_votes"),
-            func.count(case([(Vote.vote_position == "yea", 1)])).label("yea_votes"),
-            func.count(case([(Vote.vote_position == "nay", 1)])).label("nay_votes"),
-            func.count(distinct(Vote.bill_id)).label("bills_voted")
-        )
-        .join(Vote, Vote.politician_id == Politician.id)
-        .group_by(Politician.id, Politician.name, Politician.party)
-        .order_by(func.count(Vote.id).desc())
-        .limit(limit)
-    )
-
-    result = await db.execute(query)
-    stats = result.all()
+    stats = await crud_vote.statistics_by_politician(db, limit=limit)
 
     return [
         {
-            "politician_id": str(row[0]),
-            "politician_name": row[1],
-            "party": row[2],
-            "total_votes": row[3],
-            "yea_votes": row[4],
-            "nay_votes": row[5],
-            "bills_voted": row[6],
-            "yea_percentage": round(row[4] / row[3] * 100, 2) if row[3] > 0 else 0,
+            "politician_id": str(row["id"]),
+            "politician_name": row["name"],
+            "party": row["party"],
+            "total_votes": row["total_votes"],
+            "yea_votes": row["yea_votes"],
+            "nay_votes": row["nay_votes"],
+            "bills_voted": row["bills_voted"],
+            "yea_percentage": round(row["yea_votes"] / row["total_votes"] * 100, 2) if row["total_votes"] > 0 else 0,
         }
         for row in stats
     ]
@@ -0,0 +1,33 @@
+"""
+Command line tools for PovoDB.
+
+Run with `python -m app.cli <command> --help` from the backend directory.
+"""
+import argparse
+import asyncio
+import logging
+from typing import List, Optional
+
+from app.cli import benchmark, generate, importer, partitions, rollups
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser with one sub-command per tool."""
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    importer.add_arguments(subparsers)
+    rollups.add_arguments(subparsers)
+    partitions.add_arguments(subparsers)
+    generate.add_arguments(subparsers)
+    benchmark.add_arguments(subparsers)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Parse the command line and run the selected command."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    args = build_parser().parse_args(argv)
+    asyncio.run(args.handler(args))
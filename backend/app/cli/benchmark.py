@@ -0,0 +1,495 @@
+"""
+HTTP load benchmark of a running API.
+
+Requests arrive open-loop: at exponentially distributed intervals around
+--rate requests per second, whether or not earlier ones have finished, so a
+slow server shows up as growing latency instead of a lower request rate.
+Latency is measured from the moment a request was due. When --max-in-flight
+requests are already waiting, new arrivals are dropped and counted.
+
+A scenario mixes the operations of the API (lists, filtered lists,
+details, statistics and writes) in proportions close to the traffic the
+API serves; the IDs and filter values come from a first page of each list,
+fetched before the run. Writes create contributions and update bills, so
+run it against a database loaded for the purpose (`python -m app.cli
+generate`).
+
+Results (requests, errors and p50/p95/p99 latency per route) are printed
+and can be saved as JSON; `benchmark-compare` compares two result files,
+e.g. of two commits, and exits with 1 if a route got slower or failed more.
+
+Example:
+    python -m app.cli benchmark --rate 50 --duration 60 --output head.json
+    python -m app.cli benchmark-compare base.json head.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import subprocess
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_URL = "http://localhost:8000"
+SAMPLE_SIZE = 100
+PERCENTILES = (50, 95, 99)
+
+# Share of each kind of operation in a scenario
+SCENARIOS: Dict[str, Dict[str, int]] = {
+    "mixed": {"list": 25, "filter": 35, "detail": 25, "stats": 10, "write": 5},
+    "read-only": {"list": 25, "filter": 40, "detail": 25, "stats": 10, "write": 0},
+    "write-heavy": {"list": 15, "filter": 20, "detail": 15, "stats": 5, "write": 45},
+}
+
+# (path, query parameters, JSON body) of a request
+Request = Tuple[str, Dict[str, Any], Optional[Dict[str, Any]]]
+
+
+@dataclass
+class Samples:
+    """IDs and filter values the requests pick from."""
+
+    politicians: List[Dict[str, Any]]
+    bills: List[Dict[str, Any]]
+    votes: List[Dict[str, Any]]
+    contributions: List[Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class Operation:
+    """A kind of request, reported under its route."""
+
+    route: str
+    kind: str
+    build: Callable[[random.Random, Samples], Request]
+
+    @property
+    def method(self) -> str:
+        return self.route.split()[0]
+
+
+def _pick(rng: random.Random, rows: List[Dict[str, Any]], key: str = "id") -> Any:
+    """Value of `key` in a random row that has it set."""
+    return rng.choice([row for row in rows if row.get(key)])[key]
+
+
+def _date_range(rng: random.Random) -> Dict[str, str]:
+    start = date(rng.randint(2016, 2024), rng.randint(1, 12), 1)
+    return {"from_date": start.isoformat(), "to_date": (start + timedelta(days=rng.randint(28, 90))).isoformat()}
+
+
+OPERATIONS: List[Operation] = [
+    # Lists
+    Operation("GET /politicians", "list", lambda rng, s: ("/politicians", {"limit": 20}, None)),
+    Operation("GET /bills", "list", lambda rng, s: ("/bills", {"limit": 20}, None)),
+    Operation("GET /votes", "list", lambda rng, s: ("/votes", {"limit": 20}, None)),
+    Operation("GET /contributions", "list", lambda rng, s: ("/contributions", {"limit": 20}, None)),
+    # Filtered lists
+    Operation(
+        "GET /politicians?party",
+        "filter",
+        lambda rng, s: ("/politicians", {"party": _pick(rng, s.politicians, "party"), "limit": 20}, None),
+    ),
+    Operation(
+        "GET /politicians?name",
+        "filter",
+        lambda rng, s: ("/politicians", {"name": _pick(rng, s.politicians, "name").split()[-1]}, None),
+    ),
+    Operation(
+        "GET /bills/search",
+        "filter",
+        lambda rng, s: ("/bills/search", {"q": _pick(rng, s.bills, "title").split()[-1]}, None),
+    ),
+    Operation(
+        "GET /votes?politician_id",
+        "filter",
+        lambda rng, s: ("/votes", {"politician_id": _pick(rng, s.votes, "politician_id"), "limit": 20}, None),
+    ),
+    Operation(
+        "GET /votes?bill_id",
+        "filter",
+        lambda rng, s: ("/votes", {"bill_id": _pick(rng, s.votes, "bill_id"), "limit": 20}, None),
+    ),
+    Operation(
+        "GET /contributions?politician_id",
+        "filter",
+        lambda rng, s: (
+            "/contributions", {"politician_id": _pick(rng, s.contributions, "politician_id"), "limit": 20}, None
+        ),
+    ),
+    Operation(
+        "GET /contributions?from_date&to_date",
+        "filter",
+        lambda rng, s: ("/contributions", {**_date_range(rng), "limit": 20}, None),
+    ),
+    # Details
+    Operation("GET /politicians/{id}", "detail", lambda rng, s: (f"/politicians/{_pick(rng, s.politicians)}", {}, None)),
+    Operation(
+        "GET /politicians/{id}/details",
+        "detail",
+        lambda rng, s: (f"/politicians/{_pick(rng, s.politicians)}/details", {}, None),
+    ),
+    Operation("GET /bills/{id}", "detail", lambda rng, s: (f"/bills/{_pick(rng, s.bills)}", {}, None)),
+    Operation("GET /votes/{id}", "detail", lambda rng, s: (f"/votes/{_pick(rng, s.votes)}", {}, None)),
+    Operation(
+        "GET /contributions/{id}", "detail", lambda rng, s: (f"/contributions/{_pick(rng, s.contributions)}", {}, None)
+    ),
+    # Statistics
+    Operation(
+        "GET /votes/statistics/by-politician", "stats", lambda rng, s: ("/votes/statistics/by-politician", {}, None)
+    ),
+    Operation(
+        "GET /contributions/statistics/top-contributors",
+        "stats",
+        lambda rng, s: ("/contributions/statistics/top-contributors", {}, None),
+    ),
+    Operation(
+        "GET /contributions/statistics/by-party",
+        "stats",
+        lambda rng, s: ("/contributions/statistics/by-party", {"party": _pick(rng, s.politicians, "party")}, None),
+    ),
+    Operation(
+        "GET /politicians/{id}/contributions",
+        "stats",
+        lambda rng, s: (f"/politicians/{_pick(rng, s.contributions, 'politician_id')}/contributions", {}, None),
+    ),
+    # Writes
+    Operation(
+        "POST /contributions",
+        "write",
+        lambda rng, s: (
+            "/contributions",
+            {},
+            {
+                "politician_id": _pick(rng, s.politicians),
+                "contributor_name": f"Benchmark {rng.randrange(1000)}",
+                "contributor_type": "individual",
+                "amount": round(rng.lognormvariate(6, 1), 2),
+                "contribution_date": date.today().isoformat(),
+            },
+        ),
+    ),
+    Operation(
+        "PUT /bills/{id}",
+        "write",
+        lambda rng, s: (
+            f"/bills/{_pick(rng, s.bills)}", {}, {"status": rng.choice(["introduced", "in_committee", "passed", "enacted"])}
+        ),
+    ),
+]
+
+
+@dataclass
+class RouteResult:
+    """Outcome of the requests of one route."""
+
+    latencies: List[float] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+    dropped: int = 0
+
+    def record(self, latency: float, status: Any) -> None:
+        self.latencies.append(latency)
+        if not isinstance(status, int) or status >= 400:
+            self.errors[str(status)] += 1
+
+    def merge(self, other: "RouteResult") -> None:
+        self.latencies.extend(other.latencies)
+        self.errors.update(other.errors)
+        self.dropped += other.dropped
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return values[max(0, math.ceil(p / 100 * len(values)) - 1)]
+
+
+def summarize(result: RouteResult, elapsed: float) -> Dict[str, Any]:
+    """
+    Summarize the requests of a route.
+
+    Args:
+        result: Recorded outcomes
+        elapsed: Duration of the run in seconds
+
+    Returns:
+        Counts, throughput, error rate and latencies in milliseconds
+    """
+    latencies = sorted(result.latencies)
+    requests = len(latencies)
+    errors = sum(result.errors.values())
+    summary: Dict[str, Any] = {
+        "requests": requests,
+        "dropped": result.dropped,
+        "throughput": requests / elapsed if elapsed else 0.0,
+        "errors": errors,
+        "error_rate": errors / requests if requests else 0.0,
+        "error_statuses": dict(result.errors),
+        "latency_ms": {},
+    }
+    if latencies:
+        summary["latency_ms"] = {
+            "mean": sum(latencies) / requests * 1000,
+            **{f"p{p}": percentile(latencies, p) * 1000 for p in PERCENTILES},
+            "max": latencies[-1] * 1000,
+        }
+    return summary
+
+
+def choose_operations(scenario: str) -> Tuple[List[Operation], List[float]]:
+    """Operations of a scenario with their weights (a kind's share split evenly)."""
+    shares = SCENARIOS[scenario]
+    per_kind = Counter(operation.kind for operation in OPERATIONS)
+    chosen = [operation for operation in OPERATIONS if shares[operation.kind]]
+    return chosen, [shares[operation.kind] / per_kind[operation.kind] for operation in chosen]
+
+
+async def fetch_samples(client: httpx.AsyncClient) -> Samples:
+    """Fetch the first page of every list to pick IDs and filter values from."""
+    pages = {}
+    for name, path in (
+        ("politicians", "/politicians"),
+        ("bills", "/bills"),
+        ("votes", "/votes"),
+        ("contributions", "/contributions"),
+    ):
+        response = await client.get(path, params={"limit": SAMPLE_SIZE, "count_mode": "none"})
+        response.raise_for_status()
+        pages[name] = response.json()["items"]
+        if not pages[name]:
+            sys.exit(f"No {name} to benchmark with; load data first (python -m app.cli generate)")
+    return Samples(**pages)
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    samples: Samples,
+    scenario: str,
+    *,
+    rate: float,
+    duration: float,
+    max_in_flight: int,
+    seed: int,
+) -> Tuple[Dict[str, RouteResult], float]:
+    """
+    Send requests at Poisson arrivals for a while.
+
+    Args:
+        client: Client with the API base URL
+        samples: IDs and filter values to build requests from
+        scenario: Name of the operation mix
+        rate: Mean arrivals per second
+        duration: Seconds during which requests arrive
+        max_in_flight: Pending requests beyond which arrivals are dropped
+        seed: Seed of the arrivals and of the requests
+
+    Returns:
+        Tuple of (results by route, seconds until the last response)
+    """
+    rng = random.Random(seed)
+    operations, weights = choose_operations(scenario)
+    results: Dict[str, RouteResult] = {operation.route: RouteResult() for operation in operations}
+    pending: set = set()
+    loop = asyncio.get_running_loop()
+
+    async def send(operation: Operation, request: Request, due: float) -> None:
+        path, params, body = request
+        try:
+            response = await client.request(operation.method, path, params=params, json=body)
+            status: Any = response.status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        results[operation.route].record(loop.time() - due, status)
+
+    start = due = loop.time()
+    while True:
+        due += rng.expovariate(rate)
+        if due - start >= duration:
+            break
+        operation = rng.choices(operations, weights)[0]
+        request = operation.build(rng, samples)
+        delay = due - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(pending) >= max_in_flight:
+            results[operation.route].dropped += 1
+            continue
+        task = asyncio.create_task(send(operation, request, due))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    if pending:
+        await asyncio.gather(*pending)
+    return results, loop.time() - start
+
+
+def current_commit() -> Optional[str]:
+    """Commit of the working tree, if run from a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print the per-route table of a result."""
+    header = f"{'route':<48} {'requests':>8} {'errors':>6} {'dropped':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    print(header)
+    print("-" * len(header))
+    rows = [*sorted(report["routes"].items()), ("overall", report["overall"])]
+    for route, summary in rows:
+        latency = summary["latency_ms"]
+        print(
+            f"{route:<48} {summary['requests']:>8} {summary['errors']:>6} {summary['dropped']:>7} "
+            + " ".join(f"{latency.get(f'p{p}', float('nan')):>8.1f}" for p in PERCENTILES)
+        )
+
+
+async def run_benchmark(args: argparse.Namespace) -> None:
+    """Handler of `python -m app.cli benchmark`."""
+    # httpx logs every request at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    limits =httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+    base_url = args.url.rstrip("/") + settings.API_PREFIX
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        samples = await fetch_samples(client)
+        load = dict(
+            scenario=args.scenario, rate=args.rate, max_in_flight=args.max_in_flight, seed=args.seed
+        )
+        if args.warmup:
+            logger.info("Warming up for %.0fs", args.warmup)
+            await run_load(client, samples, duration=args.warmup, **load)
+        logger.info("Sending %.0f requests/sec for %.0fs (%s)", args.rate, args.duration, args.scenario)
+        started_at = datetime.now(timezone.utc)
+        results, elapsed = await run_load(client, samples, duration=args.duration, **load)
+
+    overall = RouteResult()
+    for result in results.values():
+        overall.merge(result)
+    report = {
+        "meta": {
+            "url": args.url,
+            "commit": current_commit(),
+            "started_at": started_at.isoformat(),
+            "elapsed": elapsed,
+            **load,
+            "duration": args.duration,
+        },
+        "overall": summarize(overall, elapsed),
+        "routes": {route: summarize(result, elapsed) for route, result in results.items() if result.latencies},
+    }
+    print_report(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        logger.info("Results saved to %s", args.output)
+
+
+def compare_reports(
+    base: Dict[str, Any], head: Dict[str, Any], *, threshold: float, min_ms: float
+) -> List[Tuple[str, str, float, float, bool]]:
+    """
+    Compare the latency percentiles and error rates of two results.
+
+    A latency regressed when it grew by more than `threshold` (a fraction)
+    and by at least `min_ms`; an error rate regressed when it grew by more
+    than one percentage point.
+
+    Args:
+        base: Result of the reference run
+        head: Result of the run to check
+        threshold: Relative latency increase tolerated
+        min_ms: Latency increase in milliseconds always tolerated
+
+    Returns:
+        Tuples of (route, metric, base value, head value, regressed) for
+        the routes of both results
+    """
+    rows = []
+    routes = sorted(set(base["routes"]) & set(head["routes"])) + ["overall"]
+    for route in routes:
+        before = base["overall"] if route == "overall" else base["routes"][route]
+        after = head["overall"] if route == "overall" else head["routes"][route]
+        for p in PERCENTILES:
+            old = before["latency_ms"].get(f"p{p}")
+            new = after["latency_ms"].get(f"p{p}")
+            if old is None or new is None:
+                continue
+            regressed = new - old >= min_ms and new > old * (1 + threshold)
+            rows.append((route, f"p{p} ms", old, new, regressed))
+        old, new = before["error_rate"], after["error_rate"]
+        rows.append((route, "error %", old * 100, new * 100, new > old + 0.01))
+    return rows
+
+
+async def run_compare(args: argparse.Namespace) -> None:
+    """Handler of `python -m app.cli benchmark-compare`."""
+    base = json.loads(Path(args.base).read_text())
+    head = json.loads(Path(args.head).read_text())
+    for name, report in (("base", base), ("head", head)):
+        meta = report["meta"]
+        print(f"{name}: {meta.get('commit') or '?'} at {meta['started_at']}, {meta['rate']:.0f} req/s, {meta['scenario']}")
+    if (base["meta"]["rate"], base["meta"]["scenario"]) != (head["meta"]["rate"], head["meta"]["scenario"]):
+        print("warning: the runs differ in rate or scenario")
+
+    rows = compare_reports(base, head, threshold=args.threshold / 100, min_ms=args.min_ms)
+    print(f"{'route':<48} {'metric':<8} {'base':>9} {'head':>9} {'change':>8}")
+    for route, metric, old, new, regressed in rows:
+        change = f"{(new - old) / old * 100:+.0f}%" if old else ""
+        print(f"{route:<48} {metric:<8} {old:>9.1f} {new:>9.1f} {change:>8}{'  REGRESSION' if regressed else ''}")
+    for route in sorted(set(base["routes"]) ^ set(head["routes"])):
+        print(f"{route}: only in {'base' if route in base['routes'] else 'head'}")
+
+    regressions = sum(1 for *_, regressed in rows if regressed)
+    if regressions:
+        sys.exit(f"{regressions} regressions")
+
+
+def add_arguments(subparsers: Any) -> None:
+    """Register the `benchmark` and `benchmark-compare` commands."""
+    parser = subparsers.add_parser(
+        "benchmark",
+        help="Measure the latency of a running API under load",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--url", default=DEFAULT_URL, help=f"Base URL of the API (default: {DEFAULT_URL})")
+    parser.add_argument("--scenario", choices=list(SCENARIOS), default="mixed", help="Operation mix (default: mixed)")
+    parser.add_argument("--rate", type=float, default=20.0, help="Mean requests per second (default: 20)")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds of load (default: 60)")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Seconds of load not measured first (default: 5)")
+    parser.add_argument(
+        "--max-in-flight", type=int, default=200, help="Pending requests beyond which arrivals are dropped"
+    )
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds before a request fails")
+    parser.add_argument("--seed", type=int, default=1, help="Seed of the arrivals and requests")
+    parser.add_argument("--output", help="Save the results to this JSON file")
+    parser.set_defaults(handler=run_benchmark)
+
+    parser = subparsers.add_parser(
+        "benchmark-compare",
+        help="Compare two benchmark results and flag regressions",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("base", help="Results of the reference run")
+    parser.add_argument("head", help="Results of the run to check")
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="Latency increase in percent flagged (default: 10)"
+    )
+    parser.add_argument(
+        "--min-ms", type=float, default=2.0, help="Latency increase in milliseconds never flagged (default: 2)"
+    )
+    parser.set_defaults(handler=run_compare)
@@ -0,0 +1,425 @@
+"""
+Offline bulk import of vote and contribution datasets.
+
+Files are streamed in chunks, so memory use does not depend on file size:
+
+1. rows are read from CSV, NDJSON or Parquet;
+2. politician/bill references given by natural key (`politician_name`,
+   `bill_number`) are resolved to ids through an in-memory lookup cache
+   that only queries the database for keys it has not seen yet;
+3. rows are validated with the API create schemas;
+4. each chunk is COPYed into a temporary staging table and merged into the
+   real table in the same transaction;
+5. a checkpoint file records how many rows are done, so an interrupted
+   import can continue with `--resume`.
+
+Row ids are derived from the source file and row number, and the merge
+skips rows that already exist, so replaying a chunk never duplicates data.
+
+Example:
+    python -m app.cli import contributions tse_2022.csv --resume
+"""
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, Union
+
+from pydantic import BaseModel
+from sqlalchemy import Numeric
+
+from app.crud.bulk import validate_rows
+from app.db.base_class import Base
+from app.db.invalidation import publish_now
+from app.db.session import raw_connection
+from app.models.political_contribution import PoliticalContribution
+from app.models.vote import Vote
+from app.schemas.contribution.contribution import ContributionCreate
+from app.schemas.vote.vote import VoteCreate
+
+logger = logging.getLogger(__name__)
+
+# Namespace of the deterministic row ids (uuid5 of source id + row number)
+IMPORT_NAMESPACE = uuid.UUID("5f1d4c8e-8a4b-4f51-9a36-2c1d0b7e6a10")
+
+DEFAULT_CHUNK_SIZE = 50000
+PROGRESS_INTERVAL_SECONDS = 5.0
+
+
+@dataclass(frozen=True)
+class Reference:
+    """A foreign key that may be given by natural key in the input file."""
+
+    field: str
+    key_field: str
+    table: str
+    key_column: str
+    # Optional fields filled from the referenced row when missing, by column
+    defaults: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """An importable table."""
+
+    model: Type[Base]
+    schema: Type[BaseModel]
+    references: Tuple[Reference, ...]
+
+
+POLITICIAN_REFERENCE = Reference("politician_id", "politician_name", "politician", "name")
+
+DATASETS: Dict[str, Dataset] = {
+    "votes": Dataset(
+        Vote,
+        VoteCreate,
+        (
+            POLITICIAN_REFERENCE,
+            Reference("bill_id", "bill_number", "bill", "bill_number", {"bill_title": "title"}),
+        ),
+    ),
+    "contributions": Dataset(PoliticalContribution, ContributionCreate, (POLITICIAN_REFERENCE,)),
+}
+
+
+class LookupCache:
+    """
+    Natural key -> row lookups for one referenced table.
+
+    Keys are resolved in batches the first time they are seen and kept for
+    the whole import. Keys that match no row, or several rows, resolve to
+    None.
+    """
+
+    def __init__(self, reference: Reference):
+        self.reference = reference
+        self._rows: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    async def resolve(self, conn: Any, keys: List[str]) -> None:
+        """Load the keys that are not cached yet."""
+        missing = list({key for key in keys if key not in self._rows})
+        if not missing:
+            return
+        ref = self.reference
+        columns = ", ".join(["id", ref.key_column, *ref.defaults.values()])
+        rows = await conn.fetch(
+            f"SELECT {columns} FROM {ref.table} "
+            f"WHERE {ref.key_column} = ANY($1::text[]) AND deleted_at IS NULL",
+            missing,
+        )
+        found: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            found.setdefault(row[ref.key_column], []).append(dict(row))
+        for key in missing:
+            matches = found.get(key, [])
+            self._rows[key] = matches[0] if len(matches) == 1 else None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._rows.get(key)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+@dataclass(frozen=True)
+class MalformedRow:
+    """A line of an NDJSON file that is not a JSON object, rejected as read."""
+
+    line: int
+    text: str
+    error: str
+
+
+def read_rows(
+    path: Path, file_format: str, chunk_size: int
+) -> Iterator[Union[Dict[str, Any], MalformedRow]]:
+    """
+    Stream the rows of an input file as dictionaries.
+
+    NDJSON lines that cannot be decoded into an object are yielded as
+    `MalformedRow`, so the import rejects them and goes on. Parquet
+    support needs the optional `pyarrow` package.
+    """
+    if file_format == "csv":
+        with path.open(newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                yield {k: (v if v != "" else None) for k, v in row.items()}
+    elif file_format == "ndjson":
+        with path.open(encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield MalformedRow(line_no, line.rstrip("\r\n"), f"{e.msg} (char {e.pos})")
+                    continue
+                if not isinstance(row, dict):
+                    yield MalformedRow(line_no, line.rstrip("\r\n"), "not a JSON object")
+                    continue
+                yield row
+    elif file_format == "parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet input requires pyarrow: pip install pyarrow")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield from batch.to_pylist()
+    else:
+        raise ValueError(f"Unsupported format '{file_format}'")
+
+
+def detect_format(path: Path) -> str:
+    """Guess the input format from the file extension."""
+    suffix = path.suffix.lower()
+    if suffix == ".parquet":
+        return "parquet"
+    if suffix in (".ndjson", ".jsonl"):
+        return "ndjson"
+    return "csv"
+
+
+def source_id(path: Path) -> str:
+    """Identify an input file by name, size and a hash of its first megabyte."""
+    digest = hashlib.sha1()
+    with path.open("rb") as f:
+        digest.update(f.read(1 << 20))
+    return f"{path.name}:{path.stat().st_size}:{digest.hexdigest()}"
+
+
+class Checkpoint:
+    """Progress of an import, persisted as JSON next to the input file."""
+
+    def __init__(self, path: Path, source: str):
+        self.path = path
+        self.source = source
+        self.rows_done = 0
+        self.inserted = 0
+        self.rejected = 0
+
+    @classmethod
+    def load(cls, path: Path, source: str) -> "Checkpoint":
+        """Load a checkpoint, refusing one written for a different file."""
+        checkpoint = cls(path, source)
+        if path.exists():
+            data = json.loads(path.read_text())
+            if data["source"] != source:
+                raise SystemExit(f"Checkpoint {path} belongs to a different input file")
+            checkpoint.rows_done = data["rows_done"]
+            checkpoint.inserted = data["inserted"]
+            checkpoint.rejected = data["rejected"]
+        return checkpoint
+
+    def save(self) -> None:
+        """Write the checkpoint atomically."""
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps({
+            "source": self.source,
+            "rows_done": self.rows_done,
+            "inserted": self.inserted,
+            "rejected": self.rejected,
+        }))
+        os.replace(tmp, self.path)
+
+
+class Importer:
+    """Loads one input file into one dataset table."""
+
+    def __init__(self, dataset: Dataset, checkpoint: Checkpoint, rejects: Optional[Path] = None):
+        self.dataset = dataset
+        self.checkpoint = checkpoint
+        self.rejects_path = rejects
+        self.lookups = [LookupCache(ref) for ref in dataset.references]
+        table = dataset.model.__table__
+        self.table = table.name
+        self.staging = f"import_staging_{table.name}"
+        self.fields = list(dataset.schema.model_fields)
+        self.columns = ["id", *self.fields]
+        self.numeric = {name for name in self.fields if isinstance(table.c[name].type, Numeric)}
+
+    async def prepare(self, conn: Any) -> None:
+        """Create the session-local staging table."""
+        await conn.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {self.staging} "
+            f"(LIKE {self.table} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        )
+
+    async def _resolve(self, conn: Any, rows: List[Tuple[int, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Fill foreign keys given by natural key; return errors for unresolved rows."""
+        errors = []
+        for lookup in self.lookups:
+            ref = lookup.reference
+            pending = [row for _, row in rows if not row.get(ref.field) and row.get(ref.key_field)]
+            await lookup.resolve(conn, [str(row[ref.key_field]) for row in pending])
+        for row_no, row in rows:
+            for lookup in self.lookups:
+                ref = lookup.reference
+                if row.get(ref.field) or not row.get(ref.key_field):
+                    continue
+                target = lookup.get(str(row[ref.key_field]))
+                if target is None:
+                    errors.append({
+                        "line": row_no,
+                        "error": f"{ref.key_field} '{row[ref.key_field]}' matches no single {ref.table}",
+                    })
+                    row.clear()
+                    break
+                row[ref.field] = target["id"]
+                for fill, column in ref.defaults.items():
+                    if row.get(fill) is None:
+                        row[fill] = target[column]
+        return errors
+
+    def _record(self, row_no: int, obj: BaseModel) -> Tuple[Any, ...]:
+        values = []
+        for name in self.fields:
+            value = getattr(obj, name)
+            if name in self.numeric and value is not None:
+                value = Decimal(str(value))
+            values.append(value)
+        row_id = uuid.uuid5(IMPORT_NAMESPACE, f"{self.checkpoint.source}:{row_no}")
+        return (row_id, *values)
+
+    async def load_chunk(
+        self, conn: Any, chunk: List[Tuple[int, Union[Dict[str, Any], MalformedRow]]]
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """Resolve, validate, stage and merge one chunk. Returns (inserted, errors)."""
+        rows = []
+        malformed = []
+        for row_no, row in chunk:
+            if isinstance(row, MalformedRow):
+                malformed.append({
+                    "line": row_no,
+                    "error": f"Invalid JSON on line {row.line} of the file: {row.error}",
+                    "text": row.text,
+                })
+            else:
+                rows.append((row_no, row))
+        errors = malformed + await self._resolve(conn, rows)
+        candidates = [(row_no, row) for row_no, row in rows if row]
+        valid_rows = [row_no for row_no, _ in candidates]
+        valid = validate_rows(self.dataset.schema, candidates, errors) if candidates else []
+        rejected_lines = {error["line"] for error in errors}
+        valid_rows = [row_no for row_no in valid_rows if row_no not in rejected_lines]
+        records = [self._record(row_no, obj) for row_no, obj in zip(valid_rows, valid)]
+
+        inserted = 0
+        columns = ", ".join(self.columns)
+        async with conn.transaction():
+            if records:
+                await conn.copy_records_to_table(self.staging, records=records, columns=self.columns)
+                status = await conn.execute(
+                    f"INSERT INTO {self.table} ({columns}) "
+                    f"SELECT {columns} FROM {self.staging} ON CONFLICT DO NOTHING"
+                )
+                inserted = int(status.split()[-1])
+        return inserted, errors
+
+    def _write_rejects(self, errors: List[Dict[str, Any]]) -> None:
+        if self.rejects_path and errors:
+            with self.rejects_path.open("a", encoding="utf-8") as f:
+                for error in errors:
+                    f.write(json.dumps(error) + "\n")
+
+    async def run(
+        self, source_rows: Iterator[Union[Dict[str, Any], MalformedRow]], chunk_size: int
+    ) -> None:
+        """Import every row after the checkpoint, saving progress per chunk."""
+        checkpoint = self.checkpoint
+        started = time.monotonic()
+        last_report = started
+        processed = 0
+
+        async with raw_connection() as conn:
+            await self.prepare(conn)
+            chunk: List[Tuple[int, Union[Dict[str, Any], MalformedRow]]] = []
+            for row_no, row in enumerate(source_rows, start=1):
+                if row_no <= checkpoint.rows_done:
+                    continue
+                chunk.append((row_no, row))
+                if len(chunk) < chunk_size:
+                    continue
+                processed += await self._flush(conn, chunk)
+                chunk = []
+                if time.monotonic() - last_report >= PROGRESS_INTERVAL_SECONDS:
+                    last_report = time.monotonic()
+                    self._report(processed, started)
+            if chunk:
+                processed += await self._flush(conn, chunk)
+
+        self._report(processed, started)
+        if checkpoint.inserted:
+            # Let running API workers drop cached responses for this table
+            await publish_now(self.table)
+        logger.info("Import of %s finished", self.table)
+
+    async def _flush(
+        self, conn: Any, chunk: List[Tuple[int, Union[Dict[str, Any], MalformedRow]]]
+    ) -> int:
+        inserted, errors = await self.load_chunk(conn, chunk)
+        self._write_rejects(errors)
+        self.checkpoint.rows_done = chunk[-1][0]
+        self.checkpoint.inserted += inserted
+        self.checkpoint.rejected += len(errors)
+        self.checkpoint.save()
+        return len(chunk)
+
+    def _report(self, processed: int, started: float) -> None:
+        elapsed = max(time.monotonic() - started, 1e-9)
+        checkpoint = self.checkpoint
+        logger.info(
+            "%s: %d rows done (%d inserted, %d rejected), %.0f rows/sec, %d cached keys",
+            self.table,
+            checkpoint.rows_done,
+            checkpoint.inserted,
+            checkpoint.rejected,
+            processed / elapsed,
+            sum(len(lookup) for lookup in self.lookups),
+        )
+
+
+async def run_import(args: argparse.Namespace) -> None:
+    """Handler of `python -m app.cli import`."""
+    path = Path(args.path)
+    file_format = args.format or detect_format(path)
+    source = source_id(path)
+    checkpoint_path = Path(args.checkpoint or f"{path}.checkpoint.json")
+
+    if args.resume:
+        checkpoint = Checkpoint.load(checkpoint_path, source)
+        if checkpoint.rows_done:
+            logger.info("Resuming after row %d", checkpoint.rows_done)
+    else:
+        checkpoint = Checkpoint(checkpoint_path, source)
+
+    importer = Importer(
+        DATASETS[args.dataset],
+        checkpoint,
+        rejects=Path(args.rejects) if args.rejects else None,
+    )
+    await importer.run(read_rows(path, file_format, args.chunk_size), args.chunk_size)
+
+
+def add_arguments(subparsers: Any) -> None:
+    """Register the `import` command."""
+    parser = subparsers.add_parser(
+        "import",
+        help="Import a large vote or contribution file",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("dataset", choices=sorted(DATASETS), help="Table to import into")
+    parser.add_argument("path", help="CSV, NDJSON or Parquet file")
+    parser.add_argument("--format", choices=["csv", "ndjson", "parquet"], help="Input format (default: from extension)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per COPY/merge transaction")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <path>.checkpoint.json)")
+    parser.add_argument("--resume", action="store_true", help="Continue after the rows recorded in the checkpoint")
+    parser.add_argument("--rejects", help="Append rejected rows to this NDJSON file")
+    parser.set_defaults(handler=run_import)
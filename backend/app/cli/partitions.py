@@ -0,0 +1,52 @@
+"""
+Create yearly partitions of `political_contribution`.
+
+The API workers create the partitions of the current year and the next
+PARTITION_YEARS_AHEAD ones by themselves. This command creates others,
+for example for older years whose rows are still in the DEFAULT partition
+(they are moved into the new partitions).
+
+Example:
+    python -m app.cli ensure-partitions --first-year 2002
+"""
+import argparse
+import logging
+import sys
+from datetime import date
+from typing import Any
+
+from app.core.config import settings
+from app.db.partitions import PARTITIONED_TABLE, ensure_partitions
+from app.db.session import raw_connection
+
+logger = logging.getLogger(__name__)
+
+
+async def run_ensure_partitions(args: argparse.Namespace) -> None:
+    """Handler of `python -m app.cli ensure-partitions`."""
+    year = date.today().year
+    first_year = args.first_year if args.first_year is not None else year
+    last_year = args.last_year if args.last_year is not None else year + settings.PARTITION_YEARS_AHEAD
+    if first_year > last_year:
+        sys.exit(f"--first-year {first_year} is after --last-year {last_year}")
+
+    async with raw_connection() as conn:
+        created = await ensure_partitions(conn, first_year, last_year)
+    if created is None:
+        sys.exit(f"Partitions of {PARTITIONED_TABLE} are being created by another process, try again")
+    logger.info("Created %d partitions of %s for %d-%d", created, PARTITIONED_TABLE, first_year, last_year)
+
+
+def add_arguments(subparsers: Any) -> None:
+    """Register the `ensure-partitions` command."""
+    parser = subparsers.add_parser(
+        "ensure-partitions",
+        help=f"Create missing yearly partitions of {PARTITIONED_TABLE}",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--first-year", type=int, help="First year (default: the current one)")
+    parser.add_argument(
+        "--last-year", type=int, help="Last year (default: PARTITION_YEARS_AHEAD after the current one)"
+    )
+    parser.set_defaults(handler=run_ensure_partitions)
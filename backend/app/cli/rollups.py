@@ -0,0 +1,72 @@
+"""
+Rebuild the summary tables maintained by triggers.
+
+`politician_vote_stats` (from `vote`) and the contributor rollups (from
+`political_contribution`) are kept up to date by statement-level triggers;
+these commands recompute them from the source table, to verify the
+triggers or to repair the tables after writes that bypassed them (for
+example with triggers disabled). Writes to the source table wait while a
+rebuild runs.
+
+Example:
+    python -m app.cli rebuild-vote-stats --check
+    python -m app.cli rebuild-contributor-totals
+"""
+import argparse
+import logging
+import sys
+from typing import Any, Awaitable, Callable, Dict, NamedTuple
+
+from app.crud.crud_contribution import contribution as crud_contribution
+from app.crud.crud_vote import vote as crud_vote
+from app.db.invalidation import publish_now
+from app.db.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class Rollup(NamedTuple):
+    """A trigger-maintained summary and how to rebuild it."""
+
+    description: str
+    source_table: str
+    rebuild: Callable[..., Awaitable[int]]
+
+
+ROLLUPS: Dict[str, Rollup] = {
+    "vote-stats": Rollup(
+        "the per-politician vote statistics", "vote", crud_vote.rebuild_statistics
+    ),
+    "contributor-totals": Rollup(
+        "the contributor rollups", "political_contribution", crud_contribution.rebuild_contributor_totals
+    ),
+}
+
+
+async def run_rebuild(args: argparse.Namespace) -> None:
+    """Handler of `python -m app.cli rebuild-<rollup>`."""
+    rollup: Rollup = args.rollup
+    async with AsyncSessionLocal() as db:
+        differing = await rollup.rebuild(db, check=args.check)
+
+    if args.check:
+        logger.info("%d outdated rows in %s", differing, rollup.description)
+        if differing:
+            sys.exit(1)
+        return
+    logger.info("Rebuilt %s, %d rows corrected", rollup.description, differing)
+    if differing:
+        await publish_now(rollup.source_table)
+
+
+def add_arguments(subparsers: Any) -> None:
+    """Register one `rebuild-<rollup>` command per rollup."""
+    for name, rollup in ROLLUPS.items():
+        parser = subparsers.add_parser(
+            f"rebuild-{name}",
+            help=f"Recompute {rollup.description}",
+            description=__doc__,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+        parser.add_argument("--check", action="store_true", help="Only report differences, exit 1 if any")
+        parser.set_defaults(handler=run_rebuild, rollup=rollup)
@@ -0,0 +1,431 @@
+"""
+In-process caching utilities.
+
+Caches here live in the memory of a single worker process; they are meant
+for values that are expensive to compute and acceptable to serve slightly
+stale, such as row counts and serialized read responses.
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """
+    Least-recently-used cache whose entries expire after a fixed time-to-live.
+
+    Args:
+        ttl: Seconds an entry stays valid after being stored
+        max_entries: Maximum number of entries kept; the least recently
+            used entry is evicted when the cache is full
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entry if needed.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@dataclass
+class CachedResponse:
+    """A serialized response body and the tags it depends on."""
+
+    body: bytes
+    media_type: Optional[str]
+    tags: Tuple[str, ...]
+    expires_at: float
+    headers: Dict[str, str]
+
+
+class ResponseCache:
+    """
+    Byte-capped LRU cache of serialized responses with TTL and tag invalidation.
+
+    Every entry carries tags naming the data it was built from: a table
+    name ("politician") for responses that depend on any row of a table,
+    and "<table>:<id>" for responses built from one row. Writes invalidate
+    the tags they affect (see `invalidate_table`).
+
+    A response is only stored if no invalidation happened while it was
+    being computed, so a read racing a write cannot cache stale data.
+
+    Args:
+        ttl: Seconds an entry stays valid after being stored
+        max_bytes: Maximum total size of the cached bodies
+        enabled: When False, nothing is stored and every lookup misses
+    """
+
+    def __init__(self, ttl: float, max_bytes: int, enabled: bool = True):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._tags: Dict[str, Set[Hashable]] = {}
+        self._bytes = 0
+        # Incremented on every invalidation, see `set`
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        """
+        Get a cached response.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached response, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                self._discard(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(
+        self,
+        key: Hashable,
+        body: bytes,
+        *,
+        media_type: Optional[str],
+        tags: Iterable[str],
+        generation: int,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> bool:
+        """
+        Store a response body, evicting least recently used entries if needed.
+
+        Args:
+            key: Cache key
+            body: Serialized response body
+            media_type: Media type of the body
+            tags: Tags the response depends on
+            generation: Value of `generation` when computing the response began
+            headers: Response headers to replay with the body
+
+        Returns:
+            True if the response was stored
+        """
+        if not self.enabled or generation != self.generation or len(body) > self.max_bytes:
+            return False
+        self._discard(key)
+        entry = CachedResponse(
+            body, media_type, tuple(tags), time.monotonic() + self.ttl, dict(headers or {})
+        )
+        self._entries[key] = entry
+        self._bytes += len(body)
+        for tag in entry.tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+            self.evictions += 1
+        return True
+
+    def invalidate(self, *tags: str) -> int:
+        """
+        Drop every entry carrying any of the given tags.
+
+        Args:
+            tags: Tags to invalidate
+
+        Returns:
+            Number of entries dropped
+        """
+        self.generation += 1
+        dropped = 0
+        for tag in tags:
+            for key in list(self._tags.get(tag, ())):
+                self._discard(key)
+                dropped += 1
+        self.invalidations += dropped
+        return dropped
+
+    def invalidate_table(self, table: str, id: Optional[Any] = None) -> int:
+        """
+        Invalidate the responses affected by a write to a table.
+
+        Args:
+            table: Name of the written table
+            id: Id of the written row, if the write touched a single row
+
+        Returns:
+            Number of entries dropped
+        """
+        tags = [table]
+        if id is not None:
+            tags.append(f"{table}:{id}")
+        return self.invalidate(*tags)
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= len(entry.body)
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._entries.clear()
+        self._tags.clear()
+        self._bytes = 0
+        self.generation += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the cache counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class EntityCache:
+    """
+    LRU cache of single records by table and id, with TTL and invalidation.
+
+    Holds the column values of frequently requested rows (e.g. the
+    politicians and bills list items are expanded with), so lookups of
+    many ids only query the database for the ids it does not hold.
+
+    As with `ResponseCache`, values loaded while an invalidation happened
+    are not stored.
+
+    Args:
+        ttl: Seconds an entry stays valid after being stored
+        max_entries: Maximum number of records kept
+        enabled: When False, nothing is stored and every lookup misses
+    """
+
+    def __init__(self, ttl: float, max_entries: int, enabled: bool = True):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        # Keyed by (table, id as string), so ids from NOTIFY messages match
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._tables: Dict[str, Set[str]] = {}
+        # Incremented on every invalidation, see `set_many`
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_many(self, table: str, ids: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """
+        Get the cached records of a table among the given ids.
+
+        Args:
+            table: Table name
+            ids: Record ids to look up
+
+        Returns:
+            Cached records by id; ids missing from the result were not cached
+        """
+        now = time.monotonic()
+        found = {}
+        for id in ids:
+            key = (table, str(id))
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    self._discard(key)
+                self.misses += 1
+                continue
+            self._entries.move_to_end(key)
+            found[id] = entry[1]
+            self.hits += 1
+        return found
+
+    def set_many(self, table: str, records: Dict[Hashable, Any], *, generation: int) -> bool:
+        """
+        Store records of a table, evicting least recently used entries if needed.
+
+        Args:
+            table: Table name
+            records: Records by id
+            generation: Value of `generation` when loading the records began
+
+        Returns:
+            True if the records were stored
+        """
+        if not self.enabled or generation != self.generation:
+            return False
+        expires_at = time.monotonic() + self.ttl
+        ids = self._tables.setdefault(table, set())
+        for id, record in records.items():
+            key = (table, str(id))
+            self._entries[key] = (expires_at, record)
+            self._entries.move_to_end(key)
+            ids.add(key[1])
+        while len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+            self.evictions += 1
+        return True
+
+    def invalidate_table(self, table: str, id: Optional[Any] = None) -> None:
+        """
+        Drop the records affected by a write to a table.
+
+        Args:
+            table: Name of the written table
+            id: Id of the written row, None to drop every record of the table
+        """
+        self.generation += 1
+        if id is None:
+            for cached_id in list(self._tables.get(table, ())):
+                self._discard((table, cached_id))
+        else:
+            self._discard((table, str(id)))
+
+    def _discard(self, key: Tuple[str, str]) -> None:
+        if self._entries.pop(key, None) is None:
+            return
+        table, id = key
+        ids = self._tables.get(table)
+        if ids is not None:
+            ids.discard(id)
+            if not ids:
+                del self._tables[table]
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._entries.clear()
+        self._tables.clear()
+        self.generation += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the cache counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Cache of serialized read responses for this worker process
+response_cache = ResponseCache(
+    settings.RESPONSE_CACHE_TTL_SECONDS,
+    settings.RESPONSE_CACHE_MAX_BYTES,
+    enabled=settings.RESPONSE_CACHE_ENABLED,
+)
+
+# Cache of hot records for this worker process
+entity_cache = EntityCache(
+    settings.ENTITY_CACHE_TTL_SECONDS,
+    settings.ENTITY_CACHE_MAX_ENTRIES,
+    enabled=settings.ENTITY_CACHE_ENABLED,
+)
+
+
+# Row count caches of the CRUD objects, by table (see `register_count_cache`)
+_count_caches: Dict[str, List[TTLCache]] = {}
+
+
+def register_count_cache(table: str, cache: TTLCache) -> None:
+    """
+    Have writes to a table empty a cache of its row counts.
+
+    Any write may change any filtered count, so the whole cache is emptied,
+    even for a write to a single row.
+
+    Args:
+        table: Name of the counted table
+        cache: Cache of its counts
+    """
+    _count_caches.setdefault(table, []).append(cache)
+
+
+def invalidate_table(table: str, id: Optional[Any] = None) -> None:
+    """
+    Invalidate every cache of this process affected by a write to a table.
+
+    Args:
+        table: Name of the written table
+        id: Id of the written row, if the write touched a single row
+    """
+    response_cache.invalidate_table(table, id)
+    entity_cache.invalidate_table(table, id)
+    for count_cache in _count_caches.get(table, ()):
+        count_cache.clear()
+
+
+def clear_all() -> None:
+    """Empty every cache of this process."""
+    response_cache.clear()
+    entity_cache.clear()
+    for count_caches in _count_caches.values():
+        for count_cache in count_caches:
+            count_cache.clear()
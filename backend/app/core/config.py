@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 from pydantic import AnyHttpUrl, PostgresDsn, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -64,6 +64,37 @@ class Settings(BaseSettings):
             # Fallback for development
             return f"postgresql+asyncpg://{values.get('POSTGRES_USER')}:{values.get('POSTGRES_PASSWORD')}@{values.get('POSTGRES_HOST')}:{values.get('POSTGRES_PORT')}/{values.get('POSTGRES_DB')}"
 
+    # List endpoint totals: how long exact/estimated counts are reused
+    COUNT_CACHE_TTL_SECONDS: float = 30.0
+    COUNT_CACHE_MAX_ENTRIES: int = 1024
+
+    # Serve list endpoints from column rows encoded with orjson
+    FAST_LIST_SERIALIZATION: bool = False
+    # Build GET /politicians/{id}/details with the ORM or as JSON in PostgreSQL
+    DETAIL_JSON_ENGINE: Literal["orm", "postgres"] = "orm"
+
+    # Read endpoint response cache (per worker process)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_SECONDS: float = 300.0
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # Hot record cache serving relation expansion and batch gets (per worker process)
+    ENTITY_CACHE_ENABLED: bool = True
+    ENTITY_CACHE_TTL_SECONDS: float = 300.0
+    ENTITY_CACHE_MAX_ENTRIES: int = 50000
+    # Most records a batch get may request
+    BATCH_GET_MAX_IDS: int = 5000
+    # Refresh materialized views in the background (see app.db.matviews);
+    # intervals in seconds by view name override the registered ones
+    MATVIEW_REFRESH_ENABLED: bool = True
+    MATVIEW_REFRESH_INTERVALS: Dict[str, float] = {}
+    # Create the yearly partitions of political_contribution ahead of time
+    # (see app.db.partitions)
+    PARTITION_MAINTENANCE_ENABLED: bool = True
+    PARTITION_MAINTENANCE_INTERVAL_SECONDS: float = 86400.0
+    PARTITION_YEARS_AHEAD: int = 2
+    # NOTIFY channel carrying cache invalidations between worker processes
+    CACHE_INVALIDATION_CHANNEL: str = "povodb_cache_invalidation"
+
     # Security settings
     SECRET_KEY: str = "development_secret_key_change_in_production"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
@@ -1,16 +1,224 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import (
+    Any, Callable, Dict, Generic, List, Literal, Mapping, Optional, Sequence, Tuple, Type,
+    TypeVar, Union
+)
 from uuid import UUID
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+import base64
+import binascii
+import json
+
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy import select, func, delete, update
+from sqlalchemy import (
+    Float, Integer, String, any_, bindparam, select, func, delete, update, text, tuple_
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, load_only
+from sqlalchemy.orm.interfaces import LoaderOption
+from sqlalchemy.sql import ColumnElement, Select
+from sqlalchemy.sql.elements import BindParameter
 
+from app.core.cache import TTLCache, invalidate_table, register_count_cache
+from app.core.config import settings
+from app.db import invalidation
 from app.db.base_class import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# How list totals are computed: exact COUNT(*), planner estimate, or not at all
+CountMode = Literal["exact", "estimate", "none"]
+
+# Row estimate of a table: its own for a plain table, the sum over its
+# partitions for a partitioned one (whose own reltuples stays -1); -1 when
+# nothing was analyzed yet
+_RELTUPLES = text(
+    """
+    SELECT CASE WHEN bool_and(reltuples < 0) THEN -1 ELSE sum(greatest(reltuples, 0)) END::bigint
+    FROM pg_class
+    WHERE oid IN (SELECT relid FROM pg_partition_tree(CAST(:table AS regclass)))
+      AND relkind = 'r'
+    """
+)
+
+
+class PaginationError(ValueError):
+    """Raised when a sort order or pagination cursor is not acceptable."""
+
+
+# Parsers used to turn cursor values back into column values, by python type
+_CURSOR_PARSERS = {
+    datetime: datetime.fromisoformat,
+    date: date.fromisoformat,
+    UUID: UUID,
+    Decimal: Decimal,
+}
+
+
+def _encode_cursor_value(value: Any) -> Any:
+    """Convert a sort key value into something JSON can carry losslessly."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    return value
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    """
+    Build an opaque cursor pointing just after the row with the given sort key.
+
+    Args:
+        sort: Name of the sort order the cursor belongs to
+        values: Sort key values of the last row on the page
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = {"s": sort, "k": [_encode_cursor_value(v) for v in values]}
+    # Non-ASCII characters are kept as UTF-8, as `json_sql.cursor` renders them
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(
+    cursor: str, sort: str, columns: Sequence[InstrumentedAttribute]
+) -> List[Any]:
+    """
+    Decode a cursor produced by `encode_cursor` for the given sort order.
+
+    Args:
+        cursor: Cursor string received from the client
+        sort: Name of the sort order of the current request
+        columns: Columns of the sort key, used to restore value types
+
+    Returns:
+        Sort key values, one per column
+
+    Raises:
+        PaginationError: If the cursor is malformed or was issued for another sort order
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = payload["k"]
+        cursor_sort = payload["s"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise PaginationError("Invalid pagination cursor")
+
+    if cursor_sort != sort:
+        raise PaginationError("Pagination cursor does not match the requested sort order")
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise PaginationError("Invalid pagination cursor")
+
+    decoded = []
+    for column, value in zip(columns, values):
+        parser = _CURSOR_PARSERS.get(column.type.python_type)
+        try:
+            decoded.append(parser(value) if parser and value is not None else value)
+        except (TypeError, ValueError, ArithmeticError):
+            raise PaginationError("Invalid pagination cursor")
+    return decoded
+
+
+@dataclass(frozen=True)
+class ListFilter:
+    """
+    A named list filter.
+
+    `criterion` receives a bound parameter carrying the filter value and
+    returns the WHERE clause; `transform` optionally rewrites the value
+    before it is bound (e.g. wrapping it in % for partial matches).
+
+    A filter with a `rank` expression makes the list a ranked search: while
+    it is active, results are ordered by rank (best first) instead of by the
+    sort key, and only offset pagination is available.
+    """
+
+    criterion: Callable[[BindParameter], ColumnElement]
+    transform: Optional[Callable[[Any], Any]] = None
+    rank: Optional[Callable[[BindParameter], ColumnElement]] = None
+
+
+def unaccent(value: Any) -> ColumnElement:
+    """Strip accents with the indexable `immutable_unaccent` SQL function."""
+    return func.immutable_unaccent(value, type_=String)
+
+
+def partial_match(column: InstrumentedAttribute) -> ListFilter:
+    """
+    Case- and accent-insensitive substring filter on a text column.
+
+    Served by a trigram GIN index on `immutable_unaccent(column)`.
+    """
+    return ListFilter(
+        lambda value: unaccent(column).ilike(unaccent(value)),
+        lambda value: f"%{value}%",
+    )
+
+
+def fuzzy_match(column: InstrumentedAttribute) -> ListFilter:
+    """
+    Ranked, typo-tolerant filter on a text column.
+
+    Matches rows whose accent-stripped value contains a word similar to the
+    search term (pg_trgm `<%` operator, served by the same trigram index as
+    `partial_match`) and ranks them by `word_similarity`.
+    """
+    return ListFilter(
+        lambda value: unaccent(value).op("<%", is_comparison=True)(unaccent(column)),
+        rank=lambda value: func.word_similarity(unaccent(value), unaccent(column), type_=Float),
+    )
+
+
+@dataclass(frozen=True)
+class CollectionParams:
+    """Pagination of a related collection embedded in a detail response."""
+
+    limit: int = 20
+    cursor: Optional[str] = None
+    sort: Optional[str] = None
+
+
+@dataclass
+class Page(Generic[ModelType]):
+    """A page of list results: model instances, or dictionaries of column values."""
+
+    items: List[Union[ModelType, Dict[str, Any]]]
+    total: Optional[int]
+    next_cursor: Optional[str] = None
+    total_exact: bool = True
+
+    def to_response(self, *, skip: int, limit: int) -> Dict[str, Any]:
+        """
+        Build the body of a paginated response (`*Page` schemas).
+
+        Args:
+            skip: Offset that was requested
+            limit: Page size that was requested
+
+        Returns:
+            Dictionary with items, totals and pagination values
+        """
+        pages = None
+        if self.total is not None:
+            pages = (self.total + limit - 1) // limit if self.total > 0 else 0
+
+        return {
+            "items": self.items,
+            "total": self.total,
+            "total_exact": self.total_exact,
+            "page": skip // limit + 1,
+            "size": limit,
+            "pages": pages,
+            "next_cursor": self.next_cursor,
+        }
+
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """
@@ -20,8 +228,25 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
     * `model`: A SQLAlchemy model class
     * `schema`: A Pydantic model (schema) class
+
+    List queries are always ordered by one of the allow-listed `sort_keys`, so
+    they can be paginated either with `skip` (offset) or with an opaque cursor
+    (keyset). Every sort key ends with `id` so the order is total, and should
+    only use non-nullable columns backed by a composite index.
+
+    Subclasses declare the filters their list endpoint accepts once, in
+    `filters`; `get_page` turns them into a single statement returning the
+    page rows together with the filtered total.
     """
 
+    # Sort keys available for pagination, by name. Prefix the name with "-"
+    # to sort in descending order.
+    sort_keys: Dict[str, Tuple[str, ...]] = {"created_at": ("created_at", "id")}
+    default_sort: str = "-created_at"
+
+    # Filters accepted by `get_page`, by name
+    filters: Dict[str, ListFilter] = {}
+
     def __init__(self, model: Type[ModelType]):
         """
         CRUD object with default methods to Create, Read, Update, Delete.
@@ -31,24 +256,479 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         * `model`: A SQLAlchemy model class
         """
         self.model = model
+        # List statements, built once per filter shape (see `get_page`)
+        self._page_statements: Dict[Tuple[Any, ...], Select] = {}
+        # Exact and estimated totals per normalized filter set
+        self._count_cache = TTLCache(
+            settings.COUNT_CACHE_TTL_SECONDS, settings.COUNT_CACHE_MAX_ENTRIES
+        )
+        # Emptied by every write to the table, here or in another worker
+        register_count_cache(model.__table__.name, self._count_cache)
 
-    async def get(self, db: AsyncSession, id: UUID) -> Optional[ModelType]:
+    async def get(
+        self, db: AsyncSession, id: UUID, columns: Optional[Sequence[str]] = None
+    ) -> Optional[ModelType]:
         """
         Get a single record by ID.
 
         Args:
             db: Database session
             id: UUID of the record to get
+            columns: Names of the only columns to load, None for all
 
         Returns:
             The model instance, or None if not found
         """
         query = select(self.model).where(self.model.id == id)
+        if columns is not None:
+            query = query.options(self.load_only(columns))
         result = await db.execute(query)
         return result.scalars().first()
 
+    async def get_many(
+        self,
+        db: AsyncSession,
+        ids: Sequence[UUID],
+        columns: Optional[Sequence[str]] = None,
+    ) -> Dict[UUID, Union[ModelType, Dict[str, Any]]]:
+        """
+        Get many records by ID in one query (`id = ANY(:ids)`).
+
+        Args:
+            db: Database session
+            ids: UUIDs of the records to get
+            columns: Names of the columns to return, None for model instances
+
+        Returns:
+            Records by id, as model instances or dictionaries of column
+            values (with `columns`); ids not found are missing
+        """
+        if not ids:
+            return {}
+        selected = tuple(columns) if columns is not None else None
+        key = ("many", selected)
+        statement = self._page_statements.get(key)
+        if statement is None:
+            if selected is None:
+                statement = select(self.model)
+            else:
+                # The id is needed to key the rows even if not requested
+                names = selected if "id" in selected else ("id",) + selected
+                statement = select(*(getattr(self.model, name) for name in names))
+            id_array = bindparam("ids", type_=ARRAY(self.model.id.type))
+            statement = statement.where(self.model.id == any_(id_array))
+            self._page_statements[key] = statement
+
+        result = await db.execute(statement, {"ids": list(ids)})
+        if selected is None:
+            return {record.id: record for record in result.scalars()}
+        return {row["id"]: {name: row[name] for name in selected} for row in result.mappings()}
+
+    def load_only(self, columns: Sequence[str]) -> LoaderOption:
+        """
+        Build a loader option loading only some columns (and the primary key).
+
+        Args:
+            columns: Names of the columns to load
+
+        Returns:
+            Option for `Select.options`
+        """
+        return load_only(*(getattr(self.model, name) for name in columns), raiseload=True)
+
+    def resolve_sort(
+        self, sort: Optional[str] = None
+    ) -> Tuple[str, List[InstrumentedAttribute], bool]:
+        """
+        Resolve a sort order name against the allow-list.
+
+        Args:
+            sort: Sort order name, e.g. "vote_date" or "-vote_date"
+
+        Returns:
+            Tuple of (normalized name, sort key columns, descending flag)
+
+        Raises:
+            PaginationError: If the sort order is not allowed
+        """
+        sort = sort or self.default_sort
+        descending = sort.startswith("-")
+        key = sort[1:] if descending else sort
+        if key not in self.sort_keys:
+            allowed = ", ".join(sorted(self.sort_keys))
+            raise PaginationError(f"Invalid sort order '{sort}', allowed: {allowed}")
+        columns = [getattr(self.model, name) for name in self.sort_keys[key]]
+        return sort, columns, descending
+
+    def _bound_filters(self, filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Validate filter names and return the transformed values of active filters."""
+        bound = {}
+        for name, value in (filters or {}).items():
+            if name not in self.filters:
+                raise ValueError(f"Unknown filter '{name}' for {self.model.__name__}")
+            if value is None:
+                continue
+            transform = self.filters[name].transform
+            bound[name] = transform(value) if transform else value
+        return bound
+
+    def _criteria(self, names: Sequence[str]) -> List[ColumnElement]:
+        """Build the WHERE criteria for the given active filters."""
+        return [self.filters[name].criterion(bindparam(name)) for name in names]
+
+    def _page_statement(
+        self,
+        names: Tuple[str, ...],
+        sort: str,
+        keyset: bool,
+        with_total: bool,
+        selected: Optional[Tuple[str, ...]] = None,
+    ) -> Select:
+        """
+        Get the list statement for a filter shape, building it on first use.
+
+        Filter values, cursor values, limit and offset are all bound
+        parameters, so one statement object (and SQLAlchemy's compiled form
+        of it) serves every request with the same shape.
+        """
+        shape = (names, sort, keyset, with_total, selected)
+        statement = self._page_statements.get(shape)
+        if statement is not None:
+            return statement
+
+        sort, columns, descending = self.resolve_sort(sort)
+        criteria = self._criteria(names)
+        if selected is None:
+            statement = select(self.model).where(*criteria)
+        else:
+            statement = select(*(getattr(self.model, name) for name in selected)).where(*criteria)
+        ranks = [
+            self.filters[name].rank(bindparam(name))
+            for name in names
+            if self.filters[name].rank is not None
+        ]
+
+        if with_total:
+            # Uncorrelated scalar subquery: planned once as an InitPlan and
+            # returned on every row, so rows and total come back together
+            total = (
+                select(func.count()).select_from(self.model).where(*criteria)
+            ).scalar_subquery()
+            statement = statement.add_columns(total.label("total"))
+
+        if keyset:
+            key = tuple_(*columns)
+            bound = tuple_(
+                *(bindparam(f"_cursor_{i}", type_=c.type) for i, c in enumerate(columns))
+            )
+            statement = statement.where(key < bound if descending else key > bound)
+        else:
+            statement = statement.offset(bindparam("_skip", type_=Integer))
+
+        if ranks:
+            order_by = [rank.desc() for rank in ranks] + [self.model.id.asc()]
+        else:
+            order_by = [c.desc() if descending else c.asc() for c in columns]
+        statement = statement.order_by(*order_by).limit(bindparam("_limit", type_=Integer))
+
+        self._page_statements[shape] = statement
+        return statement
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        count_mode: CountMode = "exact",
+        columns: Optional[Sequence[str]] = None,
+        cache_total: bool = True,
+    ) -> Page[ModelType]:
+        """
+        Get a filtered, paginated list of records and their filtered total.
+
+        Exact totals are cached per filter set for a short time, until the
+        next write to the table; while a total is cached the page query
+        skips the count entirely. Estimated
+        totals come from planner statistics and cost no scan.
+
+        With `columns`, only those columns are selected and the items are
+        plain dictionaries instead of model instances, which skips ORM
+        hydration entirely.
+
+        Args:
+            db: Database session
+            skip: Number of records to skip (ignored when a cursor is given)
+            limit: Maximum number of records to return
+            cursor: Cursor returned as `next_cursor` by a previous page
+            sort: Sort order name
+            filters: Filter values by name, None values are ignored
+            count_mode: "exact", "estimate" or "none" (no total)
+            columns: Names of the columns to return, None for model instances
+            cache_total: When False, the exact total is counted by this
+                query instead of read from or stored in the count cache
+
+        Returns:
+            Page with the records, filtered total and next cursor
+
+        Raises:
+            PaginationError: If the sort order or cursor is invalid
+        """
+        sort, sort_columns, _ = self.resolve_sort(sort)
+        params = self._bound_filters(filters)
+        names = tuple(sorted(params))
+        count_key = (names, tuple(params[name] for name in names))
+        ranked = any(self.filters[name].rank is not None for name in names)
+        if ranked and cursor:
+            raise PaginationError("Ranked search results only support skip pagination")
+
+        total = None
+        if count_mode == "exact" and cache_total:
+            total = self._count_cache.get(("exact",) + count_key)
+        elif count_mode == "estimate":
+            total = await self._estimate_count(db, names, params, count_key)
+        with_total = count_mode == "exact" and total is None
+
+        if cursor:
+            for i, value in enumerate(decode_cursor(cursor, sort, sort_columns)):
+                params[f"_cursor_{i}"] = value
+        else:
+            params["_skip"] = skip
+        params["_limit"] = limit
+
+        selected = None
+        if columns is not None:
+            # Sort key columns are needed for the next cursor even if not requested
+            selected = tuple(columns) + tuple(
+                c.key for c in sort_columns if c.key not in columns
+            )
+        statement = self._page_statement(names, sort, bool(cursor), with_total, selected)
+        result = await db.execute(statement, params)
+
+        if selected is not None:
+            rows = result.mappings().all()
+        elif with_total:
+            rows = result.all()
+        else:
+            rows = result.scalars().all()
+
+        if with_total:
+            if rows:
+                total = rows[0]["total"] if selected is not None else rows[0].total
+            elif skip or cursor:
+                # Past the last row there is nothing to carry the total
+                total = await self.count(db, filters=filters)
+            else:
+                total = 0
+            if cache_total:
+                self._count_cache.set(("exact",) + count_key, total)
+
+        if selected is not None:
+            items = [{name: row[name] for name in columns} for row in rows]
+        elif with_total:
+            items = [row[0] for row in rows]
+        else:
+            items = rows
+        # Mappings still hold the sort key columns stripped from the items
+        keys = rows if selected is not None else items
+        next_cursor = None if ranked else self.next_cursor(keys, limit=limit, sort=sort)
+
+        return Page(
+            items=items,
+            total=total,
+            next_cursor=next_cursor,
+            total_exact=count_mode == "exact",
+        )
+
+    async def version(
+        self,
+        db: AsyncSession,
+        id: UUID,
+        related: Sequence[InstrumentedAttribute] = (),
+    ) -> Optional[Tuple[Any, ...]]:
+        """
+        Get the version of a record, without loading it.
+
+        The version is the record's `updated_at`, followed for each related
+        record (many-to-one) by its `updated_at` and for each related
+        collection by its size and latest `updated_at`. It changes whenever
+        the record or the related data included in a response changes.
+
+        Args:
+            db: Database session
+            id: UUID of the record
+            related: Relationships whose data is part of the response
+
+        Returns:
+            Tuple of version values, or None if the record does not exist
+        """
+        columns: List[ColumnElement] = [self.model.updated_at]
+        for relationship in related:
+            target = relationship.property.mapper.class_
+            condition = relationship.property.primaryjoin
+            if relationship.property.uselist:
+                columns.append(
+                    select(func.count()).select_from(target).where(condition).scalar_subquery()
+                )
+                columns.append(
+                    select(func.max(target.updated_at)).where(condition).scalar_subquery()
+                )
+            else:
+                columns.append(select(target.updated_at).where(condition).scalar_subquery())
+        result = await db.execute(select(*columns).where(self.model.id == id))
+        row = result.first()
+        return tuple(row) if row is not None else None
+
+    async def list_version(
+        self, db: AsyncSession, *, filters: Optional[Dict[str, Any]] = None
+    ) -> Tuple[int, Optional[datetime]]:
+        """
+        Get the version of a filtered list: its size and latest `updated_at`.
+
+        Inserts and updates move the latest `updated_at`, deletes change the
+        size, so the pair changes whenever the list contents may have. The
+        count is also stored as the cached exact total, so a `get_page` call
+        right after it does not count again.
+
+        Args:
+            db: Database session
+            filters: Filter values by name, as accepted by `get_page`
+
+        Returns:
+            Tuple of (record count, latest updated_at or None when empty)
+        """
+        params = self._bound_filters(filters)
+        query = (
+            select(func.count(), func.max(self.model.updated_at))
+            .select_from(self.model)
+            .where(*self._criteria(sorted(params)))
+        )
+        result = await db.execute(query, params)
+        count, last_updated = result.one()
+        names = tuple(sorted(params))
+        self._count_cache.set(("exact", names, tuple(params[name] for name in names)), count)
+        return count, last_updated
+
+    async def last_updated(self, db: AsyncSession) -> Optional[datetime]:
+        """
+        Get the latest `updated_at` of the whole table (an index-only lookup).
+
+        Args:
+            db: Database session
+
+        Returns:
+            The latest update time, or None when the table is empty
+        """
+        result = await db.execute(select(func.max(self.model.updated_at)))
+        return result.scalar_one()
+
+    def export_query(
+        self,
+        *,
+        filters: Optional[Dict[str, Any]] = None,
+        sort: Optional[str] = None,
+    ) -> Tuple[Select, Dict[str, Any]]:
+        """
+        Build the unpaginated query used to export filtered records.
+
+        It selects plain table columns rather than ORM objects, so rows can
+        be streamed and encoded without building model instances.
+
+        Args:
+            filters: Filter values by name, as accepted by `get_page`
+            sort: Sort order name
+
+        Returns:
+            Tuple of (statement, bound parameter values)
+
+        Raises:
+            PaginationError: If the sort order is invalid
+        """
+        sort, columns, descending = self.resolve_sort(sort)
+        params = self._bound_filters(filters)
+        table_columns = sorted(self.model.__table__.columns, key=lambda c: c.name != "id")
+        statement = (
+            select(*table_columns)
+            .where(*self._criteria(sorted(params)))
+            .order_by(*(c.desc() if descending else c.asc() for c in columns))
+        )
+        return statement, params
+
+    async def _estimate_count(
+        self,
+        db: AsyncSession,
+        names: Tuple[str, ...],
+        params: Dict[str, Any],
+        count_key: Tuple[Any, ...],
+    ) -> int:
+        """
+        Estimate the number of records matching the active filters.
+
+        Without filters the estimate is the table's `pg_class.reltuples`
+        (summed over the partitions of a partitioned table); with filters
+        it is the row estimate of the planner for the filtered scan, read
+        from `EXPLAIN (FORMAT JSON)` without executing it.
+        """
+        cached = self._count_cache.get(("estimate",) + count_key)
+        if cached is not None:
+            return cached
+
+        if not names:
+            result = await db.execute(_RELTUPLES, {"table": self.model.__table__.name})
+            estimate = result.scalar_one()
+            if estimate < 0:
+                # Never vacuumed/analyzed: statistics are not available yet
+                estimate = await self.count(db)
+        else:
+            connection = await db.connection()
+            query = select(self.model.id).where(*self._criteria(names))
+            compiled = query.compile(dialect=connection.dialect)
+            values = compiled.construct_params(params)
+            result = await connection.exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {compiled}",
+                tuple(values[key] for key in compiled.positiontup),
+            )
+            plan = result.scalar_one()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = int(plan[0]["Plan"]["Plan Rows"])
+
+        self._count_cache.set(("estimate",) + count_key, estimate)
+        return estimate
+
+    def next_cursor(
+        self, items: Sequence[Any], *, limit: int, sort: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Build the cursor for the page following `items`.
+
+        Args:
+            items: Rows of the current page (model instances or mappings)
+            limit: Page size that was requested
+            sort: Sort order name
+
+        Returns:
+            Cursor string, or None when this is the last page
+        """
+        if len(items) < limit:
+            return None
+        sort, columns, _ = self.resolve_sort(sort)
+        last = items[-1]
+        if isinstance(last, Mapping):
+            return encode_cursor(sort, [last[c.key] for c in columns])
+        return encode_cursor(sort, [getattr(last, c.key) for c in columns])
+
     async def get_multi(
-        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
     ) -> List[ModelType]:
         """
         Get multiple records with pagination.
@@ -57,13 +737,46 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             db: Database session
             skip: Number of records to skip
             limit: Maximum number of records to return
+            cursor: Keyset pagination cursor (takes precedence over skip)
+            sort: Sort order name
 
         Returns:
             List of model instances
         """
-        query = select(self.model).offset(skip).limit(limit)
-        result = await db.execute(query)
-        return result.scalars().all()
+        page = await self.get_page(
+            db, skip=skip, limit=limit, cursor=cursor, sort=sort, count_mode="none"
+        )
+        return page.items
+
+    def invalidate_cache(self, id: Optional[UUID] = None) -> None:
+        """
+        Drop this process's cached responses and counts affected by a write to this table.
+
+        Args:
+            id: Id of the written record, None for writes to many records
+        """
+        invalidate_table(self.model.__table__.name, id)
+
+    async def commit_write(self, db: AsyncSession, db_obj: Optional[ModelType] = None) -> None:
+        """
+        Commit a write to this table and invalidate cached responses.
+
+        The invalidation message for other worker processes is sent in the
+        same transaction, so it is delivered exactly when the write commits.
+        Code writing to the table outside this class must commit through
+        this method as well.
+
+        Args:
+            db: Database session holding the pending write
+            db_obj: The written record, None for writes to many records
+        """
+        id = None
+        if db_obj is not None:
+            await db.flush()
+            id = db_obj.id
+        await invalidation.publish(db, self.model.__table__.name, id)
+        await db.commit()
+        self.invalidate_cache(id)
 
     async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
         """
@@ -79,7 +792,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
-        await db.commit()
+        await self.commit_write(db, db_obj)
         await db.refresh(db_obj)
         return db_obj
 
@@ -110,7 +823,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
         db.add(db_obj)
-        await db.commit()
+        await self.commit_write(db, db_obj)
         await db.refresh(db_obj)
         return db_obj
 
@@ -128,21 +841,29 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj = await self.get(db, id)
         if obj:
             await db.delete(obj)
-            await db.commit()
+            await self.commit_write(db, obj)
         return obj
 
-    async def count(self, db: AsyncSession) -> int:
+    async def count(
+        self, db: AsyncSession, *, filters: Optional[Dict[str, Any]] = None
+    ) -> int:
         """
         Count total number of records.
 
         Args:
             db: Database session
+            filters: Filter values by name, as accepted by `get_page`
 
         Returns:
-            Total count of records
+            Total count of (filtered) records
         """
-        query = select(func.count()).select_from(self.model)
-        result = await db.execute(query)
+        params = self._bound_filters(filters)
+        query = (
+            select(func.count())
+            .select_from(self.model)
+            .where(*self._criteria(sorted(params)))
+        )
+        result = await db.execute(query, params)
         return result.scalar_one()
 
     async def soft_delete(self, db: AsyncSession, *, id: UUID) -> Optional[ModelType]:
@@ -161,6 +882,6 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             from datetime import datetime
             setattr(obj, "deleted_at", datetime.now())
             db.add(obj)
-            await db.commit()
+            await self.commit_write(db, obj)
             await db.refresh(obj)
         return obj
@@ -0,0 +1,280 @@
+"""
+Bulk loading through PostgreSQL COPY.
+
+Rows arrive as NDJSON or CSV from a stream of bytes (e.g. an HTTP request
+body), are validated in batches against the create schema and written with
+asyncpg's binary COPY, one transaction per batch. An invalid row only
+rejects itself; a batch the database refuses (e.g. a foreign key
+violation) is rolled back on its own and reported, and loading continues
+with the next batch.
+"""
+import csv
+import json
+import uuid
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Tuple, Type
+
+import asyncpg
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy import Numeric
+
+from app.db.base_class import Base
+from app.db.session import raw_connection
+
+# (line number, parsed record or None, error message or None)
+ParsedRow = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+NDJSON_CONTENT_TYPES = {
+    "application/x-ndjson",
+    "application/ndjson",
+    "application/jsonl",
+    "application/json-lines",
+}
+CSV_CONTENT_TYPES = {"text/csv", "application/csv"}
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[Tuple[int, Optional[str]]]:
+    """
+    Split a byte stream into numbered lines.
+
+    Yields:
+        Tuples of (line number, decoded line); the line is None when it is
+        not valid UTF-8
+    """
+    buffer = b""
+    line_no = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            yield line_no, _decode(line)
+    if buffer:
+        yield line_no + 1, _decode(buffer)
+
+
+def _decode(line: bytes) -> Optional[str]:
+    try:
+        return line.decode("utf-8").rstrip("\r")
+    except UnicodeDecodeError:
+        return None
+
+
+async def parse_ndjson(lines: AsyncIterable[Tuple[int, Optional[str]]]) -> AsyncIterator[ParsedRow]:
+    """Parse one JSON object per line, skipping blank lines."""
+    async for line_no, line in lines:
+        if line is None:
+            yield line_no, None, "Line is not valid UTF-8"
+            continue
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_no, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield line_no, None, "Expected a JSON object"
+            continue
+        yield line_no, record, None
+
+
+async def parse_csv(lines: AsyncIterable[Tuple[int, Optional[str]]]) -> AsyncIterator[ParsedRow]:
+    """
+    Parse CSV with a header row; empty fields become None.
+
+    Quoted fields may span several lines: a record is complete once it
+    contains an even number of quote characters.
+    """
+    header: Optional[List[str]] = None
+    pending: List[str] = []
+    first_line = 0
+
+    async for line_no, line in lines:
+        if line is None:
+            yield line_no, None, "Line is not valid UTF-8"
+            continue
+        if not pending:
+            if not line.strip():
+                continue
+            first_line = line_no
+        pending.append(line)
+        text = "\n".join(pending)
+        if text.count('"') % 2:
+            continue
+        pending = []
+
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield first_line, None, f"Expected {len(header)} fields, got {len(values)}"
+            continue
+        yield first_line, {k: (v if v != "" else None) for k, v in zip(header, values)}, None
+
+    if pending:
+        yield first_line, None, "Unterminated quoted field"
+
+
+def parser_for(content_type: Optional[str]):
+    """
+    Get the row parser for a request content type (NDJSON by default).
+
+    Raises:
+        ValueError: If the content type is not supported
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if not media_type or media_type in NDJSON_CONTENT_TYPES:
+        return parse_ndjson
+    if media_type in CSV_CONTENT_TYPES:
+        return parse_csv
+    raise ValueError(f"Unsupported content type '{media_type}', use NDJSON or CSV")
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[schema])
+
+
+def validate_rows(
+    schema: Type[BaseModel],
+    candidates: List[Tuple[int, Dict[str, Any]]],
+    errors: List[Dict[str, Any]],
+) -> List[BaseModel]:
+    """
+    Validate a batch of records against a schema.
+
+    The whole batch is validated in one call; when that fails, the rows
+    named in the validation errors are reported and the rest validated
+    again together.
+
+    Args:
+        schema: Schema every record must match
+        candidates: Tuples of (line number, record)
+        errors: List the rejected rows are appended to, as {line, error}
+
+    Returns:
+        Validated schema instances for the accepted rows, in order
+    """
+    adapter = _list_adapter(schema)
+    try:
+        return adapter.validate_python([record for _, record in candidates])
+    except ValidationError as exc:
+        messages: Dict[int, List[str]] = {}
+        for error in exc.errors():
+            index, *field = error["loc"]
+            prefix = ".".join(str(part) for part in field)
+            messages.setdefault(index, []).append(
+                f"{prefix}: {error['msg']}" if prefix else error["msg"]
+            )
+        for index in sorted(messages):
+            errors.append({"line": candidates[index][0], "error": "; ".join(messages[index])})
+        valid = [record for i, (_, record) in enumerate(candidates) if i not in messages]
+        return adapter.validate_python(valid)
+
+
+def _copy_record(obj: BaseModel, fields: List[str], numeric: set) -> Tuple[Any, ...]:
+    """Build a COPY record (id first) from a validated row."""
+    values = []
+    for name in fields:
+        value = getattr(obj, name)
+        if name in numeric and value is not None:
+            # Binary COPY of NUMERIC needs exact decimals, not floats
+            value = Decimal(str(value))
+        values.append(value)
+    return (uuid.uuid4(), *values)
+
+
+async def _copy_batch(
+    model: Type[Base],
+    schema: Type[BaseModel],
+    batch_no: int,
+    rows: List[ParsedRow],
+) -> Dict[str, Any]:
+    """Validate one batch and COPY its valid rows in a transaction of its own."""
+    table = model.__table__
+    fields = list(schema.model_fields)
+    numeric = {name for name in fields if isinstance(table.c[name].type, Numeric)}
+
+    errors = [{"line": line, "error": error} for line, _, error in rows if error]
+    candidates = [(line, record) for line, record, error in rows if not error]
+    valid = validate_rows(schema, candidates, errors) if candidates else []
+
+    records = [_copy_record(obj, fields, numeric) for obj in valid]
+
+    inserted = 0
+    batch_error = None
+    if records:
+        try:
+            async with raw_connection() as conn:
+                async with conn.transaction():
+                    await conn.copy_records_to_table(
+                        table.name, records=records, columns=["id", *fields]
+                    )
+            inserted = len(records)
+        except (asyncpg.PostgresError, asyncpg.InterfaceError, ValueError) as e:
+            # Rejected by the server, or a value the client could not encode
+            batch_error = str(e)
+
+    return {
+        "batch": batch_no,
+        "first_line": rows[0][0],
+        "last_line": rows[-1][0],
+        "received": len(rows),
+        "inserted": inserted,
+        "errors": sorted(errors, key=lambda error: error["line"]),
+        "batch_error": batch_error,
+    }
+
+
+async def bulk_copy(
+    model: Type[Base],
+    schema: Type[BaseModel],
+    chunks: AsyncIterable[bytes],
+    *,
+    content_type: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """
+    Stream NDJSON or CSV rows into a table with COPY.
+
+    Only one batch is held in memory at a time, and a pooled connection is
+    only borrowed while a batch is being written.
+
+    Args:
+        model: SQLAlchemy model of the target table
+        schema: Create schema every row is validated against
+        chunks: Byte stream with the rows
+        content_type: Content type of the stream (NDJSON or CSV)
+        batch_size: Rows per validation/COPY batch
+
+    Returns:
+        Report with totals and the outcome of every batch (`BulkReport`)
+
+    Raises:
+        ValueError: If the content type is not supported
+    """
+    parse = parser_for(content_type)
+    batches: List[Dict[str, Any]] = []
+    rows: List[ParsedRow] = []
+
+    async for row in parse(iter_lines(chunks)):
+        rows.append(row)
+        if len(rows) >= batch_size:
+            batches.append(await _copy_batch(model, schema, len(batches) + 1, rows))
+            rows = []
+    if rows:
+        batches.append(await _copy_batch(model, schema, len(batches) + 1, rows))
+
+    received = sum(batch["received"] for batch in batches)
+    inserted = sum(batch["inserted"] for batch in batches)
+    return {
+        "received": received,
+        "inserted": inserted,
+        "rejected": received - inserted,
+        "batches": batches,
+    }
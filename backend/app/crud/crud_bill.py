@@ -0,0 +1,104 @@
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Float, String, bindparam, func, literal_column, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase, ListFilter, decode_cursor, encode_cursor, unaccent
+from app.models.bill import Bill
+from app.schemas.bill.bill import Bill as BillSchema, BillCreate, BillUpdate
+
+# Options for ts_headline snippets; matches are wrapped in <mark> tags
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=30, MinWords=10"
+
+
+class CRUDBill(CRUDBase[Bill, BillCreate, BillUpdate]):
+    """CRUD operations for bills."""
+
+    sort_keys = {
+        "created_at": ("created_at", "id"),
+        "bill_number": ("bill_number", "id"),
+    }
+    default_sort = "-created_at"
+
+    filters = {
+        "status": ListFilter(lambda v: Bill.status == v),
+        "sponsor_id": ListFilter(lambda v: Bill.sponsor_id == v),
+    }
+
+    async def search(
+        self,
+        db: AsyncSession,
+        *,
+        q: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Full-text search over bill titles and descriptions.
+
+        The query accepts web search syntax ("quoted phrases", -exclusions,
+        OR) and is matched with both the Portuguese and the simple
+        dictionaries against the indexed `search_vector`. Results are ranked
+        with `ts_rank_cd` and paginated by keyset on (rank, id).
+
+        Args:
+            db: Database session
+            q: Search query
+            limit: Maximum number of results to return
+            cursor: Cursor returned as `next_cursor` by a previous page
+            filters: Additional list filters (see `filters`)
+
+        Returns:
+            Dictionary with ranked items (bill, rank, headline) and the next cursor
+
+        Raises:
+            PaginationError: If the cursor is invalid
+        """
+        query_text = unaccent(bindparam("q", q, type_=String))
+        tsquery = func.websearch_to_tsquery(
+            literal_column("'portuguese'::regconfig"), query_text
+        ).op("||")(
+            func.websearch_to_tsquery(literal_column("'simple'::regconfig"), query_text)
+        )
+        rank = func.ts_rank_cd(Bill.search_vector, tsquery, type_=Float)
+
+        params = self._bound_filters(filters)
+        matches = (
+            select(Bill.id, rank.label("rank"))
+            .where(Bill.search_vector.op("@@")(tsquery), *self._criteria(sorted(params)))
+            .params(**params)
+        )
+        if cursor:
+            values = decode_cursor(cursor, "rank", [rank, Bill.id])
+            matches = matches.where(tuple_(rank, Bill.id) < tuple_(*values))
+        matches = matches.order_by(rank.desc(), Bill.id.desc()).limit(limit).subquery()
+
+        # Headlines are expensive, so they are only built for the page rows
+        headline = func.ts_headline(
+            literal_column("'portuguese'::regconfig"),
+            func.coalesce(Bill.description, Bill.title),
+            tsquery,
+            HEADLINE_OPTIONS,
+        )
+        statement = (
+            select(Bill, matches.c.rank, headline.label("headline"))
+            .join(matches, matches.c.id == Bill.id)
+            .order_by(matches.c.rank.desc(), Bill.id.desc())
+        )
+        result = await db.execute(statement)
+        rows = result.all()
+
+        items: List[Dict[str, Any]] = [
+            {**BillSchema.model_validate(row[0]).model_dump(), "rank": row.rank, "headline": row.headline}
+            for row in rows
+        ]
+
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = encode_cursor("rank", [rows[-1].rank, rows[-1][0].id])
+
+        return {"items": items, "size": limit, "next_cursor": next_cursor}
+
+
+bill = CRUDBill(Bill)
@@ -0,0 +1,240 @@
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import CTE, BigInteger, Date, FromClause, ScalarSelect, Select, Table, and_, cast, delete, distinct, func, insert, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase, ListFilter, fuzzy_match, partial_match
+from app.models.contributor_totals import contributor_monthly_totals, contributor_politician_totals, contributor_totals
+from app.models.materialized_views import party_contributions_monthly
+from app.models.political_contribution import PoliticalContribution
+from app.schemas.contribution.contribution import ContributionCreate, ContributionUpdate
+
+
+class CRUDContribution(CRUDBase[PoliticalContribution, ContributionCreate, ContributionUpdate]):
+    """CRUD operations for political contributions."""
+
+    sort_keys = {
+        "contribution_date": ("contribution_date", "id"),
+        "amount": ("amount", "id"),
+        "created_at": ("created_at", "id"),
+    }
+    default_sort = "-contribution_date"
+
+    filters = {
+        "politician_id": ListFilter(lambda v: PoliticalContribution.politician_id == v),
+        "contributor_name": partial_match(PoliticalContribution.contributor_name),
+        "contributor_name_fuzzy": fuzzy_match(PoliticalContribution.contributor_name),
+        "contributor_type": ListFilter(lambda v: PoliticalContribution.contributor_type == v),
+        "min_amount": ListFilter(lambda v: PoliticalContribution.amount >= v),
+        "max_amount": ListFilter(lambda v: PoliticalContribution.amount <= v),
+        "from_date": ListFilter(lambda v: PoliticalContribution.contribution_date >= v),
+        "to_date": ListFilter(lambda v: PoliticalContribution.contribution_date <= v),
+    }
+
+    async def top_contributors(
+        self,
+        db: AsyncSession,
+        *,
+        limit: int = 10,
+        contributor_type: Optional[str] = None,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None,
+        politician_id: Optional[UUID] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank contributors by the total amount they contributed.
+
+        Reads the trigger-maintained rollups: without filters, a top-N scan
+        of `contributor_totals`; with filters, an aggregate over the matching
+        monthly buckets of `contributor_monthly_totals`.
+
+        Args:
+            db: Database session
+            limit: Number of contributors to return
+            contributor_type: Only contributions of this type
+            from_date: Only contributions from the month of this date on
+            to_date: Only contributions up to the month of this date
+            politician_id: Only contributions to this politician
+
+        Returns:
+            Rows with the contributor's name and type, total amount,
+            number of contributions and number of politicians supported
+        """
+        if contributor_type is None and from_date is None and to_date is None and politician_id is None:
+            totals = contributor_totals.c
+            query = select(
+                totals.contributor_name,
+                func.nullif(totals.contributor_type, "").label("contributor_type"),
+                totals.total_amount,
+                totals.contribution_count,
+                totals.politicians_supported,
+            ).order_by(totals.total_amount.desc())
+        else:
+            buckets = contributor_monthly_totals.c
+            total_amount = func.sum(buckets.total_amount)
+            query = (
+                select(
+                    buckets.contributor_name,
+                    func.nullif(buckets.contributor_type, "").label("contributor_type"),
+                    total_amount.label("total_amount"),
+                    # sum(bigint) is a numeric
+                    cast(func.sum(buckets.contribution_count), BigInteger).label("contribution_count"),
+                    func.count(distinct(buckets.politician_id)).label("politicians_supported"),
+                )
+                .group_by(buckets.contributor_name, buckets.contributor_type)
+                .order_by(total_amount.desc())
+            )
+            if contributor_type is not None:
+                query = query.where(buckets.contributor_type == contributor_type)
+            if from_date is not None:
+                query = query.where(buckets.month >= from_date.replace(day=1))
+            if to_date is not None:
+                query = query.where(buckets.month <= to_date.replace(day=1))
+            if politician_id is not None:
+                query = query.where(buckets.politician_id == politician_id)
+
+        result = await db.execute(query.limit(limit))
+        return [dict(row) for row in result.mappings()]
+
+    async def party_totals(
+        self,
+        db: AsyncSession,
+        *,
+        party: Optional[str] = None,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None,
+        limit: int = 500,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get contribution totals per party and month.
+
+        Reads the `mv_party_contributions_monthly` materialized view, which
+        is refreshed in the background and may be a few minutes behind.
+
+        Args:
+            db: Database session
+            party: Only this party ("" for politicians without a party)
+            from_date: Only months from the month of this date on
+            to_date: Only months up to the month of this date
+            limit: Number of rows to return
+
+        Returns:
+            Rows by month, then party
+        """
+        view = party_contributions_monthly.c
+        query = select(party_contributions_monthly).order_by(view.month, view.party).limit(limit)
+        if party is not None:
+            query = query.where(view.party == party)
+        if from_date is not None:
+            query = query.where(view.month >= from_date.replace(day=1))
+        if to_date is not None:
+            query = query.where(view.month <= to_date.replace(day=1))
+        result = await db.execute(query)
+        return [dict(row) for row in result.mappings()]
+
+    async def rebuild_contributor_totals(self, db: AsyncSession, *, check: bool = False) -> int:
+        """
+        Recompute the contributor rollups from scratch.
+
+        Contribution writes are blocked while the rollups are recomputed, so
+        the triggers continue from a consistent state.
+
+        Args:
+            db: Database session; committed unless `check` is set
+            check: Only compare the rollups with a fresh aggregate, do not write
+
+        Returns:
+            Number of rollup rows (monthly buckets, contributor-politician
+            pairs and contributor totals) that differed
+        """
+        keys = (
+            PoliticalContribution.contributor_name,
+            func.coalesce(PoliticalContribution.contributor_type, "").label("contributor_type"),
+            PoliticalContribution.politician_id,
+            cast(func.date_trunc("month", PoliticalContribution.contribution_date), Date).label("month"),
+        )
+        fresh_buckets = (
+            select(
+                *keys,
+                func.sum(PoliticalContribution.amount).label("total_amount"),
+                func.count().label("contribution_count"),
+            )
+            .group_by(*keys)
+            .cte("fresh_buckets")
+        )
+        pair_keys = (fresh_buckets.c.contributor_name, fresh_buckets.c.contributor_type, fresh_buckets.c.politician_id)
+        fresh_pairs = (
+            select(*pair_keys, func.sum(fresh_buckets.c.contribution_count).label("contribution_count"))
+            .group_by(*pair_keys)
+            .cte("fresh_pairs")
+        )
+        fresh_totals = _contributor_totals(fresh_buckets).cte("fresh_totals")
+
+        mismatches = select(
+            _differing_rows(
+                fresh_buckets,
+                contributor_monthly_totals,
+                ("total_amount", "contribution_count"),
+            )
+            + _differing_rows(fresh_pairs, contributor_politician_totals, ("contribution_count",))
+            + _differing_rows(
+                fresh_totals,
+                contributor_totals,
+                ("total_amount", "contribution_count", "politicians_supported"),
+            )
+        )
+
+        await db.execute(text("LOCK TABLE political_contribution IN SHARE MODE"))
+        differing = (await db.execute(mismatches)).scalar_one()
+        if check:
+            await db.rollback()
+            return differing
+
+        await db.execute(delete(contributor_totals))
+        await db.execute(delete(contributor_politician_totals))
+        await db.execute(delete(contributor_monthly_totals))
+        await db.execute(
+            insert(contributor_monthly_totals).from_select(
+                [column.name for column in fresh_buckets.c], select(fresh_buckets)
+            )
+        )
+        buckets = contributor_monthly_totals.c
+        bucket_pairs = (buckets.contributor_name, buckets.contributor_type, buckets.politician_id)
+        await db.execute(
+            insert(contributor_politician_totals).from_select(
+                [column.name for column in fresh_pairs.c],
+                select(*bucket_pairs, func.sum(buckets.contribution_count)).group_by(*bucket_pairs),
+            )
+        )
+        await db.execute(
+            insert(contributor_totals).from_select(
+                [column.name for column in fresh_totals.c],
+                _contributor_totals(contributor_monthly_totals),
+            )
+        )
+        await db.commit()
+        return differing
+
+
+def _contributor_totals(buckets: FromClause) -> Select:
+    """Aggregate monthly buckets into per-contributor totals."""
+    return select(
+        buckets.c.contributor_name,
+        buckets.c.contributor_type,
+        func.sum(buckets.c.total_amount).label("total_amount"),
+        func.sum(buckets.c.contribution_count).label("contribution_count"),
+        func.count(distinct(buckets.c.politician_id)).label("politicians_supported"),
+    ).group_by(buckets.c.contributor_name, buckets.c.contributor_type)
+
+
+def _differing_rows(fresh: CTE, table: Table, values: Sequence[str]) -> ScalarSelect:
+    """Count the rows of a rollup and of its fresh aggregate (keyed by the table's primary key) that differ."""
+    stored = table.c
+    on = and_(*(fresh.c[column.name] == column for column in table.primary_key))
+    differs = or_(*(func.coalesce(fresh.c[name], 0) != func.coalesce(stored[name], 0) for name in values))
+    return select(func.count()).select_from(fresh.join(table, on, full=True)).where(differs).scalar_subquery()
+
+
+contribution = CRUDContribution(PoliticalContribution)
@@ -1,40 +1,264 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Integer, bindparam, case, func, select, true, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import Select
 
-from app.crud.base import CRUDBase
+from app.crud.base import (
+    CollectionParams, CRUDBase, ListFilter, decode_cursor, fuzzy_match, partial_match
+)
+from app.crud.crud_bill import bill
+from app.crud.crud_contribution import contribution
+from app.crud.crud_vote import vote
+from app.crud.json_sql import cursor as json_cursor, json_array, json_fields, json_object, json_value
 from app.models.politician import Politician
-from app.schemas.politician.politician import PoliticianCreate, PoliticianUpdate
+from app.schemas.politician.politician import (
+    BillSchema,
+    ContributionSchema,
+    PoliticianCreate,
+    PoliticianDetail,
+    PoliticianUpdate,
+    VoteSchema,
+)
 
 
 class CRUDPolitician(CRUDBase[Politician, PoliticianCreate, PoliticianUpdate]):
     """CRUD operations for politicians."""
 
-    async def get_with_relations(self, db: AsyncSession, id: UUID) -> Optional[Politician]:
+    sort_keys = {
+        "name": ("name", "id"),
+        "created_at": ("created_at", "id"),
+    }
+    default_sort = "name"
+
+    filters = {
+        "name": partial_match(Politician.name),
+        "name_fuzzy": fuzzy_match(Politician.name),
+        "party": ListFilter(lambda v: Politician.party == v),
+        "country": ListFilter(lambda v: Politician.country == v),
+        "state_province": ListFilter(lambda v: Politician.state_province == v),
+    }
+
+    # Related collections of the details response: CRUD of the related
+    # records, name of its filter selecting a politician's records, and
+    # item schema
+    detail_collections = {
+        "votes": (vote, "politician_id", VoteSchema),
+        "sponsored_bills": (bill, "sponsor_id", BillSchema),
+        "contributions": (contribution, "politician_id", ContributionSchema),
+    }
+
+    async def get_with_relations(
+        self,
+        db: AsyncSession,
+        id: UUID,
+        collections: Optional[Dict[str, CollectionParams]] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
         """
-        Get a politician by ID with related data (votes, bills, contributions).
+        Get a politician by ID with one page of each related collection.
+
+        Each collection is loaded with its own keyset-paginated list query
+        (top N rows of the politician, by sort key) and reports its total,
+        counted by that query rather than taken from the count cache, and
+        the cursor of its next page.
 
         Args:
             db: Database session
             id: UUID of the politician
+            collections: Pagination of each collection by name, defaults
+                to the first page in default order
+            fields: Names of the `PoliticianDetail` columns and collections
+                to include, None for all; "collections" is included with
+                the entries of the included collections
 
         Returns:
-            Politician with related data, or None if not found
+            Dictionary with the `PoliticianDetail` fields, or None if not found
+
+        Raises:
+            PaginationError: If a sort order or cursor is invalid
         """
-        query = (
-            select(Politician)
-            .options(
-                selectinload(Politician.votes),
-                selectinload(Politician.sponsored_bills),
-                selectinload(Politician.contributions)
+        columns, included = self._detail_fields(fields)
+        db_obj = await self.get(db, id, columns=columns)
+        if db_obj is None:
+            return None
+
+        if columns is None:
+            details = db_obj.to_dict()
+        else:
+            details = {name: getattr(db_obj, name) for name in columns}
+        if included:
+            details["collections"] = {}
+        for name in included:
+            crud, foreign_key, _ = self.detail_collections[name]
+            params = (collections or {}).get(name) or CollectionParams()
+            page = await crud.get_page(
+                db,
+                limit=params.limit,
+                cursor=params.cursor,
+                sort=params.sort,
+                filters={foreign_key: id},
+                # Counted with the page, like the totals of `get_details_json`
+                cache_total=False,
             )
-            .where(Politician.id == id)
+            details[name] = page.items
+            details["collections"][name] = {
+                "total": page.total,
+                "size": params.limit,
+                "next_cursor": page.next_cursor,
+            }
+        return details
+
+    def _detail_fields(
+        self, fields: Optional[Sequence[str]]
+    ) -> Tuple[Optional[List[str]], List[str]]:
+        """Split `PoliticianDetail` field names into columns (None for all) and collections."""
+        if fields is None:
+            return None, list(self.detail_collections)
+        columns = [name for name in fields if name in Politician.__table__.columns]
+        return columns, [name for name in self.detail_collections if name in fields]
+
+    async def get_details_json(
+        self,
+        db: AsyncSession,
+        id: UUID,
+        collections: Optional[Dict[str, CollectionParams]] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Optional[str]:
+        """
+        Get a politician with related data as JSON rendered by PostgreSQL.
+
+        One statement builds the whole `PoliticianDetail` document: each
+        collection page is a top-N lateral subquery over the politician,
+        aggregated together with its cursor, next to a count of the whole
+        collection. No ORM objects or pydantic models are created.
+
+        Args:
+            db: Database session
+            id: UUID of the politician
+            collections: Pagination of each collection by name, defaults
+                to the first page in default order
+            fields: Names of the columns and collections to include, as
+                for `get_with_relations`
+
+        Returns:
+            The JSON document, or None if not found
+
+        Raises:
+            PaginationError: If a sort order or cursor is invalid
+        """
+        columns, included = self._detail_fields(fields)
+        shape = []
+        params: Dict[str, Any] = {"id": id}
+        for name in included:
+            crud = self.detail_collections[name][0]
+            page = (collections or {}).get(name) or CollectionParams()
+            sort, sort_columns, _ = crud.resolve_sort(page.sort)
+            if page.cursor:
+                for i, value in enumerate(decode_cursor(page.cursor, sort, sort_columns)):
+                    params[f"{name}_cursor_{i}"] = value
+            params[f"{name}_limit"] = page.limit
+            shape.append((name, sort, bool(page.cursor)))
+
+        statement = self._details_json_statement(
+            tuple(columns) if columns is not None else None, tuple(shape)
         )
-        result = await db.execute(query)
-        return result.scalars().first()
+        result = await db.execute(statement, params)
+        return result.scalar_one_or_none()
+
+    def _details_json_statement(
+        self,
+        columns: Optional[Tuple[str, ...]],
+        shape: Tuple[Tuple[str, str, bool], ...],
+    ) -> Select:
+        """
+        Get the `get_details_json` statement for the included columns (None
+        for all) and a (collection, sort, keyset) shape per included collection.
+        """
+        key = ("details_json", columns, shape)
+        statement = self._page_statements.get(key)
+        if statement is not None:
+            return statement
+
+        nested = {}
+        pages = {}
+        collection_pages = []
+        for name, sort, keyset in shape:
+            crud, foreign_key, schema = self.detail_collections[name]
+            model = crud.model
+            sort, sort_columns, descending = crud.resolve_sort(sort)
+            criterion = crud.filters[foreign_key].criterion(Politician.id)
+            limit = bindparam(f"{name}_limit", type_=Integer)
+
+            rows = select(
+                json_object(schema, model).label("json"),
+                *(column.label(f"key_{i}") for i, column in enumerate(sort_columns)),
+            ).where(criterion).correlate(Politician)
+            if keyset:
+                bound = tuple_(
+                    *(bindparam(f"{name}_cursor_{i}", type_=c.type) for i, c in enumerate(sort_columns))
+                )
+                key_columns = tuple_(*sort_columns)
+                rows = rows.where(key_columns < bound if descending else key_columns > bound)
+            order = [c.desc() if descending else c.asc() for c in sort_columns]
+            rows = rows.order_by(*order).limit(limit).subquery(f"{name}_rows")
+
+            keys = [rows.c[f"key_{i}"] for i in range(len(sort_columns))]
+            last = [
+                func.array_agg(
+                    aggregate_order_by(k, *(k.asc() if descending else k.desc() for k in keys)),
+                    type_=ARRAY(k.type),
+                )[1].label(f"last_{i}")
+                for i, k in enumerate(keys)
+            ]
+            page = (
+                select(
+                    json_array(
+                        rows.c.json, order_by=[k.desc() if descending else k.asc() for k in keys]
+                    ).label("json"),
+                    func.count().label("size"),
+                    *last,
+                )
+                .select_from(rows)
+                .lateral(name)
+            )
+            total = select(func.count()).select_from(model).where(criterion).scalar_subquery()
+            next_cursor = case(
+                (page.c.size == limit, json_cursor(sort, [page.c[f"last_{i}"] for i in range(len(keys))]))
+            )
+
+            pages[name] = page
+            nested[name] = page.c.json
+            collection_pages.append(
+                (
+                    name,
+                    json_fields(
+                        [
+                            ("total", json_value(total, int)),
+                            ("size", json_value(limit, int)),
+                            ("next_cursor", json_value(next_cursor, Optional[str])),
+                        ]
+                    ),
+                )
+            )
+        fields = None
+        if columns is not None:
+            fields = columns + tuple(pages)
+        if collection_pages:
+            nested["collections"] = json_fields(collection_pages)
+            if fields is not None:
+                fields += ("collections",)
+
+        document = json_object(PoliticianDetail, Politician, nested=nested, fields=fields)
+        statement = select(document).select_from(Politician)
+        for page in pages.values():
+            statement = statement.outerjoin(page, true())
+        statement = statement.where(Politician.id == bindparam("id"))
+
+        self._page_statements[key] = statement
+        return statement
 
     async def get_by_filters(
         self,
@@ -42,6 +266,8 @@ class CRUDPolitician(CRUDBase[Politician, PoliticianCreate, PoliticianUpdate]):
         *,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
         name: Optional[str] = None,
         party: Optional[str] = None,
         country: Optional[str] = None,
@@ -54,6 +280,8 @@ class CRUDPolitician(CRUDBase[Politician, PoliticianCreate, PoliticianUpdate]):
             db: Database session
             skip: Number of records to skip
             limit: Maximum number of records to return
+            cursor: Keyset pagination cursor (takes precedence over skip)
+            sort: Sort order name
             name: Filter by name (case-insensitive, partial match)
             party: Filter by party (exact match)
             country: Filter by country (exact match)
@@ -62,23 +290,21 @@ class CRUDPolitician(CRUDBase[Politician, PoliticianCreate, PoliticianUpdate]):
         Returns:
             List of filtered politicians
         """
-        query = select(Politician)
-
-        # Apply filters
-        if name:
-            query = query.filter(Politician.name.ilike(f"%{name}%"))
-        if party:
-            query = query.filter(Politician.party == party)
-        if country:
-            query = query.filter(Politician.country == country)
-        if state_province:
-            query = query.filter(Politician.state_province == state_province)
-
-        # Apply pagination
-        query = query.offset(skip).limit(limit)
-
-        result = await db.execute(query)
-        return result.scalars().all()
+        page = await self.get_page(
+            db,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            filters={
+                "name": name or None,
+                "party": party or None,
+                "country": country or None,
+                "state_province": state_province or None,
+            },
+            count_mode="none",
+        )
+        return page.items
 
     async def get_with_contribution_stats(
         self, db: AsyncSession, id: UUID
@@ -0,0 +1,136 @@
+from typing import Any, Dict, List
+
+from sqlalchemy import delete, distinct, func, insert, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase, ListFilter
+from app.models.politician import Politician
+from app.models.politician_vote_stats import politician_bill_votes, politician_vote_stats
+from app.models.vote import Vote
+from app.schemas.vote.vote import VoteCreate, VoteUpdate
+
+STATISTICS_COLUMNS = ("total_votes", "yea_votes", "nay_votes", "bills_voted")
+
+
+class CRUDVote(CRUDBase[Vote, VoteCreate, VoteUpdate]):
+    """CRUD operations for votes."""
+
+    sort_keys = {
+        "vote_date": ("vote_date", "id"),
+        "created_at": ("created_at", "id"),
+    }
+    default_sort = "-vote_date"
+
+    filters = {
+        "politician_id": ListFilter(lambda v: Vote.politician_id == v),
+        "bill_id": ListFilter(lambda v: Vote.bill_id == v),
+        "vote_position": ListFilter(lambda v: Vote.vote_position == v),
+        "vote_result": ListFilter(lambda v: Vote.vote_result == v),
+        "from_date": ListFilter(lambda v: Vote.vote_date >= v),
+        "to_date": ListFilter(lambda v: Vote.vote_date <= v),
+    }
+
+    async def statistics_by_politician(self, db: AsyncSession, *, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get the politicians with the most votes and their vote counts.
+
+        Reads the trigger-maintained `politician_vote_stats` table, so the
+        cost is a top-N index scan whatever the size of `vote`.
+
+        Args:
+            db: Database session
+            limit: Number of politicians to return
+
+        Returns:
+            Rows with the politician's id, name and party and their counts
+        """
+        stats = politician_vote_stats.c
+        query = (
+            select(Politician.id, Politician.name, Politician.party, *(stats[name] for name in STATISTICS_COLUMNS))
+            .join(Politician, Politician.id == stats.politician_id)
+            .where(stats.total_votes > 0)
+            .order_by(stats.total_votes.desc(), stats.politician_id.desc())
+            .limit(limit)
+        )
+        result = await db.execute(query)
+        return [dict(row) for row in result.mappings()]
+
+    async def rebuild_statistics(self, db: AsyncSession, *, check: bool = False) -> int:
+        """
+        Recompute `politician_vote_stats` and `politician_bill_votes` from scratch.
+
+        Vote writes are blocked while the statistics are recomputed, so the
+        triggers continue from a consistent state.
+
+        Args:
+            db: Database session; committed unless `check` is set
+            check: Only compare the tables with a fresh count, do not write
+
+        Returns:
+            Number of rows (politicians and politician/bill pairs) whose
+            stored counts differed
+        """
+        fresh = (
+            select(
+                Vote.politician_id,
+                func.count().label("total_votes"),
+                func.count().filter(Vote.vote_position == "yea").label("yea_votes"),
+                func.count().filter(Vote.vote_position == "nay").label("nay_votes"),
+                func.count(distinct(Vote.bill_id)).label("bills_voted"),
+            )
+            .group_by(Vote.politician_id)
+            .cte("fresh")
+        )
+        stored = politician_vote_stats.c
+        differs = or_(
+            *(
+                func.coalesce(fresh.c[name], 0) != func.coalesce(stored[name], 0)
+                for name in STATISTICS_COLUMNS
+            )
+        )
+        mismatches = (
+            select(func.count())
+            .select_from(fresh.join(politician_vote_stats, fresh.c.politician_id == stored.politician_id, full=True))
+            .where(differs)
+        )
+
+        fresh_pairs = (
+            select(Vote.politician_id, Vote.bill_id, func.count().label("votes"))
+            .group_by(Vote.politician_id, Vote.bill_id)
+            .cte("fresh_pairs")
+        )
+        pairs = politician_bill_votes.c
+        pair_mismatches = (
+            select(func.count())
+            .select_from(
+                fresh_pairs.join(
+                    politician_bill_votes,
+                    (fresh_pairs.c.politician_id == pairs.politician_id) & (fresh_pairs.c.bill_id == pairs.bill_id),
+                    full=True,
+                )
+            )
+            .where(func.coalesce(fresh_pairs.c.votes, 0) != func.coalesce(pairs.votes, 0))
+        )
+
+        await db.execute(text("LOCK TABLE vote IN SHARE MODE"))
+        differing = (await db.execute(mismatches)).scalar_one() + (await db.execute(pair_mismatches)).scalar_one()
+        if check:
+            await db.rollback()
+            return differing
+
+        await db.execute(delete(politician_bill_votes))
+        await db.execute(
+            insert(politician_bill_votes).from_select(["politician_id", "bill_id", "votes"], select(fresh_pairs))
+        )
+        await db.execute(delete(politician_vote_stats))
+        await db.execute(
+            insert(politician_vote_stats).from_select(
+                ["politician_id", *STATISTICS_COLUMNS],
+                select(fresh),
+            )
+        )
+        await db.commit()
+        return differing
+
+
+vote = CRUDVote(Vote)
@@ -0,0 +1,170 @@
+"""
+JSON documents rendered by PostgreSQL.
+
+Builds SQL expressions producing the JSON text of a pydantic schema, in
+exactly the bytes FastAPI would send for it: fields in schema order,
+compact separators, and the same value formats (UTC datetimes with a "Z"
+suffix and microseconds only when non-zero, dates in datetime fields as
+naive midnight datetimes, NUMERIC in float fields as Python floats).
+The API can then pass the text through without parsing or validating it.
+
+`HttpUrl` fields are rendered as stored; values written through the API
+are already normalized by pydantic on the way in.
+"""
+import datetime
+import json
+import types
+from typing import (
+    Any, Dict, Iterable, Optional, Sequence, Tuple, Type, Union, get_args, get_origin
+)
+
+from pydantic import BaseModel
+from sqlalchemy import Date, DateTime, Numeric, Text, case, cast, func, literal_column
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION, aggregate_order_by
+from sqlalchemy.sql import ColumnElement
+
+# to_char patterns; "US" is always six digits, trimmed below when zero
+_TIMESTAMP_FORMAT = 'YYYY-MM-DD"T"HH24:MI:SS.US'
+_DATE_AS_DATETIME_FORMAT = 'YYYY-MM-DD"T00:00:00"'
+
+
+def _const(value: str) -> ColumnElement:
+    """An inline SQL string constant (no bind parameter, so the statement is fixed)."""
+    return literal_column("'" + value.replace("'", "''") + "'", Text)
+
+
+def _base_annotation(annotation: Any) -> Any:
+    """Strip Optional[...] from a field annotation."""
+    if get_origin(annotation) in (Union, getattr(types, "UnionType", Union)):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _timestamp_text(column: Any, suffix: str) -> ColumnElement:
+    """ISO 8601 text of a timestamptz in UTC, microseconds only when non-zero."""
+    text = func.to_char(func.timezone(_const("UTC"), column), _const(_TIMESTAMP_FORMAT))
+    return func.regexp_replace(text, _const(r"\.000000$"), _const("")).op("||")(_const(suffix))
+
+
+def json_value(column: Any, annotation: Any) -> ColumnElement:
+    """
+    JSON text of a column value serialized as a schema field.
+
+    Args:
+        column: Column (or expression) holding the value
+        annotation: Annotation of the schema field
+
+    Returns:
+        Text expression, 'null' for NULL values
+    """
+    annotation = _base_annotation(annotation)
+    column_type = column.type
+    value = column
+    if annotation is datetime.datetime and isinstance(column_type, DateTime):
+        value = _timestamp_text(column, "Z")
+    elif annotation is datetime.datetime and isinstance(column_type, Date):
+        value = func.to_char(column, _const(_DATE_AS_DATETIME_FORMAT))
+    elif annotation is float and isinstance(column_type, Numeric):
+        # float8 text is the shortest round-trip form, like Python's repr,
+        # which also keeps a ".0" on whole numbers
+        number = cast(cast(column, DOUBLE_PRECISION), Text)
+        whole = case((column == func.trunc(column), number.op("||")(_const(".0"))), else_=number)
+        return func.coalesce(whole, _const("null"))
+    return func.coalesce(cast(func.to_json(value), Text), _const("null"))
+
+
+def json_object(
+    schema: Type[BaseModel],
+    source: Any,
+    nested: Optional[Dict[str, ColumnElement]] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> ColumnElement:
+    """
+    JSON text of one object of a schema.
+
+    Args:
+        schema: Schema whose fields are rendered, in order
+        source: Model class (or aliased class) providing the field columns
+        nested: Already rendered JSON text for fields that are not columns,
+            such as related collections
+        fields: Names of the only fields to render, None for all
+
+    Returns:
+        Text expression with the JSON object
+    """
+    nested = nested or {}
+    return json_fields(
+        (name, nested[name] if name in nested else json_value(getattr(source, name), field.annotation))
+        for name, field in schema.model_fields.items()
+        if fields is None or name in fields
+    )
+
+
+def json_fields(fields: Iterable[Tuple[str, ColumnElement]]) -> ColumnElement:
+    """
+    JSON text of an object from already rendered field values.
+
+    Args:
+        fields: Pairs of (field name, text expression with the JSON value)
+
+    Returns:
+        Text expression with the JSON object
+    """
+    parts = []
+    for i, (name, value) in enumerate(fields):
+        parts.append(_const(("{" if i == 0 else ",") + json.dumps(name) + ":"))
+        parts.append(value)
+    if not parts:
+        return _const("{}")
+    parts.append(_const("}"))
+    return func.concat(*parts, type_=Text)
+
+
+def json_array(element: ColumnElement, order_by: Sequence[Any] = ()) -> ColumnElement:
+    """
+    Aggregate JSON text elements into a JSON array ('[]' when empty).
+
+    Args:
+        element: Text expression with the JSON of one element
+        order_by: Order of the elements in the array
+
+    Returns:
+        Text expression with the JSON array
+    """
+    separator = aggregate_order_by(_const(","), *order_by) if order_by else _const(",")
+    elements = func.string_agg(element, separator, type_=Text)
+    return func.coalesce(_const("[").op("||")(elements).op("||")(_const("]")), _const("[]"))
+
+
+def cursor(sort: str, columns: Sequence[Any]) -> ColumnElement:
+    """
+    Pagination cursor text, as `app.crud.base.encode_cursor` builds it.
+
+    Args:
+        sort: Name of the sort order the cursor belongs to
+        columns: Sort key values (columns or expressions) of the last row
+
+    Returns:
+        Text expression with the URL-safe base64 cursor
+    """
+    values = []
+    for column in columns:
+        if isinstance(column.type, DateTime):
+            text = _timestamp_text(column, "+00:00")
+        elif isinstance(column.type, Date):
+            text = func.to_char(column, _const("YYYY-MM-DD"))
+        else:
+            text = cast(column, Text)
+        values.append(cast(func.to_json(text), Text))
+    payload = [_const('{"s":' + json.dumps(sort, ensure_ascii=False) + ',"k":[')]
+    for i, value in enumerate(values):
+        if i:
+            payload.append(_const(","))
+        payload.append(value)
+    payload.append(_const("]}"))
+    encoded = func.encode(func.convert_to(func.concat(*payload, type_=Text), _const("UTF8")), _const("base64"))
+    # base64 output wraps lines every 76 characters; drop the newlines
+    urlsafe = func.translate(encoded, literal_column("E'+/\\n'", Text), _const("-_"), type_=Text)
+    return func.rtrim(urlsafe, _const("="), type_=Text)
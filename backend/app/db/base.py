@@ -5,3 +5,6 @@ from app.models.politician import Politician  # noqa
 from app.models.bill import Bill  # noqa
 from app.models.vote import Vote  # noqa
 from app.models.political_contribution import PoliticalContribution  # noqa
+from app.models.politician_vote_stats import politician_bill_votes, politician_vote_stats  # noqa
+from app.models.contributor_totals import contributor_monthly_totals, contributor_politician_totals, contributor_totals  # noqa
+from app.models.materialized_views import materialized_view_refresh  # noqa
@@ -28,7 +28,6 @@ class Base(DeclarativeBase):
         PgUUID(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
-        index=True,
     )
 
     created_at: Mapped[datetime] = mapped_column(
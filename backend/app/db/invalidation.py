@@ -0,0 +1,195 @@
+"""
+Cross-process cache invalidation over PostgreSQL LISTEN/NOTIFY.
+
+Every write publishes a compact message naming the table, the row id (when
+a single row was written) and the publishing process on a NOTIFY channel.
+Each worker keeps one dedicated connection LISTENing on that channel and
+drops the affected entries from its own caches, so all workers stop serving
+stale data within moments of a commit, without an external broker.
+
+Messages published inside a transaction are only delivered if it commits,
+in commit order: two writes of a process may arrive in the opposite order
+to the one they were published in, and each is applied whatever the order.
+"""
+import asyncio
+import json
+import logging
+import os
+import uuid
+from typing import Any, Dict, Optional
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import clear_all, invalidate_table
+from app.core.config import settings
+from app.db.session import raw_connection
+
+logger = logging.getLogger(__name__)
+
+# Identifies this process, so it can ignore its own messages
+ORIGIN = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+_NOTIFY = "SELECT pg_notify(:channel, :payload)"
+
+
+def message(table: str, id: Optional[Any] = None) -> str:
+    """
+    Build an invalidation message.
+
+    Args:
+        table: Name of the written table
+        id: Id of the written row, None for writes to many rows
+
+    Returns:
+        JSON payload (well below the 8000 byte NOTIFY limit)
+    """
+    payload = {"t": table, "i": str(id) if id is not None else None, "o": ORIGIN}
+    return json.dumps(payload, separators=(",", ":"))
+
+
+async def publish(db: AsyncSession, table: str, id: Optional[Any] = None) -> None:
+    """
+    Queue an invalidation message in the session's current transaction.
+
+    The message is delivered when the transaction commits, and never if
+    it rolls back.
+
+    Args:
+        db: Session performing the write
+        table: Name of the written table
+        id: Id of the written row, None for writes to many rows
+    """
+    await db.execute(
+        text(_NOTIFY),
+        {"channel": settings.CACHE_INVALIDATION_CHANNEL, "payload": message(table, id)},
+    )
+
+
+async def publish_now(table: str, id: Optional[Any] = None) -> None:
+    """
+    Send an invalidation message right away, on a pooled connection.
+
+    For writes that do not go through a session, such as COPY loads.
+
+    Args:
+        table: Name of the written table
+        id: Id of the written row, None for writes to many rows
+    """
+    async with raw_connection() as conn:
+        await conn.execute(
+            "SELECT pg_notify($1, $2)",
+            settings.CACHE_INVALIDATION_CHANNEL,
+            message(table, id),
+        )
+
+
+class InvalidationListener:
+    """
+    Applies invalidation messages from other processes to the local caches.
+
+    Runs as a background task holding one dedicated (non-pooled) connection.
+    When the connection is lost it reconnects with backoff and clears the
+    whole cache, since messages sent in between were missed.
+    """
+
+    def __init__(self, dsn: str, channel: str):
+        self.dsn = dsn
+        self.channel = channel
+        self.received = 0
+        self.applied = 0
+        self._task: Optional[asyncio.Task] = None
+        self._lost: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        """Start listening in a background task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop listening and close the connection."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def handle(self, payload: str) -> None:
+        """
+        Apply one invalidation message.
+
+        Args:
+            payload: Message built by `message`
+        """
+        self.received += 1
+        try:
+            data = json.loads(payload)
+            origin, table, id = data["o"], data["t"], data.get("i")
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed cache invalidation message: %r", payload)
+            return
+        if origin == ORIGIN:
+            # Already invalidated locally when the write committed
+            return
+        invalidate_table(table, id)
+        self.applied += 1
+
+    def _on_notification(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        self.handle(payload)
+
+    def _on_termination(self, connection: Any) -> None:
+        if self._lost is not None:
+            self._lost.set()
+
+    async def _run(self) -> None:
+        delay = 1.0
+        first = True
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(self.dsn)
+                self._lost = asyncio.Event()
+                conn.add_termination_listener(self._on_termination)
+                await conn.add_listener(self.channel, self._on_notification)
+                if not first:
+                    # Messages may have been missed while disconnected
+                    clear_all()
+                first = False
+                delay = 1.0
+                logger.info("Listening for cache invalidations on '%s'", self.channel)
+                await self._lost.wait()
+                logger.warning("Cache invalidation listener connection lost")
+            except asyncio.CancelledError:
+                raise
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                # InterfaceError: the connection was closed under the listener
+                logger.warning("Cache invalidation listener connection failed: %s", e)
+                first = False
+            finally:
+                if conn is not None and not conn.is_closed():
+                    try:
+                        await conn.close()
+                    except (OSError, asyncpg.InterfaceError):
+                        conn.terminate()
+            logger.info("Reconnecting the cache invalidation listener in %.0fs", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the listener counters."""
+        return {
+            "origin": ORIGIN,
+            "channel": self.channel,
+            "running": self._task is not None and not self._task.done(),
+            "received": self.received,
+            "applied": self.applied,
+        }
+
+
+invalidation_listener = InvalidationListener(
+    str(settings.DATABASE_URL).replace("+asyncpg", ""),
+    settings.CACHE_INVALIDATION_CHANNEL,
+)
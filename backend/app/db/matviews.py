@@ -0,0 +1,183 @@
+"""
+Scheduled refresh of materialized views.
+
+Analytical aggregates that may be a few minutes stale are served from
+materialized views, created by migrations with `op.create_materialized_view`
+and listed in `MATERIALIZED_VIEWS` with their refresh interval.
+
+Every worker process runs a `MaterializedViewRefresher`. When a view is
+due, the worker takes a transaction-level advisory lock for it, checks in
+`materialized_view_refresh` that no other worker refreshed it within the
+interval, and runs `REFRESH MATERIALIZED VIEW CONCURRENTLY`, which does not
+block readers. The refresh time and duration (or the error) are recorded
+in the same table, so all workers share one schedule and at most one of
+them refreshes a view per interval.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+from app.core.cache import invalidate_table
+from app.core.config import settings
+from app.db.invalidation import publish_now
+from app.db.session import raw_connection
+from app.models.materialized_views import party_contributions_monthly
+
+logger = logging.getLogger(__name__)
+
+# First key of the two-key advisory locks taken for refreshes ("mv")
+LOCK_CLASS = 0x6D76
+
+
+@dataclass(frozen=True)
+class ScheduledView:
+    """A materialized view and how often to refresh it."""
+
+    name: str
+    interval: float
+
+    @property
+    def refresh_interval(self) -> float:
+        """Interval in seconds, from MATVIEW_REFRESH_INTERVALS if set there."""
+        return settings.MATVIEW_REFRESH_INTERVALS.get(self.name, self.interval)
+
+
+MATERIALIZED_VIEWS: Dict[str, ScheduledView] = {
+    view.name: view
+    for view in (
+        ScheduledView(party_contributions_monthly.name, interval=300.0),
+    )
+}
+
+_LOCK = "SELECT pg_try_advisory_xact_lock($1, hashtext($2))"
+
+# Seconds until the view is due, NULL if it never was refreshed
+_REMAINING = """
+SELECT extract(epoch FROM refreshed_at - now())::float8 + $2::float8
+FROM materialized_view_refresh
+WHERE view_name = $1
+"""
+
+_RECORD_REFRESH = """
+INSERT INTO materialized_view_refresh (view_name, refreshed_at, duration_ms)
+VALUES ($1, now(), $2::float8)
+ON CONFLICT (view_name) DO UPDATE SET
+    refreshed_at = excluded.refreshed_at,
+    duration_ms = excluded.duration_ms
+"""
+
+_RECORD_ERROR = """
+INSERT INTO materialized_view_refresh (view_name, last_error, last_error_at)
+VALUES ($1, $2, now())
+ON CONFLICT (view_name) DO UPDATE SET
+    last_error = excluded.last_error,
+    last_error_at = excluded.last_error_at
+"""
+
+
+async def refresh_view(conn: Any, name: str, interval: float) -> Optional[float]:
+    """
+    Refresh a materialized view unless it is fresh or being refreshed.
+
+    Args:
+        conn: asyncpg connection, not in a transaction
+        name: Name of the view
+        interval: Seconds a refresh stays fresh; 0 to refresh regardless
+
+    Returns:
+        Seconds until the view is due again if it was skipped, None if it
+        was refreshed
+    """
+    async with conn.transaction():
+        if not await conn.fetchval(_LOCK, LOCK_CLASS, name):
+            # Another worker is refreshing it right now
+            return interval
+        remaining = await conn.fetchval(_REMAINING, name, interval)
+        if remaining is not None and remaining > 0:
+            return float(remaining)
+
+        started = time.perf_counter()
+        await conn.execute(f'REFRESH MATERIALIZED VIEW CONCURRENTLY "{name}"')
+        duration_ms = (time.perf_counter() - started) * 1000
+        await conn.execute(_RECORD_REFRESH, name, duration_ms)
+
+    logger.info("Refreshed materialized view %s in %.0f ms", name, duration_ms)
+    return None
+
+
+class MaterializedViewRefresher:
+    """
+    Refreshes materialized views on their intervals, in a background task.
+
+    Cached responses tagged with a view's name are invalidated after each
+    refresh, in this process and in the others.
+    """
+
+    def __init__(self, views: Iterable[ScheduledView]):
+        self.views = list(views)
+        self.refreshed = 0
+        self.failed = 0
+        self._due: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start refreshing in a background task."""
+        if self._task is None and self.views:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop refreshing; a refresh in progress is rolled back."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def refresh(self, view: ScheduledView) -> None:
+        """Refresh one view if it is due, and schedule its next check."""
+        interval = view.refresh_interval
+        try:
+            async with raw_connection() as conn:
+                remaining = await refresh_view(conn, view.name, interval)
+                if remaining is None:
+                    self.refreshed += 1
+                    invalidate_table(view.name)
+                    await publish_now(view.name)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed += 1
+            remaining = interval
+            logger.warning("Refreshing materialized view %s failed: %s", view.name, e)
+            try:
+                async with raw_connection() as conn:
+                    await conn.execute(_RECORD_ERROR, view.name, str(e))
+            except Exception:
+                logger.exception("Cannot record the refresh error of %s", view.name)
+        self._due[view.name] = time.monotonic() + (interval if remaining is None else remaining)
+
+    async def _run(self) -> None:
+        while True:
+            for view in self.views:
+                if self._due.get(view.name, 0.0) <= time.monotonic():
+                    await self.refresh(view)
+            await asyncio.sleep(max(1.0, min(self._due.values()) - time.monotonic()))
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the refresher counters and when each view is checked next."""
+        now = time.monotonic()
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "refreshed": self.refreshed,
+            "failed": self.failed,
+            "next_check_in": {
+                name: round(max(0.0, due - now), 1) for name, due in self._due.items()
+            },
+        }
+
+
+matview_refresher = MaterializedViewRefresher(MATERIALIZED_VIEWS.values())
@@ -0,0 +1,105 @@
+"""
+Alembic operations for materialized views.
+
+Imported by `alembic/env.py`, which makes them available to migrations:
+
+    op.create_materialized_view(
+        "mv_example",
+        "SELECT party, count(*) AS politicians FROM politician GROUP BY party",
+        unique=["party"],
+        indexes=[["politicians"]],
+    )
+
+Every view gets a unique index, which `REFRESH MATERIALIZED VIEW
+CONCURRENTLY` requires (plain column names, no WHERE clause); the other
+indexes serve the endpoints reading the view.
+"""
+from typing import Optional, Sequence
+
+from alembic.operations import MigrateOperation, Operations
+
+
+def unique_index_name(view: str) -> str:
+    """Name of the unique index of a materialized view."""
+    return f"uq_{view}"
+
+
+@Operations.register_operation("create_materialized_view")
+class CreateMaterializedViewOp(MigrateOperation):
+    """Create a populated materialized view with its indexes."""
+
+    def __init__(
+        self,
+        name: str,
+        query: str,
+        unique: Sequence[str],
+        indexes: Sequence[Sequence[str]] = (),
+    ):
+        self.name = name
+        self.query = query
+        self.unique = list(unique)
+        self.indexes = [list(columns) for columns in indexes]
+
+    @classmethod
+    def create_materialized_view(
+        cls,
+        operations: Operations,
+        name: str,
+        query: str,
+        *,
+        unique: Sequence[str],
+        indexes: Sequence[Sequence[str]] = (),
+    ) -> None:
+        """
+        Create a materialized view.
+
+        Args:
+            name: Name of the view
+            query: SELECT statement defining the view
+            unique: Columns identifying a row, for the unique index
+            indexes: Column lists of further indexes
+        """
+        return operations.invoke(cls(name, query, unique, indexes))
+
+    def reverse(self) -> "DropMaterializedViewOp":
+        return DropMaterializedViewOp(self.name, self)
+
+
+@Operations.register_operation("drop_materialized_view")
+class DropMaterializedViewOp(MigrateOperation):
+    """Drop a materialized view (its indexes go with it)."""
+
+    def __init__(self, name: str, created: Optional[CreateMaterializedViewOp] = None):
+        self.name = name
+        self.created = created
+
+    @classmethod
+    def drop_materialized_view(cls, operations: Operations, name: str) -> None:
+        """
+        Drop a materialized view.
+
+        Args:
+            name: Name of the view
+        """
+        return operations.invoke(cls(name))
+
+    def reverse(self) -> CreateMaterializedViewOp:
+        if self.created is None:
+            raise ValueError(f"Cannot reverse dropping {self.name}: its definition is unknown")
+        return self.created
+
+
+@Operations.implementation_for(CreateMaterializedViewOp)
+def create_materialized_view(operations: Operations, operation: CreateMaterializedViewOp) -> None:
+    name = operation.name
+    operations.execute(f"CREATE MATERIALIZED VIEW {name} AS {operation.query} WITH DATA")
+    operations.execute(
+        f"CREATE UNIQUE INDEX {unique_index_name(name)} ON {name} ({', '.join(operation.unique)})"
+    )
+    for columns in operation.indexes:
+        operations.execute(f"CREATE INDEX ix_{name}_{'_'.join(columns)} ON {name} ({', '.join(columns)})")
+
+
+@Operations.implementation_for(DropMaterializedViewOp)
+def drop_materialized_view(operations: Operations, operation: DropMaterializedViewOp) -> None:
+    operations.execute(f"DROP MATERIALIZED VIEW IF EXISTS {operation.name}")
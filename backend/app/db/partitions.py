@@ -0,0 +1,120 @@
+"""
+Yearly partitions of `political_contribution`.
+
+The table is range-partitioned by `contribution_date`: one partition per
+year (`political_contribution_y2024`, from January 1st to the next one) and
+a DEFAULT partition for dates no yearly partition covers. Filters on the
+date (`from_date`/`to_date` of the contribution list) only scan the
+partitions of the years they span.
+
+Partitions are created by the `ensure_contribution_partitions(first_year,
+last_year)` SQL function of migration 0010, which also moves the rows of a
+new year out of the default partition. Every worker process runs a
+`PartitionMaintainer`, which calls it at startup and then daily so the
+current year and the next PARTITION_YEARS_AHEAD ones always exist; an
+advisory lock keeps the workers from doing so at the same time.
+"""
+import asyncio
+import logging
+import time
+from datetime import date
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.db.session import raw_connection
+
+logger = logging.getLogger(__name__)
+
+# First key of the two-key advisory lock taken to create partitions ("pt")
+LOCK_CLASS = 0x7074
+
+PARTITIONED_TABLE = "political_contribution"
+
+_LOCK = "SELECT pg_try_advisory_xact_lock($1, hashtext($2))"
+
+_ENSURE = "SELECT ensure_contribution_partitions($1::int, $2::int)"
+
+
+async def ensure_partitions(conn: Any, first_year: int, last_year: int) -> Optional[int]:
+    """
+    Create the missing yearly partitions between two years.
+
+    Creating a partition briefly locks the table; the lock is not waited
+    for longer than a few seconds, so queued queries are not held up.
+
+    Args:
+        conn: asyncpg connection, not in a transaction
+        first_year: First year that needs a partition
+        last_year: Last year that needs a partition
+
+    Returns:
+        Number of partitions created, None if another worker holds the lock
+    """
+    async with conn.transaction():
+        if not await conn.fetchval(_LOCK, LOCK_CLASS, PARTITIONED_TABLE):
+            return None
+        await conn.execute("SET LOCAL lock_timeout = '5s'")
+        created = await conn.fetchval(_ENSURE, first_year, last_year)
+
+    if created:
+        logger.info("Created %d partitions of %s up to %d", created, PARTITIONED_TABLE, last_year)
+    return created
+
+
+class PartitionMaintainer:
+    """Creates the partitions of the coming years, in a background task."""
+
+    def __init__(self, interval: float, years_ahead: int):
+        self.interval = interval
+        self.years_ahead = years_ahead
+        self.created = 0
+        self.failed = 0
+        self.last_run: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start maintaining in a background task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop maintaining."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def maintain(self) -> None:
+        """Create the partitions of this year and the next ones if missing."""
+        year = date.today().year
+        try:
+            async with raw_connection() as conn:
+                self.created += await ensure_partitions(conn, year, year + self.years_ahead) or 0
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed += 1
+            logger.warning("Creating partitions of %s failed: %s", PARTITIONED_TABLE, e)
+        self.last_run = time.time()
+
+    async def _run(self) -> None:
+        while True:
+            await self.maintain()
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the maintainer counters."""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "created": self.created,
+            "failed": self.failed,
+            "last_run": self.last_run,
+        }
+
+
+partition_maintainer = PartitionMaintainer(
+    settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS, settings.PARTITION_YEARS_AHEAD
+)
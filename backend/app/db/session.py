@@ -1,4 +1,5 @@
-from typing import AsyncGenerator, Generator
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, AsyncIterator, Generator
 import sqlite3
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
@@ -55,6 +56,22 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close()
 
+@asynccontextmanager
+async def raw_connection() -> AsyncIterator[Any]:
+    """
+    Borrow a pooled connection and expose the asyncpg driver connection.
+
+    For operations SQLAlchemy does not wrap, such as COPY. The connection
+    is returned to the pool on exit; transactions must be managed on the
+    asyncpg connection itself.
+
+    Yields:
+        asyncpg.Connection: The underlying driver connection
+    """
+    async with async_engine.connect() as conn:
+        pooled = await conn.get_raw_connection()
+        yield pooled.driver_connection
+
 # For testing and CLI commands that need sync sessions
 def get_sync_db() -> Generator:
     """
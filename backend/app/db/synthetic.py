@@ -0,0 +1,459 @@
+"""
+Deterministic synthetic dataset of realistic size and shape.
+
+Generates politicians, bills, votes and contributions for performance work
+(query plan tests, load tests, local databases). The same preset and seed
+always produce the same rows, IDs included, and the distributions are
+skewed the way the real data is:
+
+- parties follow Zipf weights (a few large parties) and states their
+  population; the first `legislators` politicians are members of congress,
+  who sponsor bills and vote, the others state and municipal politicians;
+- most bills never leave committee; the others reach a roll call, where
+  each legislator shows up according to an attendance rate of their own
+  and votes following the bill's support;
+- donors and recipients of contributions are drawn from Zipf
+  distributions (a few donate, and receive, very often); amounts are
+  log-normal and dates concentrate in election years and in the months
+  before the October elections.
+
+Rows are loaded with binary COPY in batches; the next batch is generated in
+a thread while the database writes the previous one.
+"""
+import asyncio
+import calendar
+import itertools
+import logging
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.db.matviews import MATERIALIZED_VIEWS
+from app.db.partitions import PARTITIONED_TABLE, ensure_partitions
+
+logger = logging.getLogger(__name__)
+
+# Namespace of the generated row ids (uuid5 of seed, table and row number)
+SYNTHETIC_NAMESPACE = uuid.UUID("9b0c3f4e-61d2-4c5a-8e7f-2a4b6c8d0e13")
+
+DEFAULT_SEED = 42
+DEFAULT_BATCH_SIZE = 50000
+PROGRESS_INTERVAL_SECONDS = 5.0
+
+FIRST_YEAR = 2015
+LAST_YEAR = 2024
+
+# Tables in load order, with the columns generated for them
+TABLES: Dict[str, List[str]] = {
+    "politician": [
+        "id", "name", "party", "position", "country", "state_province", "created_at", "updated_at",
+    ],
+    "bill": [
+        "id", "bill_number", "title", "description", "introduced_date", "status", "sponsor_id",
+        "created_at", "updated_at",
+    ],
+    "vote": [
+        "id", "politician_id", "bill_id", "bill_title", "vote_date", "vote_position", "vote_result",
+        "created_at", "updated_at",
+    ],
+    PARTITIONED_TABLE: [
+        "id", "politician_id", "contributor_name", "contributor_type", "amount", "contribution_date",
+        "created_at", "updated_at",
+    ],
+}
+
+# Maintained by triggers while the tables are loaded
+SUMMARY_TABLES = [
+    "politician_vote_stats",
+    "politician_bill_votes",
+    "contributor_totals",
+    "contributor_monthly_totals",
+    "contributor_politician_totals",
+]
+
+FIRST_NAMES = [
+    "Ana", "Antônio", "Beatriz", "Bruno", "Camila", "Carlos", "Daniela", "Diego", "Eduarda", "Eduardo",
+    "Fernanda", "Felipe", "Gabriela", "Gustavo", "Helena", "Henrique", "Isabel", "Igor", "Juliana", "João",
+    "Larissa", "Lucas", "Mariana", "Marcos", "Natália", "Nelson", "Olívia", "Otávio", "Patrícia", "Paulo",
+    "Renata", "Rafael", "Sofia", "Sérgio", "Tatiana", "Tiago", "Vanessa", "Vinícius", "Yasmin", "Wagner",
+]
+SURNAMES = [
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+    "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida", "Lopes", "Soares", "Fernandes", "Vieira", "Barbosa",
+    "Rocha", "Dias", "Nascimento", "Andrade", "Moreira", "Nunes", "Marques", "Machado", "Mendes", "Freitas",
+    "Cardoso", "Ramos", "Gonçalves", "Santana", "Teixeira", "Araújo", "Pinto", "Correia", "Cavalcanti", "Monteiro",
+]
+# By size, largest first (weighted by Zipf)
+PARTIES = [
+    "PL", "PT", "UNIÃO", "PP", "MDB", "PSD", "REPUBLICANOS", "PDT", "PSB", "PSDB",
+    "PSOL", "PODE", "AVANTE", "PSC", "PCdoB", "CIDADANIA", "SOLIDARIEDADE", "PV", "NOVO", "REDE",
+]
+# Share of the population, in percent
+STATES = {
+    "SP": 21.9, "MG": 10.0, "RJ": 7.9, "BA": 6.9, "PR": 5.6, "RS": 5.3, "PE": 4.6, "CE": 4.3, "PA": 4.0,
+    "SC": 3.7, "GO": 3.5, "MA": 3.3, "AM": 1.9, "ES": 1.9, "PB": 1.9, "MT": 1.8, "RN": 1.6, "PI": 1.6,
+    "AL": 1.5, "DF": 1.4, "MS": 1.4, "SE": 1.1, "RO": 0.8, "TO": 0.7, "AC": 0.4, "AP": 0.4, "RR": 0.3,
+}
+POSITIONS = {"Vereador": 85, "Prefeito": 10, "Deputado Estadual": 5}
+FEDERAL_DEPUTIES = 513
+
+BILL_VERBS = ["Dispõe sobre", "Altera a lei de", "Institui a política nacional de", "Regulamenta"]
+BILL_TOPICS = [
+    "educação básica", "saúde pública", "meio ambiente", "segurança pública", "transporte urbano",
+    "energia renovável", "tributação", "agricultura familiar", "previdência social", "habitação",
+    "ciência e tecnologia", "direitos do consumidor",
+]
+STALLED_STATUSES = {"introduced": 3, "in_committee": 6}
+
+COMPANY_KINDS = [
+    "Construtora", "Agropecuária", "Comércio", "Transportes", "Indústria", "Engenharia",
+    "Mineração", "Frigorífico", "Incorporadora", "Distribuidora", "Usina", "Consultoria",
+]
+COMPANY_SUFFIXES = ["Ltda", "S.A.", "Eireli", "ME"]
+
+# Contributions by year (election years: general in 2018 and 2022,
+# municipal in 2016, 2020 and 2024) and by month (elections in October)
+YEAR_WEIGHTS = {year: 6 if year % 2 == 0 else 1 for year in range(FIRST_YEAR, LAST_YEAR + 1)}
+MONTH_WEIGHTS = [1, 1, 1, 1, 1, 2, 3, 8, 12, 6, 1, 1]
+
+# (mu, sigma) of the log-normal contribution amounts by contributor type
+AMOUNTS = {"individual": (5.8, 1.2), "company": (8.0, 1.4), "party": (9.0, 1.3)}
+MAX_AMOUNT = 5_000_000
+
+
+@dataclass(frozen=True)
+class Preset:
+    """Size of a generated dataset."""
+
+    politicians: int
+    legislators: int
+    bills: int
+    votes: int
+    contributions: int
+    donors: int
+
+
+PRESETS: Dict[str, Preset] = {
+    # Enough rows for tests that need some data
+    "tiny": Preset(
+        politicians=500, legislators=100, bills=1_000, votes=20_000, contributions=20_000, donors=2_000
+    ),
+    # Large enough for the planner to prefer indexes (query plan tests)
+    "small": Preset(
+        politicians=12_000, legislators=513, bills=20_000, votes=300_000, contributions=300_000, donors=30_000
+    ),
+    "medium": Preset(
+        politicians=30_000,
+        legislators=594,
+        bills=100_000,
+        votes=3_000_000,
+        contributions=3_000_000,
+        donors=300_000,
+    ),
+    # Congress, state and municipal politicians of a few elections
+    "prod-like": Preset(
+        politicians=60_000,
+        legislators=594,
+        bills=100_000,
+        votes=20_000_000,
+        contributions=20_000_000,
+        donors=2_000_000,
+    ),
+}
+
+
+def zipf_weights(n: int, exponent: float) -> List[float]:
+    """Cumulative Zipf weights of ranks 1 to n, for `random.choices`."""
+    return list(itertools.accumulate(1 / rank ** exponent for rank in range(1, n + 1)))
+
+
+def compose(index: int, *choices: Sequence[str]) -> List[str]:
+    """Pick one word of each list, reading the index as a mixed-radix number."""
+    words = []
+    for options in choices:
+        index, digit = divmod(index, len(options))
+        words.append(options[digit])
+    return words
+
+
+class SyntheticData:
+    """
+    Rows of a synthetic dataset.
+
+    Each table is generated by a random generator of its own, seeded from
+    the dataset seed and the table name. The attributes shared between
+    tables (parties, attendance, bill dates and support) are drawn up front.
+
+    Args:
+        preset: Size of the dataset
+        seed: Seed of every random choice
+
+    Raises:
+        ValueError: If the preset has more votes than its roll calls can hold
+    """
+
+    def __init__(self, preset: Preset, seed: int = DEFAULT_SEED):
+        self.preset = preset
+        self.seed = seed
+
+        rng = self._random("setup")
+        self.parties = rng.choices(PARTIES, cum_weights=zipf_weights(len(PARTIES), 1.0), k=preset.politicians)
+        self.attendance = [rng.betavariate(9, 1.1) for _ in range(preset.legislators)]
+
+        # A share of the bills goes to a roll call, sized to get `votes` votes
+        roll_call = preset.votes / (preset.bills * sum(self.attendance))
+        if roll_call > 1:
+            raise ValueError(f"{preset.votes} votes do not fit in {preset.bills} roll calls")
+        sponsors = zipf_weights(preset.legislators, 1.0)
+        days = (date(LAST_YEAR, 12, 31) - date(FIRST_YEAR, 1, 1)).days
+        self.introduced: List[date] = []
+        self.sponsors: List[int] = []
+        self.support: List[Optional[float]] = []
+        for _ in range(preset.bills):
+            self.introduced.append(date(FIRST_YEAR, 1, 1) + timedelta(days=rng.randrange(days)))
+            self.sponsors.append(rng.choices(range(preset.legislators), cum_weights=sponsors)[0])
+            self.support.append(rng.betavariate(2, 2) if rng.random() < roll_call else None)
+
+    def _random(self, table: str) -> random.Random:
+        return random.Random(f"{self.seed}:{table}")
+
+    def row_id(self, table: str, n: int) -> uuid.UUID:
+        """ID of the n-th generated row of a table (from 0)."""
+        return uuid.uuid5(SYNTHETIC_NAMESPACE, f"{self.seed}:{table}:{n}")
+
+    def politician_name(self, n: int) -> str:
+        """Name of the n-th politician; unique up to 64,000 politicians."""
+        return " ".join(compose(n * 7919 % 64000, FIRST_NAMES, SURNAMES, SURNAMES))
+
+    def bill_title(self, n: int) -> str:
+        """Title of the n-th bill."""
+        verb, topic = compose(n, BILL_VERBS, BILL_TOPICS)
+        return f"{verb} {topic}"
+
+    def donor(self, rank: int) -> Tuple[str, str]:
+        """
+        Name and type of the donor of a Zipf rank (0 donates the most).
+
+        Returns:
+            Tuple of (contributor name, contributor type)
+        """
+        # Spread the types over the ranks, so the top donors are of all types
+        kind = (rank * 37 + 11) % 100
+        if kind < 2:
+            party, state = compose(rank // 100, PARTIES, list(STATES))
+            return f"Diretório Estadual {party} {state}", "party"
+        if kind < 27:
+            words = compose(rank * 7919 % 76800, COMPANY_KINDS, SURNAMES, SURNAMES, COMPANY_SUFFIXES)
+            return " ".join(words), "company"
+        return " ".join(compose(rank * 7919 % 2560000, FIRST_NAMES, FIRST_NAMES, SURNAMES, SURNAMES)), "individual"
+
+    def politicians(self) -> Iterator[Tuple[Any, ...]]:
+        """Rows of `politician`, legislators first."""
+        rng = self._random("politician")
+        states = list(STATES)
+        state_weights = list(itertools.accumulate(STATES.values()))
+        positions = list(POSITIONS)
+        position_weights = list(itertools.accumulate(POSITIONS.values()))
+        start = datetime(FIRST_YEAR, 1, 1, tzinfo=timezone.utc)
+        for n in range(self.preset.politicians):
+            if n < self.preset.legislators:
+                position = "Deputado Federal" if n < FEDERAL_DEPUTIES else "Senador"
+            else:
+                position = rng.choices(positions, cum_weights=position_weights)[0]
+            created = start + timedelta(seconds=rng.randrange(10 * 365 * 86400))
+            yield (
+                self.row_id("politician", n),
+                self.politician_name(n),
+                self.parties[n],
+                position,
+                "Brasil",
+                rng.choices(states, cum_weights=state_weights)[0],
+                created,
+                created,
+            )
+
+    def bills(self) -> Iterator[Tuple[Any, ...]]:
+        """Rows of `bill`."""
+        rng = self._random("bill")
+        stalled = list(STALLED_STATUSES)
+        stalled_weights = list(itertools.accumulate(STALLED_STATUSES.values()))
+        for n in range(self.preset.bills):
+            introduced = self.introduced[n]
+            support = self.support[n]
+            if support is None:
+                status = rng.choices(stalled, cum_weights=stalled_weights)[0]
+            elif support < 0.5:
+                status = "failed"
+            else:
+                status = "enacted" if rng.random() < 0.6 else "passed"
+            created = datetime.combine(introduced, datetime.min.time(), timezone.utc) + timedelta(
+                seconds=rng.randrange(86400)
+            )
+            yield (
+                self.row_id("bill", n),
+                f"PL {n + 1}/{introduced.year}",
+                self.bill_title(n),
+                f"Projeto de lei {n + 1} de {introduced.year}",
+                introduced,
+                status,
+                self.row_id("politician", self.sponsors[n]),
+                created,
+                created,
+            )
+
+    def votes(self) -> Iterator[Tuple[Any, ...]]:
+        """Rows of `vote`: one roll call per voted bill, by the legislators present."""
+        rng = self._random("vote")
+        count = 0
+        for n, support in enumerate(self.support):
+            if support is None:
+                continue
+            bill_id = self.row_id("bill", n)
+            title = self.bill_title(n)
+            vote_date = min(self.introduced[n] + timedelta(days=rng.randrange(20, 400)), date(LAST_YEAR, 12, 31))
+            result = "passed" if support >= 0.5 else "failed"
+            session = datetime.combine(vote_date, datetime.min.time(), timezone.utc) + timedelta(
+                hours=rng.randrange(14, 22)
+            )
+            for legislator, attendance in enumerate(self.attendance):
+                if rng.random() >= attendance:
+                    continue
+                draw = rng.random()
+                if draw < 0.02:
+                    position = "present"
+                elif draw < 0.03:
+                    position = "not voting"
+                else:
+                    position = "yea" if rng.random() < support else "nay"
+                created = session + timedelta(seconds=rng.randrange(600))
+                yield (
+                    self.row_id("vote", count),
+                    self.row_id("politician", legislator),
+                    bill_id,
+                    title,
+                    vote_date,
+                    position,
+                    result,
+                    created,
+                    created,
+                )
+                count += 1
+
+    def contributions(self, chunk_size: int = 10000) -> Iterator[Tuple[Any, ...]]:
+        """Rows of `political_contribution`."""
+        rng = self._random(PARTITIONED_TABLE)
+        preset = self.preset
+        donors = zipf_weights(preset.donors, 1.1)
+        recipients = zipf_weights(preset.politicians, 0.9)
+        years = list(YEAR_WEIGHTS)
+        year_weights = list(itertools.accumulate(YEAR_WEIGHTS.values()))
+        month_weights = list(itertools.accumulate(MONTH_WEIGHTS))
+        months = range(1, 13)
+        for first in range(0, preset.contributions, chunk_size):
+            k = min(chunk_size, preset.contributions - first)
+            batch = zip(
+                rng.choices(range(preset.donors), cum_weights=donors, k=k),
+                rng.choices(range(preset.politicians), cum_weights=recipients, k=k),
+                rng.choices(years, cum_weights=year_weights, k=k),
+                rng.choices(months, cum_weights=month_weights, k=k),
+            )
+            for n, (donor, recipient, year, month) in enumerate(batch, start=first):
+                name, contributor_type = self.donor(donor)
+                day = date(year, month, rng.randint(1, calendar.monthrange(year, month)[1]))
+                mu, sigma = AMOUNTS[contributor_type]
+                amount = Decimal(f"{min(rng.lognormvariate(mu, sigma), MAX_AMOUNT):.2f}")
+                # Reported up to a few weeks after the contribution
+                created = datetime.combine(day, datetime.min.time(), timezone.utc) + timedelta(
+                    seconds=rng.randrange(20 * 86400)
+                )
+                yield (
+                    self.row_id(PARTITIONED_TABLE, n),
+                    self.row_id("politician", recipient),
+                    name,
+                    contributor_type,
+                    amount,
+                    day,
+                    created,
+                    created,
+                )
+
+    def rows(self, table: str) -> Iterator[Tuple[Any, ...]]:
+        """Rows of a table, with the columns of TABLES."""
+        return {
+            "politician": self.politicians,
+            "bill": self.bills,
+            "vote": self.votes,
+            PARTITIONED_TABLE: self.contributions,
+        }[table]()
+
+
+async def copy_rows(conn: Any, table: str, rows: Iterator[Tuple[Any, ...]], batch_size: int) -> int:
+    """
+    COPY rows into a table in batches, generating the next during each COPY.
+
+    Args:
+        conn: asyncpg connection
+        table: Table name (a key of TABLES)
+        rows: Records with the columns of TABLES
+        batch_size: Rows per COPY
+
+    Returns:
+        Number of rows copied
+    """
+    loop = asyncio.get_running_loop()
+
+    def take() -> List[Tuple[Any, ...]]:
+        return list(itertools.islice(rows, batch_size))
+
+    copied = 0
+    started = last_report = time.monotonic()
+    pending = loop.run_in_executor(None, take)
+    while True:
+        batch = await pending
+        if not batch:
+            break
+        pending = loop.run_in_executor(None, take)
+        await conn.copy_records_to_table(table, records=batch, columns=TABLES[table])
+        copied += len(batch)
+        if time.monotonic() - last_report >= PROGRESS_INTERVAL_SECONDS:
+            last_report = time.monotonic()
+            logger.info("%s: %d rows, %.0f rows/sec", table, copied, copied / (last_report - started))
+
+    elapsed = max(time.monotonic() - started, 1e-9)
+    logger.info("%s: %d rows in %.1fs (%.0f rows/sec)", table, copied, elapsed, copied / elapsed)
+    return copied
+
+
+async def load(conn: Any, data: SyntheticData, *, batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Load a synthetic dataset, refresh the materialized views and analyze.
+
+    The trigger-maintained summaries are updated as the rows arrive. The
+    views are refreshed without CONCURRENTLY, so this also works in a
+    transaction (as in tests), where everything is rolled back with it.
+
+    Args:
+        conn: asyncpg connection
+        data: Dataset to load
+        batch_size: Rows per COPY
+
+    Returns:
+        Rows loaded by table
+
+    Raises:
+        RuntimeError: If another process is creating partitions
+    """
+    if await ensure_partitions(conn, FIRST_YEAR, LAST_YEAR) is None:
+        raise RuntimeError(f"Partitions of {PARTITIONED_TABLE} are being created by another process, try again")
+
+    counts = {}
+    for table in TABLES:
+        counts[table] = await copy_rows(conn, table, data.rows(table), batch_size)
+    for name in MATERIALIZED_VIEWS:
+        await conn.execute(f"REFRESH MATERIALIZED VIEW {name}")
+    await conn.execute(f"ANALYZE {', '.join([*TABLES, *SUMMARY_TABLES, *MATERIALIZED_VIEWS])}")
+    return counts
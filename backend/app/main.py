@@ -6,6 +6,9 @@ import logging
 from app.core.config import settings
 from app.api.v1.api import api_router
 from app.db.init_db import init_db
+from app.db.invalidation import invalidation_listener
+from app.db.matviews import matview_refresher
+from app.db.partitions import partition_maintainer
 
 # Configure logging
 logging.basicConfig(
@@ -43,12 +46,20 @@ async def startup_event():
     """Initialize application on startup."""
     logger.info("Starting up PovoDB API")
     await init_db()
+    invalidation_listener.start()
+    if settings.MATVIEW_REFRESH_ENABLED:
+        matview_refresher.start()
+    if settings.PARTITION_MAINTENANCE_ENABLED:
+        partition_maintainer.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up resources on shutdown."""
     logger.info("Shutting down PovoDB API")
+    await partition_maintainer.stop()
+    await matview_refresher.stop()
+    await invalidation_listener.stop()
 
 
 @app.get("/", include_in_schema=False)
@@ -4,10 +4,20 @@ from app.models.politician import Politician
 from app.models.bill import Bill
 from app.models.vote import Vote
 from app.models.political_contribution import PoliticalContribution
+from app.models.politician_vote_stats import politician_bill_votes, politician_vote_stats
+from app.models.contributor_totals import contributor_monthly_totals, contributor_politician_totals, contributor_totals
+from app.models.materialized_views import materialized_view_refresh, party_contributions_monthly
 
 __all__ = [
     "Politician",
     "Bill",
     "Vote",
     "PoliticalContribution",
+    "politician_vote_stats",
+    "politician_bill_votes",
+    "contributor_monthly_totals",
+    "contributor_politician_totals",
+    "contributor_totals",
+    "materialized_view_refresh",
+    "party_contributions_monthly",
 ]
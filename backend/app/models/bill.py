@@ -1,9 +1,9 @@
 from typing import List, Optional
 from datetime import date
 from uuid import UUID
-from sqlalchemy import String, Text, Date, ForeignKey
+from sqlalchemy import String, Text, Date, ForeignKey, Index, Computed
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID as PgUUID
+from sqlalchemy.dialects.postgresql import UUID as PgUUID, TSVECTOR
 
 from app.db.base_class import Base
 
@@ -15,24 +15,53 @@ class Bill(Base):
     Contains information about bills, their status, sponsor, and related data.
     """
 
-    bill_number: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    # Composite indexes backing the keyset pagination sort keys
+    __table_args__ = (
+        Index("ix_bill_created_at_id", "created_at", "id"),
+        Index("ix_bill_bill_number_id", "bill_number", "id"),
+        Index("ix_bill_search_vector", "search_vector", postgresql_using="gin"),
+        # Version lookups for ETag/Last-Modified
+        Index("ix_bill_updated_at", "updated_at"),
+        Index("ix_bill_sponsor_id_updated_at", "sponsor_id", "updated_at"),
+        # Pages of one politician's sponsored bills
+        Index("ix_bill_sponsor_id_created_at_id", "sponsor_id", "created_at", "id"),
+        Index("ix_bill_sponsor_id_bill_number_id", "sponsor_id", "bill_number", "id"),
+        Index("ix_bill_sponsor_id_introduced_date_id", "sponsor_id", "introduced_date", "id"),
+    )
+
+    bill_number: Mapped[str] = mapped_column(String(100), nullable=False)
     title: Mapped[str] = mapped_column(Text, nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text)
     introduced_date: Mapped[Optional[date]] = mapped_column(Date, index=True)
     status: Mapped[Optional[str]] = mapped_column(String(100), index=True)
     full_text_url: Mapped[Optional[str]] = mapped_column(String(255))
 
+    # Generated full-text search document; deferred so it is never loaded
+    # with the bill itself, only referenced in search queries
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('portuguese', immutable_unaccent(coalesce(title, ''))), 'A') || "
+            "setweight(to_tsvector('portuguese', immutable_unaccent(coalesce(description, ''))), 'B') || "
+            "setweight(to_tsvector('simple', immutable_unaccent("
+            "bill_number || ' ' || coalesce(title, '') || ' ' || coalesce(description, '')"
+            ")), 'C')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
     # Foreign Keys
     sponsor_id: Mapped[Optional[UUID]] = mapped_column(
         PgUUID(as_uuid=True),
         ForeignKey("politician.id", ondelete="SET NULL"),
-        index=True
     )
 
     # Relationships
     sponsor: Mapped[Optional["Politician"]] = relationship(
         "Politician", back_populates="sponsored_bills", foreign_keys=[sponsor_id]
     )
+    # Deleted by the foreign key (ON DELETE CASCADE) instead of loaded
     votes: Mapped[List["Vote"]] = relationship(
-        "Vote", back_populates="bill", cascade="all, delete-orphan"
+        "Vote", back_populates="bill", cascade="all, delete-orphan", passive_deletes=True
     )
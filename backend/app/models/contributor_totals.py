@@ -0,0 +1,65 @@
+from sqlalchemy import BigInteger, Column, Date, Index, Numeric, String, Table, text
+from sqlalchemy.dialects.postgresql import UUID as PgUUID
+
+from app.db.base_class import Base
+
+# Contribution rollups kept up to date by statement-level triggers on
+# `political_contribution` (see migration 0008_contributor_totals). A NULL
+# contributor_type is stored as '' so it can be part of the primary keys.
+
+# Sums per contributor, politician and month: answers filtered rankings,
+# with exact distinct politician counts
+contributor_monthly_totals = Table(
+    "contributor_monthly_totals",
+    Base.metadata,
+    Column("contributor_name", String(255), primary_key=True),
+    Column("contributor_type", String(100), primary_key=True, server_default=""),
+    Column("politician_id", PgUUID(as_uuid=True), primary_key=True),
+    Column("month", Date, primary_key=True),
+    Column("total_amount", Numeric(18, 2), nullable=False, server_default="0"),
+    Column("contribution_count", BigInteger, nullable=False, server_default="0"),
+    Index("ix_contributor_monthly_totals_politician_id_month", "politician_id", "month"),
+    Index("ix_contributor_monthly_totals_contributor_type_month", "contributor_type", "month"),
+    Index("ix_contributor_monthly_totals_month", "month"),
+    # Buckets emptied by a statement, deleted right after it
+    Index(
+        "ix_contributor_monthly_totals_empty",
+        "contribution_count",
+        postgresql_where=text("contribution_count = 0"),
+    ),
+)
+
+# Contributions per (contributor, politician), maintained by the same
+# triggers: its 0 <-> 1 transitions move `politicians_supported`. Without
+# foreign keys, so each row lives exactly as long as the contributions it counts.
+contributor_politician_totals = Table(
+    "contributor_politician_totals",
+    Base.metadata,
+    Column("contributor_name", String(255), primary_key=True),
+    Column("contributor_type", String(100), primary_key=True, server_default=""),
+    Column("politician_id", PgUUID(as_uuid=True), primary_key=True),
+    Column("contribution_count", BigInteger, nullable=False),
+    # Pairs emptied by a statement, deleted right after it
+    Index(
+        "ix_contributor_politician_totals_empty",
+        "contribution_count",
+        postgresql_where=text("contribution_count = 0"),
+    ),
+)
+
+# Sums per contributor: the unfiltered ranking is a top-N scan of total_amount
+contributor_totals = Table(
+    "contributor_totals",
+    Base.metadata,
+    Column("contributor_name", String(255), primary_key=True),
+    Column("contributor_type", String(100), primary_key=True, server_default=""),
+    Column("total_amount", Numeric(18, 2), nullable=False, server_default="0"),
+    Column("contribution_count", BigInteger, nullable=False, server_default="0"),
+    Column("politicians_supported", BigInteger, nullable=False, server_default="0"),
+    Index("ix_contributor_totals_total_amount", "total_amount"),
+    Index(
+        "ix_contributor_totals_empty",
+        "contribution_count",
+        postgresql_where=text("contribution_count = 0"),
+    ),
+)
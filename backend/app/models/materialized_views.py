@@ -0,0 +1,31 @@
+from sqlalchemy import BigInteger, Column, Date, DateTime, Float, MetaData, Numeric, String, Table, Text
+
+from app.db.base_class import Base
+
+# When each materialized view was last refreshed, shared by all workers
+# (see app.db.matviews)
+materialized_view_refresh = Table(
+    "materialized_view_refresh",
+    Base.metadata,
+    Column("view_name", String(63), primary_key=True),
+    Column("refreshed_at", DateTime(timezone=True), nullable=True),
+    Column("duration_ms", Float, nullable=True),
+    Column("last_error", Text, nullable=True),
+    Column("last_error_at", DateTime(timezone=True), nullable=True),
+)
+
+# Materialized views, created by migrations with op.create_materialized_view.
+# Kept out of Base.metadata so autogenerate does not take them for tables.
+views_metadata = MetaData()
+
+# Contributions per party and month
+party_contributions_monthly = Table(
+    "mv_party_contributions_monthly",
+    views_metadata,
+    Column("party", String(100), primary_key=True),
+    Column("month", Date, primary_key=True),
+    Column("total_amount", Numeric(18, 2), nullable=False),
+    Column("contribution_count", BigInteger, nullable=False),
+    Column("politicians_supported", BigInteger, nullable=False),
+    Column("contributors", BigInteger, nullable=False),
+)
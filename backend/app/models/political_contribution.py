@@ -1,7 +1,7 @@
 from typing import Optional
 from datetime import date
 from uuid import UUID
-from sqlalchemy import String, Numeric, Date, ForeignKey
+from sqlalchemy import String, Numeric, Date, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID as PgUUID
 
@@ -14,15 +14,39 @@ class PoliticalContribution(Base):
 
     Contains information about financial contributions, including the contributor,
     amount, and date of the contribution.
+
+    The table is range-partitioned by `contribution_date`, one partition per
+    year (see app.db.partitions), so its primary key includes the date; the
+    ORM still identifies a contribution by its id alone.
     """
     __tablename__ = "political_contribution"
 
+    # Composite indexes backing the keyset pagination sort keys
+    __table_args__ = (
+        Index("ix_political_contribution_contribution_date_id", "contribution_date", "id"),
+        Index("ix_political_contribution_amount_id", "amount", "id"),
+        Index("ix_political_contribution_created_at_id", "created_at", "id"),
+        # Version lookups for ETag/Last-Modified
+        Index("ix_political_contribution_updated_at", "updated_at"),
+        Index("ix_political_contribution_politician_id_updated_at", "politician_id", "updated_at"),
+        # Pages of one politician's contributions; the amount makes their
+        # sums index-only scans
+        Index(
+            "ix_political_contribution_politician_id_contribution_date_id",
+            "politician_id", "contribution_date", "id",
+            postgresql_include=["amount"],
+        ),
+        Index("ix_political_contribution_politician_id_amount_id", "politician_id", "amount", "id"),
+        Index("ix_political_contribution_politician_id_created_at_id", "politician_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (contribution_date)"},
+    )
+    __mapper_args__ = {"primary_key": ["id"]}
+
     # Foreign Keys
     politician_id: Mapped[UUID] = mapped_column(
         PgUUID(as_uuid=True),
         ForeignKey("politician.id", ondelete="CASCADE"),
         nullable=False,
-        index=True
     )
 
     # Contribution data
@@ -33,10 +57,10 @@ class PoliticalContribution(Base):
     )
     amount: Mapped[float] = mapped_column(
         Numeric(15, 2),
-        nullable=False,
-        index=True
+        nullable=False
     )
-    contribution_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    # Partition key, part of the primary key
+    contribution_date: Mapped[date] = mapped_column(Date, primary_key=True)
 
     # Relationships
     politician: Mapped["Politician"] = relationship(
@@ -1,5 +1,5 @@
 from typing import List, Optional
-from sqlalchemy import String, Text
+from sqlalchemy import String, Text, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base_class import Base
@@ -13,7 +13,15 @@ class Politician(Base):
     position, and biographical information.
     """
 
-    name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    # Composite indexes backing the keyset pagination sort keys
+    __table_args__ = (
+        Index("ix_politician_name_id", "name", "id"),
+        Index("ix_politician_created_at_id", "created_at", "id"),
+        # Version lookups for ETag/Last-Modified
+        Index("ix_politician_updated_at", "updated_at"),
+    )
+
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
     party: Mapped[Optional[str]] = mapped_column(String(100), index=True)
     position: Mapped[Optional[str]] = mapped_column(String(255))
     country: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
@@ -22,13 +30,14 @@ class Politician(Base):
     website: Mapped[Optional[str]] = mapped_column(String(255))
     photo_url: Mapped[Optional[str]] = mapped_column(String(255))
 
-    # Relationships
+    # Relationships; deleting a politician leaves the related rows to the
+    # foreign keys (ON DELETE CASCADE / SET NULL) instead of loading them
     votes: Mapped[List["Vote"]] = relationship(
-        "Vote", back_populates="politician", cascade="all, delete-orphan"
+        "Vote", back_populates="politician", cascade="all, delete-orphan", passive_deletes=True
     )
     sponsored_bills: Mapped[List["Bill"]] = relationship(
-        "Bill", back_populates="sponsor", foreign_keys="[Bill.sponsor_id]"
+        "Bill", back_populates="sponsor", foreign_keys="[Bill.sponsor_id]", passive_deletes=True
     )
     contributions: Mapped[List["PoliticalContribution"]] = relationship(
-        "PoliticalContribution", back_populates="politician", cascade="all, delete-orphan"
+        "PoliticalContribution", back_populates="politician", cascade="all, delete-orphan", passive_deletes=True
     )
@@ -0,0 +1,38 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, Index, Table, text
+from sqlalchemy.dialects.postgresql import UUID as PgUUID
+
+from app.db.base_class import Base
+
+# Vote counts per politician, kept up to date by statement-level triggers on
+# `vote` (see migration 0007_politician_vote_stats). A plain table rather than
+# a model: it is keyed by politician and never written by the application,
+# except by `CRUDVote.rebuild_statistics`.
+politician_vote_stats = Table(
+    "politician_vote_stats",
+    Base.metadata,
+    Column(
+        "politician_id",
+        PgUUID(as_uuid=True),
+        ForeignKey("politician.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("total_votes", BigInteger, nullable=False, server_default="0"),
+    Column("yea_votes", BigInteger, nullable=False, server_default="0"),
+    Column("nay_votes", BigInteger, nullable=False, server_default="0"),
+    Column("bills_voted", BigInteger, nullable=False, server_default="0"),
+    # Top-N by vote count is a backward scan of this index
+    Index("ix_politician_vote_stats_total_votes", "total_votes", "politician_id"),
+)
+
+# Votes per (politician, bill), maintained by the same triggers: its 0 <-> 1
+# transitions move `bills_voted`. Without foreign keys, so each row lives
+# exactly as long as the votes it counts.
+politician_bill_votes = Table(
+    "politician_bill_votes",
+    Base.metadata,
+    Column("politician_id", PgUUID(as_uuid=True), primary_key=True),
+    Column("bill_id", PgUUID(as_uuid=True), primary_key=True),
+    Column("votes", BigInteger, nullable=False),
+    # Pairs emptied by a statement, deleted right after it
+    Index("ix_politician_bill_votes_empty", "votes", postgresql_where=text("votes = 0")),
+)
@@ -1,7 +1,7 @@
 from typing import Optional
 from datetime import date
 from uuid import UUID
-from sqlalchemy import String, Text, Date, ForeignKey
+from sqlalchemy import String, Text, Date, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID as PgUUID
 
@@ -16,24 +16,44 @@ class Vote(Base):
     including the date of the vote and the result.
     """
 
+    # Composite indexes backing the keyset pagination sort keys
+    __table_args__ = (
+        Index("ix_vote_vote_date_id", "vote_date", "id"),
+        Index("ix_vote_created_at_id", "created_at", "id"),
+        # Version lookup of the whole table for ETag/Last-Modified
+        Index("ix_vote_updated_at", "updated_at"),
+        # Pages of one politician's votes, and of the votes on a bill,
+        # optionally by position; the updated_at makes the version lookups
+        # of these collections index-only scans
+        Index(
+            "ix_vote_politician_id_vote_date_id",
+            "politician_id", "vote_date", "id",
+            postgresql_include=["updated_at"],
+        ),
+        Index("ix_vote_politician_id_created_at_id", "politician_id", "created_at", "id"),
+        Index(
+            "ix_vote_bill_id_vote_position_vote_date_id",
+            "bill_id", "vote_position", "vote_date", "id",
+            postgresql_include=["updated_at"],
+        ),
+    )
+
     # Foreign Keys
     politician_id: Mapped[UUID] = mapped_column(
         PgUUID(as_uuid=True),
         ForeignKey("politician.id", ondelete="CASCADE"),
         nullable=False,
-        index=True
     )
 
     bill_id: Mapped[UUID] = mapped_column(
         PgUUID(as_uuid=True),
         ForeignKey("bill.id", ondelete="CASCADE"),
         nullable=False,
-        index=True
     )
 
     # Vote data
     bill_title: Mapped[str] = mapped_column(Text, nullable=False)
-    vote_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    vote_date: Mapped[date] = mapped_column(Date, nullable=False)
     vote_position: Mapped[str] = mapped_column(
         String(50),
         nullable=False,
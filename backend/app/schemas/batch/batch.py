@@ -0,0 +1,9 @@
+from typing import List
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class BatchGetRequest(BaseModel):
+    """Schema for a request of many records by ID."""
+    ids: List[UUID]
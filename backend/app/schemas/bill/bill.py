@@ -69,7 +69,30 @@ class BillInDB(BillInDBBase):
 class BillPage(BaseModel):
     """Schema for paginated bill results."""
     items: List[Bill]
-    total: int
+    total: Optional[int] = None
+    total_exact: bool = True
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+# Batch get by IDs
+class BillBatch(BaseModel):
+    """Schema for bills requested by ID, in request order."""
+    items: List[Bill]
+    missing: List[UUID] = []
+
+
+# Full-text search results
+class BillSearchResult(Bill):
+    """Schema for a bill matched by full-text search."""
+    rank: float
+    headline: Optional[str] = None
+
+
+class BillSearchPage(BaseModel):
+    """Schema for paginated bill search results, ordered by rank."""
+    items: List[BillSearchResult]
+    size: int
+    next_cursor: Optional[str] = None
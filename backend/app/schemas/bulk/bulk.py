@@ -0,0 +1,27 @@
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class BulkRowError(BaseModel):
+    """Schema for a row rejected during bulk loading."""
+    line: int
+    error: str
+
+
+class BulkBatchReport(BaseModel):
+    """Schema for the outcome of one bulk loading batch."""
+    batch: int
+    first_line: int
+    last_line: int
+    received: int
+    inserted: int
+    errors: List[BulkRowError] = []
+    batch_error: Optional[str] = None
+
+
+class BulkReport(BaseModel):
+    """Schema for the outcome of a bulk loading request."""
+    received: int
+    inserted: int
+    rejected: int
+    batches: List[BulkBatchReport]
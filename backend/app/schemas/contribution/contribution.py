@@ -64,7 +64,16 @@ class ContributionInDB(ContributionInDBBase):
 class ContributionPage(BaseModel):
     """Schema for paginated contribution results."""
     items: List[Contribution]
-    total: int
+    total: Optional[int] = None
+    total_exact: bool = True
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+# Batch get by IDs
+class ContributionBatch(BaseModel):
+    """Schema for contributions requested by ID, in request order."""
+    items: List[Contribution]
+    missing: List[UUID] = []
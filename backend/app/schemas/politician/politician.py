@@ -94,12 +94,25 @@ class BillSchema(BaseModel):
     class Config:
         from_attributes = True
 
+class CollectionPage(BaseModel):
+    """Schema for the pagination state of a collection in politician details."""
+    total: int
+    size: int
+    next_cursor: Optional[str] = None
+
+class DetailCollections(BaseModel):
+    """Schema for the pagination state of every collection in politician details."""
+    votes: CollectionPage
+    sponsored_bills: CollectionPage
+    contributions: CollectionPage
+
 # Schema for politician with detailed information
 class PoliticianDetail(PoliticianInDBBase):
-    """Schema for politician with related data."""
+    """Schema for politician with related data, each collection one page long."""
     votes: List[VoteSchema] = Field(default_factory=list)
     sponsored_bills: List[BillSchema] = Field(default_factory=list)
     contributions: List[ContributionSchema] = Field(default_factory=list)
+    collections: DetailCollections
 
     class Config:
         from_attributes = True
@@ -108,7 +121,16 @@ class PoliticianDetail(PoliticianInDBBase):
 class PoliticianPage(BaseModel):
     """Schema for paginated politician results."""
     items: List[Politician]
-    total: int
+    total: Optional[int] = None
+    total_exact: bool = True
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+# Batch get by IDs
+class PoliticianBatch(BaseModel):
+    """Schema for politicians requested by ID, in request order."""
+    items: List[Politician]
+    missing: List[UUID] = []
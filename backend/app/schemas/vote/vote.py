@@ -68,7 +68,16 @@ class VoteInDB(VoteInDBBase):
 class VotePage(BaseModel):
     """Schema for paginated vote results."""
     items: List[Vote]
-    total: int
+    total: Optional[int] = None
+    total_exact: bool = True
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+# Batch get by IDs
+class VoteBatch(BaseModel):
+    """Schema for votes requested by ID, in request order."""
+    items: List[Vote]
+    missing: List[UUID] = []
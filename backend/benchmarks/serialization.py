@@ -0,0 +1,144 @@
+"""
+Compare the default and fast serialization paths of list endpoints.
+
+Builds pages of synthetic rows and measures, per page:
+
+* default: model instances serialized the way FastAPI does it for a
+  `response_model` (validation, then JSON encoding with the stdlib);
+* fast: dictionaries of column values encoded with orjson
+  (`app.api.serialization.page_response`).
+
+Database time is not included; both paths run on the same in-memory rows.
+ORM instances are created directly, which is cheaper than loading them
+from a result, so the default path is, if anything, measured favorably.
+
+Usage (from the backend directory):
+    python -m benchmarks.serialization --rows 100 --pages 500
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.api.serialization import page_response, schema_columns
+from app.crud.base import Page
+from app.models.political_contribution import PoliticalContribution
+from app.models.politician import Politician
+from app.models.vote import Vote
+from app.schemas.contribution.contribution import Contribution, ContributionPage
+from app.schemas.politician.politician import Politician as PoliticianSchema, PoliticianPage
+from app.schemas.vote.vote import Vote as VoteSchema, VotePage
+
+NOW = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+def politician_row(i: int) -> Dict[str, Any]:
+    return {
+        "id": uuid.uuid4(),
+        "name": f"Politician {i}",
+        "party": "PT" if i % 2 else "PL",
+        "position": "Deputado Federal",
+        "country": "Brasil",
+        "state_province": "SP",
+        "bio": "Lorem ipsum dolor sit amet " * 8,
+        "website": f"https://example.org/politicians/{i}",
+        "photo_url": f"https://example.org/photos/{i}.jpg",
+        "created_at": NOW,
+        "updated_at": NOW + timedelta(seconds=i),
+    }
+
+
+def vote_row(i: int) -> Dict[str, Any]:
+    return {
+        "id": uuid.uuid4(),
+        "politician_id": uuid.uuid4(),
+        "bill_id": uuid.uuid4(),
+        "bill_title": f"PL {i}/2024 - Dispõe sobre assuntos diversos",
+        "vote_date": date(2024, 1, 1) + timedelta(days=i % 365),
+        "vote_position": "yea",
+        "vote_result": "passed",
+        "created_at": NOW,
+        "updated_at": NOW,
+    }
+
+
+def contribution_row(i: int) -> Dict[str, Any]:
+    return {
+        "id": uuid.uuid4(),
+        "politician_id": uuid.uuid4(),
+        "contributor_name": f"Contributor {i}",
+        "contributor_type": "individual",
+        "amount": Decimal("1500.50") + i,
+        "contribution_date": date(2022, 8, 1) + timedelta(days=i % 60),
+        "created_at": NOW,
+        "updated_at": NOW,
+    }
+
+
+CASES = [
+    ("politicians", Politician, PoliticianSchema, PoliticianPage, politician_row),
+    ("votes", Vote, VoteSchema, VotePage, vote_row),
+    ("contributions", PoliticalContribution, Contribution, ContributionPage, contribution_row),
+]
+
+
+async def default_path(field: Any, body: Dict[str, Any]) -> bytes:
+    content = await serialize_response(field=field, response_content=body, is_coroutine=True)
+    return JSONResponse(content).body
+
+
+def fast_path(page: Page, schema: Any, limit: int) -> bytes:
+    return page_response(page, skip=0, limit=limit, schema=schema).body
+
+
+async def measure(fn: Callable[[], Any], pages: int) -> float:
+    """Return the mean time per call in milliseconds."""
+    for _ in range(min(pages, 20)):
+        await fn()
+    started = time.perf_counter()
+    for _ in range(pages):
+        await fn()
+    return (time.perf_counter() - started) / pages * 1000
+
+
+async def run(rows: int, pages: int) -> None:
+    print(f"{rows} rows per page, {pages} pages")
+    print(f"{'endpoint':<15}{'default ms':>12}{'fast ms':>12}{'speedup':>10}")
+    for name, model, schema, page_schema, make_row in CASES:
+        columns = schema_columns(schema, model)
+        data: List[Dict[str, Any]] = [make_row(i) for i in range(rows)]
+        mapped = [{c: row[c] for c in columns} for row in data]
+        field = create_response_field(name=f"Response_{name}", type_=page_schema)
+
+        async def run_default() -> bytes:
+            # Fresh instances each time: the default path builds them per request
+            items = [model(**row) for row in data]
+            page = Page(items=items, total=rows * 10)
+            return await default_path(field, page.to_response(skip=0, limit=rows))
+
+        async def run_fast() -> bytes:
+            page = Page(items=[dict(row) for row in mapped], total=rows * 10)
+            return fast_path(page, schema, rows)
+
+        default_ms = await measure(run_default, pages)
+        fast_ms = await measure(run_fast, pages)
+        print(f"{name:<15}{default_ms:>12.3f}{fast_ms:>12.3f}{default_ms / fast_ms:>9.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="Rows per page")
+    parser.add_argument("--pages", type=int, default=500, help="Pages serialized per path")
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.pages))
+
+
+if __name__ == "__main__":
+    main()
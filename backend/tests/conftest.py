@@ -0,0 +1,49 @@
+"""
+Shared test fixtures.
+
+Tests needing PostgreSQL use the `db` fixture, which connects to
+`DATABASE_URL` (a migrated database) and skips when it is unreachable.
+Each test runs in a transaction that is rolled back afterwards.
+`synthetic_data` also loads the `tiny` synthetic dataset into it.
+"""
+from typing import AsyncIterator
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.db.synthetic import PRESETS, SyntheticData, load
+
+
+@pytest.fixture
+async def db() -> AsyncIterator[AsyncSession]:
+    engine = create_async_engine(str(settings.DATABASE_URL), poolclass=NullPool)
+    try:
+        connection = await engine.connect()
+    except (OSError, ConnectionError) as e:
+        await engine.dispose()
+        pytest.skip(f"PostgreSQL not available: {e}")
+    transaction = await connection.begin()
+    session = AsyncSession(
+        bind=connection,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
+    try:
+        yield session
+    finally:
+        await session.close()
+        await transaction.rollback()
+        await connection.close()
+        await engine.dispose()
+
+
+@pytest.fixture
+async def synthetic_data(db: AsyncSession) -> SyntheticData:
+    """The `tiny` synthetic dataset, loaded in the test's transaction."""
+    data = SyntheticData(PRESETS["tiny"])
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    await load(raw.driver_connection, data)
+    return data
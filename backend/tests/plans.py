@@ -0,0 +1,108 @@
+"""
+Checks of PostgreSQL query plans.
+
+A plan (the JSON of `EXPLAIN (FORMAT JSON)`) is reduced to an outline, one
+line per node, and checked for the properties the API relies on:
+
+- no sequential scan of a large table,
+- a bounded number of estimated rows returned,
+- no sort of many rows: long sorted lists are read in index order.
+
+A failing plan is reported as a diff from the outline the checks expected
+to the actual one.
+"""
+import difflib
+from typing import Any, Collection, Dict, Iterator, List, Optional, Tuple
+
+# Tables (and partitions) with at least this many rows are large
+LARGE_TABLE_ROWS = 10000
+
+# Sorting more rows than this means an index did not provide the order
+SORT_ROWS = 1000
+
+
+def nodes(plan: Dict[str, Any], depth: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Every node of a plan with its depth, parents first."""
+    yield depth, plan
+    for child in plan.get("Plans", []):
+        yield from nodes(child, depth + 1)
+
+
+def describe(node: Dict[str, Any]) -> str:
+    """One-line description of a plan node, without its estimates."""
+    text = node["Node Type"]
+    if node.get("Parent Relationship") in ("InitPlan", "SubPlan"):
+        text = f"{node['Parent Relationship']}: {text}"
+    if "Index Name" in node:
+        text += f" using {node['Index Name']}"
+    if "Relation Name" in node:
+        text += f" on {node['Relation Name']}"
+    if "Sort Key" in node:
+        text += f" by {', '.join(node['Sort Key'])}"
+    return text
+
+
+def outline(plan: Dict[str, Any]) -> List[str]:
+    """Indented outline of a plan, one line per node with its estimated rows."""
+    return [
+        f"{'  ' * depth}{describe(node)} rows={int(node['Plan Rows'])}"
+        for depth, node in nodes(plan)
+    ]
+
+
+def check_plan(
+    plan: Dict[str, Any],
+    *,
+    large_tables: Dict[str, str],
+    max_rows: Optional[int],
+    full_scans: Collection[str] = (),
+    sorts: bool = False,
+) -> Dict[int, str]:
+    """
+    Check a plan for sequential scans, unbounded results and large sorts.
+
+    Args:
+        plan: Root node of the plan
+        large_tables: Table name by name of the large relations; partitions
+            map to their partitioned table
+        max_rows: Maximum estimated rows returned, None for no bound
+        full_scans: Tables whose sequential scan is expected
+        sorts: Whether sorting more than SORT_ROWS rows is expected
+
+    Returns:
+        Line the checks expected by index of each failing outline line
+    """
+    expected: Dict[int, str] = {}
+    for index, (depth, node) in enumerate(nodes(plan)):
+        indent = "  " * depth
+        rows = int(node["Plan Rows"])
+        relation = node.get("Relation Name")
+        if (
+            node["Node Type"] == "Seq Scan"
+            and relation in large_tables
+            and large_tables[relation] not in full_scans
+        ):
+            expected[index] = f"{indent}Index Scan on {relation} (no Seq Scan of a large table)"
+        elif node["Node Type"] == "Sort" and rows > SORT_ROWS and not sorts:
+            expected[index] = f"{indent}{describe(node)} rows<={SORT_ROWS} (or read in index order)"
+        elif index == 0 and max_rows is not None and rows > max_rows:
+            expected[index] = f"{describe(node)} rows<={max_rows}"
+    return expected
+
+
+def plan_diff(statement: str, plan: Dict[str, Any], expected: Dict[int, str]) -> str:
+    """
+    Report a failing plan as a diff from the expected outline to the actual one.
+
+    Args:
+        statement: SQL statement of the plan
+        plan: Root node of the plan
+        expected: Expected lines by index, as returned by `check_plan`
+
+    Returns:
+        The statement followed by the unified diff of the outlines
+    """
+    actual = outline(plan)
+    wanted = [expected.get(index, line) for index, line in enumerate(actual)]
+    diff = difflib.unified_diff(wanted, actual, "expected", "actual", n=len(actual), lineterm="")
+    return "\n".join([statement.strip(), *diff])
@@ -0,0 +1,40 @@
+"""
+Failures of the bulk COPY endpoints.
+
+A batch the database or the driver rejects is reported in the batch's
+`batch_error`, and the load goes on with the next batch.
+"""
+import json
+from typing import AsyncIterator
+from uuid import UUID
+
+from app.crud.bulk import bulk_copy
+from app.db.session import async_engine
+from app.models.political_contribution import PoliticalContribution
+from app.schemas.contribution.contribution import ContributionCreate
+
+
+async def ndjson(*rows) -> AsyncIterator[bytes]:
+    for row in rows:
+        yield (json.dumps(row) + "\n").encode()
+
+
+async def test_record_that_fails_to_encode_fails_its_batch(db):
+    # `db` only skips without PostgreSQL: COPY borrows a pooled connection.
+    # A lone surrogate is valid JSON and a valid str, but not UTF-8.
+    row = {
+        "contributor_name": "\ud800",
+        "amount": 10,
+        "contribution_date": "2022-01-01",
+        "politician_id": str(UUID(int=0)),
+    }
+    try:
+        report = await bulk_copy(
+            PoliticalContribution, ContributionCreate, ndjson(row), content_type="application/x-ndjson"
+        )
+    finally:
+        await async_engine.dispose()
+
+    [batch] = report["batches"]
+    assert batch["inserted"] == 0
+    assert "surrogates not allowed" in batch["batch_error"]
@@ -0,0 +1,79 @@
+"""
+Partition pruning of political_contribution.
+
+The date filters of GET /contributions must only reach the partitions of
+the years they span, both when the planner sees the dates and when they
+are bound at execution time, as with the prepared statements asyncpg
+ends up running with generic plans.
+"""
+import json
+from datetime import date
+from typing import Any, Dict, Set
+
+from sqlalchemy import select, text
+
+from app.crud.crud_contribution import contribution
+from app.models.political_contribution import PoliticalContribution
+
+
+def relations(plan: Dict[str, Any]) -> Set[str]:
+    """Names of the tables scanned by a plan node and its children."""
+    names = {plan["Relation Name"]} if "Relation Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= relations(child)
+    return names
+
+
+async def scanned_partitions(db, filters: Dict[str, Any], *, generic: bool = False) -> Set[str]:
+    """Partitions left in the plan of the contribution list with these filters."""
+    connection = await db.connection()
+    await connection.exec_driver_sql(
+        "SET LOCAL plan_cache_mode = " + ("force_generic_plan" if generic else "auto")
+    )
+    names = sorted(filters)
+    query = select(PoliticalContribution.id).where(*contribution._criteria(names))
+    compiled = query.compile(dialect=connection.dialect)
+    values = compiled.construct_params(filters)
+    result = await connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}",
+        tuple(values[key] for key in compiled.positiontup),
+    )
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return relations(plan[0]["Plan"])
+
+
+async def ensure_years(db, first_year: int, last_year: int) -> None:
+    await db.execute(
+        text("SELECT ensure_contribution_partitions(:first_year, :last_year)"),
+        {"first_year": first_year, "last_year": last_year},
+    )
+
+
+async def test_date_range_scans_only_its_years(db):
+    await ensure_years(db, 2021, 2024)
+
+    within_year = {"from_date": date(2022, 3, 1), "to_date": date(2022, 10, 31)}
+    assert await scanned_partitions(db, within_year) == {"political_contribution_y2022"}
+
+    across_years = {"from_date": date(2022, 7, 1), "to_date": date(2023, 6, 30)}
+    assert await scanned_partitions(db, across_years) == {
+        "political_contribution_y2022",
+        "political_contribution_y2023",
+    }
+
+
+async def test_open_ended_range_skips_earlier_years(db):
+    await ensure_years(db, 2021, 2024)
+
+    scanned = await scanned_partitions(db, {"to_date": date(2021, 12, 31)})
+    assert "political_contribution_y2021" in scanned
+    assert not scanned & {"political_contribution_y2022", "political_contribution_y2023"}
+
+
+async def test_bound_dates_prune_at_execution(db):
+    await ensure_years(db, 2021, 2024)
+
+    filters = {"from_date": date(2023, 1, 1), "to_date": date(2023, 12, 31)}
+    assert await scanned_partitions(db, filters, generic=True) == {"political_contribution_y2023"}
@@ -0,0 +1,92 @@
+"""
+Trigger-maintained contributor rollups under concurrent writes.
+
+Writes are committed by two connections at once, so this test cleans up
+after itself instead of rolling back, and expects the contribution tables
+to hold no other committed rows it could disturb.
+"""
+import asyncio
+import uuid
+from datetime import date
+from typing import AsyncIterator, List
+
+import asyncpg
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.crud.crud_contribution import contribution
+
+INSERT_CONTRIBUTION = """
+INSERT INTO political_contribution (id, politician_id, contributor_name, contributor_type, amount, contribution_date)
+VALUES ($1, $2, 'Concurrent Contributor', 'company', $3, $4)
+"""
+
+
+@pytest.fixture
+async def connections() -> AsyncIterator[List[asyncpg.Connection]]:
+    dsn = str(settings.DATABASE_URL).replace("+asyncpg", "")
+    try:
+        opened = [await asyncpg.connect(dsn) for _ in range(2)]
+    except (OSError, ConnectionError) as e:
+        pytest.skip(f"PostgreSQL not available: {e}")
+    try:
+        yield opened
+    finally:
+        for conn in opened:
+            await conn.close()
+
+
+async def rollup_differences() -> int:
+    """Rows of the rollups differing from a recount, as `rebuild-contributor-totals --check`."""
+    engine = create_async_engine(str(settings.DATABASE_URL), poolclass=NullPool)
+    try:
+        async with AsyncSession(engine) as db:
+            return await contribution.rebuild_contributor_totals(db, check=True)
+    finally:
+        await engine.dispose()
+
+
+async def test_concurrent_first_contributions_to_a_politician_count_them_once(connections):
+    first, second = connections
+    politician_id = uuid.uuid4()
+    await first.execute(
+        "INSERT INTO politician (id, name, country) VALUES ($1, 'Concurrent', 'Brasil')", politician_id
+    )
+    try:
+        # Both transactions add the contributor's first contribution to the
+        # politician, in different months
+        first_tx, second_tx = first.transaction(), second.transaction()
+        await first_tx.start()
+        await second_tx.start()
+        await first.execute(INSERT_CONTRIBUTION, uuid.uuid4(), politician_id, 100, date(2024, 1, 1))
+        blocked = asyncio.create_task(
+            second.execute(INSERT_CONTRIBUTION, uuid.uuid4(), politician_id, 50, date(2024, 2, 1))
+        )
+        await asyncio.sleep(0.5)
+        assert not blocked.done(), "The second contribution did not wait for the first transaction's pair count"
+        await first_tx.commit()
+        await blocked
+        await second_tx.commit()
+
+        totals = await first.fetchrow(
+            "SELECT total_amount, contribution_count, politicians_supported FROM contributor_totals "
+            "WHERE contributor_name = 'Concurrent Contributor'"
+        )
+        assert dict(totals) == {"total_amount": 150, "contribution_count": 2, "politicians_supported": 1}
+        assert await rollup_differences() == 0
+
+        # Deleting them one at a time takes the politician back to zero once
+        await first.execute("DELETE FROM political_contribution WHERE politician_id = $1 AND amount = 100", politician_id)
+        assert await first.fetchval(
+            "SELECT politicians_supported FROM contributor_totals WHERE contributor_name = 'Concurrent Contributor'"
+        ) == 1
+        await second.execute("DELETE FROM political_contribution WHERE politician_id = $1 AND amount = 50", politician_id)
+        assert await first.fetchval(
+            "SELECT count(*) FROM contributor_totals WHERE contributor_name = 'Concurrent Contributor'"
+        ) == 0
+        assert await rollup_differences() == 0
+    finally:
+        await first.execute("DELETE FROM political_contribution WHERE politician_id = $1", politician_id)
+        await first.execute("DELETE FROM politician WHERE id = $1", politician_id)
@@ -0,0 +1,72 @@
+"""
+Invalidation messages between API workers.
+"""
+import asyncio
+
+import asyncpg
+
+from app.crud.crud_vote import vote
+from app.db import invalidation
+from app.db.invalidation import InvalidationListener
+
+
+def test_messages_apply_in_any_order(monkeypatch):
+    # Two writes of another worker, committed in the opposite order to the
+    # one their messages were built in
+    monkeypatch.setattr(invalidation, "ORIGIN", "other-worker")
+    first = invalidation.message("bill", 1)
+    second = invalidation.message("bill", 2)
+    monkeypatch.undo()
+
+    invalidated = []
+    monkeypatch.setattr(invalidation, "invalidate_table", lambda table, id: invalidated.append((table, id)))
+    listener = InvalidationListener("postgresql://unused", "unused")
+    listener.handle(second)
+    listener.handle(first)
+
+    assert invalidated == [("bill", "2"), ("bill", "1")]
+    assert listener.applied == 2
+
+
+def test_own_messages_are_skipped(monkeypatch):
+    invalidated = []
+    monkeypatch.setattr(invalidation, "invalidate_table", lambda table, id: invalidated.append((table, id)))
+    listener = InvalidationListener("postgresql://unused", "unused")
+    listener.handle(invalidation.message("bill", 1))
+
+    assert invalidated == []
+    assert listener.received == 1
+
+
+def test_messages_drop_cached_counts(monkeypatch):
+    monkeypatch.setattr(invalidation, "ORIGIN", "other-worker")
+    written = invalidation.message("vote", 1)
+    monkeypatch.undo()
+
+    vote._count_cache.set(("exact", (), ()), 3)
+    InvalidationListener("postgresql://unused", "unused").handle(written)
+
+    assert vote._count_cache.get(("exact", (), ())) is None
+
+
+async def test_listener_reconnects_after_interface_errors(monkeypatch):
+    attempts = []
+
+    async def connect(dsn):
+        attempts.append(dsn)
+        raise asyncpg.InterfaceError("connection is closed")
+
+    sleep = asyncio.sleep
+    monkeypatch.setattr(invalidation.asyncpg, "connect", connect)
+    monkeypatch.setattr(invalidation.asyncio, "sleep", lambda delay: sleep(0))
+    listener = InvalidationListener("postgresql://unused", "unused")
+    listener.start()
+    try:
+        for _ in range(100):
+            if len(attempts) >= 3:
+                break
+            await sleep(0)
+        assert len(attempts) >= 3
+        assert listener.stats()["running"]
+    finally:
+        await listener.stop()
@@ -0,0 +1,269 @@
+"""
+Contract between the two engines of GET /politicians/{id}/details.
+
+The PostgreSQL engine must send exactly the bytes the ORM engine produces
+through FastAPI's `PoliticianDetail` serialization, for every page of the
+related collections.
+"""
+import json
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.api.fields import sparse_response
+from app.api.v1.endpoints.politicians import _sparse_detail_schema
+from app.crud.base import CollectionParams
+from app.crud.crud_politician import politician
+from app.models.bill import Bill
+from app.models.political_contribution import PoliticalContribution
+from app.models.politician import Politician
+from app.models.vote import Vote
+from app.schemas.politician.politician import PoliticianDetail
+
+
+async def orm_body(db, id, collections=None) -> bytes:
+    """Response body of the ORM engine."""
+    details = await politician.get_with_relations(db, id=id, collections=collections)
+    content = await serialize_response(
+        field=create_response_field(name="response", type_=PoliticianDetail),
+        response_content=details,
+    )
+    return JSONResponse(content).body
+
+
+async def postgres_body(db, id, collections=None, fields=None) -> bytes:
+    document = await politician.get_details_json(
+        db, id=id, collections=collections, fields=fields
+    )
+    return document.encode()
+
+
+async def test_details_json_matches_orm_for_edge_cases(db):
+    utc = timezone.utc
+    subject = Politician(
+        name='Zoë "Quote" O\'Brien \\ 名前',
+        party=None,
+        position="Senator\nat large\t(acting)",
+        country="Brasil",
+        state_province="São Paulo",
+        bio="Emoji 🗳️ and control \x01 characters",
+        website="https://example.org/a?b=c&d=é",
+        photo_url="https://example.org/photo.png",
+        created_at=datetime(2020, 2, 29, 23, 59, 59, 123456, tzinfo=utc),
+        updated_at=datetime(2021, 1, 1, 0, 0, 0, tzinfo=timezone(timedelta(hours=-3))),
+    )
+    db.add(subject)
+    await db.flush()
+
+    bills = [
+        Bill(
+            bill_number="PL 1/2020",
+            title="Título com acentuação",
+            description=None,
+            introduced_date=date(2020, 1, 31),
+            status=None,
+            sponsor_id=subject.id,
+        ),
+        Bill(
+            bill_number="PL 2/2020",
+            title="Line\r\nbreaks",
+            description="",
+            introduced_date=None,
+            status="passed",
+            sponsor_id=subject.id,
+        ),
+    ]
+    db.add_all(bills)
+    await db.flush()
+
+    db.add_all(
+        [
+            Vote(
+                politician_id=subject.id,
+                bill_id=bills[0].id,
+                bill_title=bills[0].title,
+                vote_date=date(1999, 12, 31),
+                vote_position="yea",
+                vote_result="passed",
+            ),
+            Vote(
+                politician_id=subject.id,
+                bill_id=bills[1].id,
+                bill_title=bills[1].title,
+                vote_date=date(2024, 2, 29),
+                vote_position="not voting",
+                vote_result="failed",
+            ),
+        ]
+    )
+    db.add_all(
+        [
+            PoliticalContribution(
+                politician_id=subject.id,
+                contributor_name=name,
+                contributor_type=kind,
+                amount=amount,
+                contribution_date=date(2022, 6, 1),
+            )
+            for name, kind, amount in (
+                ("Whole", "individual", Decimal("100.00")),
+                ("Cents", "PAC", Decimal("1500.50")),
+                ("Small", None, Decimal("0.01")),
+                ("Large", "party", Decimal("9999999999999.99")),
+                ("Zero", "individual", Decimal("0.00")),
+                ("Negative", "refund", Decimal("-12.30")),
+            )
+        ]
+    )
+    await db.flush()
+    subject_id = subject.id
+    db.expire_all()
+
+    expected = await orm_body(db, subject_id)
+    actual = await postgres_body(db, subject_id)
+
+    assert actual == expected
+    assert len(json.loads(actual)["contributions"]) == 6
+
+
+async def test_details_json_matches_orm_for_collection_pages(db):
+    subject = Politician(name="Paged", country="Brasil")
+    db.add(subject)
+    await db.flush()
+    bills = [
+        Bill(bill_number=f"PL {i % 3}/ção", title=f"Bill {i}", sponsor_id=subject.id)
+        for i in range(5)
+    ]
+    db.add_all(bills)
+    await db.flush()
+    db.add_all(
+        Vote(
+            politician_id=subject.id,
+            bill_id=bills[i % 5].id,
+            bill_title="Bill",
+            # Repeated dates, so pages break ties on id
+            vote_date=date(2024, 1, 1 + i % 4),
+            vote_position="yea",
+            vote_result="passed",
+        )
+        for i in range(7)
+    )
+    db.add_all(
+        PoliticalContribution(
+            politician_id=subject.id,
+            contributor_name=f"Contributor {i}",
+            amount=Decimal(i % 3) * Decimal("10.25"),
+            contribution_date=date(2023, 1 + i, 1),
+        )
+        for i in range(6)
+    )
+    await db.flush()
+    subject_id = subject.id
+    db.expire_all()
+
+    for votes_sort, bills_sort, contributions_sort in (
+        (None, None, None),
+        ("vote_date", "bill_number", "amount"),
+        ("-created_at", "-bill_number", "-amount"),
+    ):
+        collections = {
+            "votes": CollectionParams(limit=3, sort=votes_sort),
+            "sponsored_bills": CollectionParams(limit=2, sort=bills_sort),
+            "contributions": CollectionParams(limit=4, sort=contributions_sort),
+        }
+        seen = {name: [] for name in collections}
+        while True:
+            expected = await orm_body(db, subject_id, collections)
+            assert await postgres_body(db, subject_id, collections) == expected
+
+            document = json.loads(expected)
+            cursors = {}
+            for name, params in collections.items():
+                page = document["collections"][name]
+                seen[name] += [item["id"] for item in document[name]]
+                if page["next_cursor"]:
+                    cursors[name] = CollectionParams(params.limit, page["next_cursor"], params.sort)
+            if not cursors:
+                break
+            collections.update(cursors)
+
+        assert document["collections"]["votes"]["total"] == 7
+        assert {name: len(set(ids)) for name, ids in seen.items()} == {
+            "votes": 7,
+            "sponsored_bills": 5,
+            "contributions": 6,
+        }
+
+
+async def test_details_json_matches_orm_after_a_write(db):
+    subject = Politician(name="Written", country="Brasil")
+    db.add(subject)
+    await db.flush()
+    bill = Bill(bill_number="PL 1/2024", title="Bill", sponsor_id=subject.id)
+    db.add(bill)
+    await db.flush()
+    subject_id = subject.id
+
+    def vote(day: int) -> Vote:
+        return Vote(
+            politician_id=subject_id,
+            bill_id=bill.id,
+            bill_title="Bill",
+            vote_date=date(2024, 1, day),
+            vote_position="yea",
+            vote_result="passed",
+        )
+
+    db.add(vote(1))
+    await db.flush()
+    assert json.loads(await orm_body(db, subject_id))["collections"]["votes"]["total"] == 1
+
+    # A total counted before the write must not be served after it
+    db.add(vote(2))
+    await db.flush()
+    db.expire_all()
+    expected = await orm_body(db, subject_id)
+    assert await postgres_body(db, subject_id) == expected
+    assert json.loads(expected)["collections"]["votes"]["total"] == 2
+
+
+async def test_details_json_matches_orm_without_related_rows(db):
+    subject = Politician(name="Solo", country="Chile")
+    db.add(subject)
+    await db.flush()
+    subject_id = subject.id
+    db.expire_all()
+
+    assert await postgres_body(db, subject_id) == await orm_body(db, subject_id)
+
+
+async def test_details_json_matches_orm_for_sparse_fields(db):
+    subject = Politician(name="Sparse", country="Brasil", bio="Long biography " * 100)
+    db.add(subject)
+    await db.flush()
+    db.add(
+        PoliticalContribution(
+            politician_id=subject.id,
+            contributor_name="Contributor",
+            amount=Decimal("42.00"),
+            contribution_date=date(2023, 1, 1),
+        )
+    )
+    await db.flush()
+    subject_id = subject.id
+    db.expire_all()
+
+    for fields in (("name", "id"), ("id", "contributions"), ("country", "id", "votes", "contributions")):
+        details = await politician.get_with_relations(db, id=subject_id, fields=fields)
+        expected = sparse_response(details, _sparse_detail_schema(fields)).body
+        actual = await postgres_body(db, subject_id, fields=fields)
+        assert actual == expected
+        assert "bio" not in json.loads(actual)
+
+
+async def test_details_json_missing_politician(db):
+    assert await politician.get_details_json(db, id=uuid4()) is None
@@ -0,0 +1,483 @@
+"""
+Query plans of the API endpoints.
+
+The `small` synthetic dataset (see app/db/synthetic.py) is loaded in a
+transaction rolled back at the end of the module, every endpoint of
+app/api/v1/endpoints is called on it, and each SQL statement the call runs
+is explained and checked (see tests/plans.py): no sequential scan of a
+large table, a bounded number of estimated rows, and long sorted lists read
+in index order. A failing plan is reported as a diff of its outline.
+
+Statements are captured as the driver receives them, so a change of filter
+or sort that makes the planner give up an index fails here. The write
+endpoints run after every read endpoint, on records the reads do not refer
+to. The bulk loads are not covered: COPY has no query plan, and they run
+on a pooled connection of their own. Statements run by the triggers are
+not captured either; tests/test_vote_stats.py and
+tests/test_contributor_totals.py cover them.
+"""
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, FrozenSet, List, Optional, Tuple
+from uuid import UUID
+
+import httpx
+import pytest
+from fastapi.routing import APIRoute
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core import cache
+from app.core.config import settings
+from app.crud import export
+from app.crud.crud_bill import bill
+from app.crud.crud_contribution import contribution
+from app.crud.crud_politician import politician
+from app.crud.crud_vote import vote
+from app.db.partitions import PARTITIONED_TABLE
+from app.db.session import get_db
+from app.db.synthetic import PRESETS, SyntheticData, load
+from app.main import app
+from tests.plans import LARGE_TABLE_ROWS, check_plan, plan_diff
+
+# Relations with LARGE_TABLE_ROWS rows or more, and their partitioned table
+LARGE_TABLES = """
+SELECT c.relname, coalesce(parent.relname, c.relname)
+FROM pg_class c
+LEFT JOIN pg_inherits i ON i.inhrelid = c.oid
+LEFT JOIN pg_class parent ON parent.oid = i.inhparent
+WHERE c.relkind IN ('r', 'p', 'm') AND c.reltuples >= :rows
+"""
+
+# GIN indexes keep new entries in a pending list until a vacuum merges
+# them, and the planner prices scanning that list: merge it after the load,
+# as autovacuum would have
+CLEAN_GIN_PENDING_LISTS = """
+SELECT gin_clean_pending_list(i.indexrelid::regclass)
+FROM pg_index i
+JOIN pg_class c ON c.oid = i.indexrelid
+JOIN pg_am am ON am.oid = c.relam
+WHERE am.amname = 'gin' AND c.relkind = 'i' AND c.relnamespace = current_schema()::regnamespace
+"""
+
+BATCH_SIZE = 20
+
+
+def sample_ids(data: SyntheticData) -> Dict[str, Any]:
+    """
+    IDs and values of the dataset the cases refer to.
+
+    Politician 0 is a legislator, the most frequent sponsor and recipient of
+    contributions. The votes of the first bill voted on are the first votes.
+    The spare records, which the write cases update and delete, are in no
+    batch and are none of the records above: a legislator, a voted bill, a
+    vote of a later roll call and a contribution.
+    """
+    voted = [n for n, support in enumerate(data.support) if support is not None]
+    return {
+        "politician": str(data.row_id("politician", 0)),
+        "bill": str(data.row_id("bill", voted[0])),
+        "vote": str(data.row_id("vote", 0)),
+        "contribution": str(data.row_id(PARTITIONED_TABLE, 0)),
+        # A donor of middle rank, with a few contributions
+        "contributor": data.donor(1000)[0],
+        "spare_politician": str(data.row_id("politician", BATCH_SIZE)),
+        "spare_bill": str(data.row_id("bill", next(n for n in voted if n >= BATCH_SIZE))),
+        "spare_vote": str(data.row_id("vote", 50 * BATCH_SIZE)),
+        "spare_contribution": str(data.row_id(PARTITIONED_TABLE, BATCH_SIZE)),
+        "batches": {
+            "politicians": [str(data.row_id("politician", n)) for n in range(BATCH_SIZE)],
+            "bills": [str(data.row_id("bill", n)) for n in range(BATCH_SIZE)],
+            "votes": [str(data.row_id("vote", n)) for n in range(BATCH_SIZE)],
+            "contributions": [str(data.row_id(PARTITIONED_TABLE, n)) for n in range(BATCH_SIZE)],
+        },
+    }
+
+
+@dataclass(frozen=True)
+class Case:
+    """
+    An endpoint call and what its plans may do.
+
+    Attributes:
+        path: Path under the API prefix; `{politician}`, `{bill}`, `{vote}`
+            and `{contribution}` (and `{spare_politician}` and so on) are
+            replaced by IDs of the dataset
+        params: Query parameters, with the same replacements and
+            `{contributor}` (a contributor name)
+        method: HTTP method
+        body: JSON body, with the same replacements in its string values
+        status: Expected response status
+        batch: Batch-get of these records (a key of the sample batches):
+            their IDs are sent as the `ids` parameter or in the JSON body
+        max_rows: Maximum estimated rows of a statement, None for no bound
+        full_scans: Tables whose sequential scan is expected, such as the
+            exact total of an unfiltered list
+        sorts: Whether sorting many rows is expected, such as ranking search
+            results
+        next_page: Also request the page of the returned `next_cursor`
+    """
+
+    path: str
+    params: Dict[str, str] = field(default_factory=dict)
+    method: str = "GET"
+    body: Optional[Dict[str, Any]] = None
+    status: int = 200
+    batch: Optional[str] = None
+    max_rows: Optional[int] = 101
+    full_scans: FrozenSet[str] = frozenset()
+    sorts: bool = False
+    next_page: bool = False
+
+
+CASES = {
+    # Politicians
+    "politicians-total": Case("/politicians", full_scans=frozenset({"politician"})),
+    "politicians-by-created": Case(
+        "/politicians", {"count_mode": "none", "sort": "-created_at", "limit": "50"}, next_page=True
+    ),
+    "politicians-by-name": Case("/politicians", {"name": "natália oliveira", "count_mode": "estimate"}),
+    "politicians-fuzzy-name": Case("/politicians", {"name": "Mariana Olivera", "match": "fuzzy"}, sorts=True),
+    "politicians-by-state": Case("/politicians", {"state_province": "SP", "party": "PT"}, next_page=True),
+    "politician": Case("/politicians/{politician}"),
+    # Counts the sponsored bills too, see bills-by-sponsor
+    "politician-details": Case(
+        "/politicians/{politician}/details", {"votes_sort": "-vote_date"}, full_scans=frozenset({"bill"})
+    ),
+    "politician-contributions": Case("/politicians/{politician}/contributions"),
+    "politicians-batch-get": Case("/politicians/batch-get", batch="politicians"),
+    "politicians-batch-post": Case("/politicians/batch-get", method="POST", batch="politicians"),
+    # Bills
+    "bills-total": Case("/bills", full_scans=frozenset({"bill"})),
+    "bills-by-number": Case("/bills", {"count_mode": "none", "sort": "bill_number"}, next_page=True),
+    # Politician 0 sponsors 15% of the bills. Counting them is an index-only
+    # scan of ix_bill_sponsor_id_updated_at once the table is vacuumed, which
+    # the rolled-back load never is, so the planner reads the whole table.
+    "bills-by-sponsor": Case(
+        "/bills", {"sponsor_id": "{politician}", "expand": "sponsor"}, full_scans=frozenset({"bill"})
+    ),
+    "bills-search": Case("/bills/search", {"q": "saúde pública"}, sorts=True),
+    "bill": Case("/bills/{bill}"),
+    "bills-batch-get": Case("/bills/batch-get", batch="bills"),
+    "bills-batch-post": Case("/bills/batch-get", method="POST", batch="bills"),
+    # Votes
+    "votes-total": Case("/votes", full_scans=frozenset({"vote"})),
+    "votes-by-date": Case("/votes", {"count_mode": "none"}, next_page=True),
+    "votes-by-politician": Case("/votes", {"politician_id": "{politician}"}, next_page=True),
+    # Expands a page of 100 legislators: fewer pages to read the whole
+    # politician table than to look each of them up in its primary key
+    "votes-by-bill": Case(
+        "/votes",
+        {"bill_id": "{bill}", "vote_position": "yea", "expand": "politician"},
+        full_scans=frozenset({"politician"}),
+    ),
+    "votes-in-period": Case(
+        "/votes", {"from_date": "2020-03-01", "to_date": "2020-03-31", "count_mode": "estimate"}
+    ),
+    "votes-export": Case("/votes/export", {"politician_id": "{politician}"}, max_rows=None),
+    "vote": Case("/votes/{vote}"),
+    "votes-batch-get": Case("/votes/batch-get", batch="votes"),
+    "votes-batch-post": Case("/votes/batch-get", method="POST", batch="votes"),
+    "votes-statistics": Case("/votes/statistics/by-politician"),
+    # Contributions
+    "contributions-total": Case("/contributions", full_scans=frozenset({PARTITIONED_TABLE})),
+    "contributions-by-amount": Case("/contributions", {"count_mode": "none", "sort": "-amount"}, next_page=True),
+    "contributions-by-politician": Case("/contributions", {"politician_id": "{politician}"}, next_page=True),
+    "contributions-in-period": Case(
+        "/contributions",
+        {"from_date": "2022-05-01", "to_date": "2022-05-31", "sort": "contribution_date"},
+        next_page=True,
+    ),
+    "contributions-by-contributor": Case(
+        "/contributions", {"contributor_name": "{contributor}", "expand": "politician"}
+    ),
+    # Every contribution of the politician, across the yearly partitions: the
+    # planner sorts them rather than merge the partitions in index order
+    "contributions-export": Case(
+        "/contributions/export", {"politician_id": "{politician}"}, max_rows=None, sorts=True
+    ),
+    "contribution": Case("/contributions/{contribution}"),
+    # The IDs could be in any yearly partition: the planner expects the whole
+    # batch from each of them
+    "contributions-batch-get": Case("/contributions/batch-get", batch="contributions", max_rows=None),
+    "contributions-batch-post": Case(
+        "/contributions/batch-get", method="POST", batch="contributions", max_rows=None
+    ),
+    "top-contributors": Case("/contributions/statistics/top-contributors"),
+    # Ranks the contributors of the politician: all their monthly buckets
+    # are aggregated and sorted
+    "top-contributors-of-politician": Case(
+        "/contributions/statistics/top-contributors", {"politician_id": "{politician}"}, sorts=True
+    ),
+    # One row per month, up to the default limit of the endpoint
+    "party-totals": Case("/contributions/statistics/by-party", {"party": "PT"}, max_rows=500),
+    # Writes, last as they change the dataset; a politician or a bill is
+    # deleted after the votes and contributions
+    "vote-create": Case(
+        "/votes",
+        method="POST",
+        body={
+            "politician_id": "{politician}",
+            "bill_id": "{bill}",
+            "bill_title": "Plan",
+            "vote_date": "2024-06-03",
+            "vote_position": "yea",
+            "vote_result": "passed",
+        },
+        status=201,
+    ),
+    "vote-update": Case("/votes/{spare_vote}", method="PUT", body={"vote_position": "nay"}),
+    "vote-delete": Case("/votes/{spare_vote}", method="DELETE"),
+    "contribution-create": Case(
+        "/contributions",
+        method="POST",
+        body={
+            "politician_id": "{politician}",
+            "contributor_name": "Plan",
+            "amount": 100,
+            "contribution_date": "2024-06-03",
+        },
+        status=201,
+    ),
+    "contribution-update": Case("/contributions/{spare_contribution}", method="PUT", body={"amount": 250}),
+    "contribution-delete": Case("/contributions/{spare_contribution}", method="DELETE"),
+    "bill-create": Case(
+        "/bills",
+        method="POST",
+        body={"bill_number": "PL 1/2099", "title": "Plan", "sponsor_id": "{politician}"},
+        status=201,
+    ),
+    "bill-update": Case("/bills/{spare_bill}", method="PUT", body={"status": "Arquivado"}),
+    "bill-delete": Case("/bills/{spare_bill}", method="DELETE"),
+    "politician-create": Case("/politicians", method="POST", body={"name": "Plan", "country": "Brasil"}, status=201),
+    "politician-update": Case("/politicians/{spare_politician}", method="PUT", body={"party": "PV"}),
+    "politician-delete": Case("/politicians/{spare_politician}", method="DELETE"),
+}
+
+# Monitoring routes, not part of the data API
+UNCHECKED_PREFIX = "/health"
+
+# COPY loads, see the module docstring
+UNCHECKED_SUFFIX = "/bulk"
+
+# Statements the checks explain
+EXPLAINED_STATEMENTS = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+# Any ID, to match the paths of the cases with the routes
+PLACEHOLDER_IDS = {
+    prefix + name: str(UUID(int=0))
+    for name in ("politician", "bill", "vote", "contribution")
+    for prefix in ("", "spare_")
+}
+
+
+@dataclass
+class Dataset:
+    """The seeded connection and the statements captured on it."""
+
+    connection: AsyncConnection
+    session: AsyncSession
+    large_tables: Dict[str, str]
+    ids: Dict[str, Any]
+    statements: List[Tuple[str, Any]] = field(default_factory=list)
+    recording: bool = False
+
+
+@pytest.fixture(scope="module")
+def event_loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="module")
+async def dataset() -> AsyncIterator[Dataset]:
+    engine = create_async_engine(str(settings.DATABASE_URL), poolclass=NullPool)
+    try:
+        connection = await engine.connect()
+    except (OSError, ConnectionError) as e:
+        await engine.dispose()
+        pytest.skip(f"PostgreSQL not available: {e}")
+    transaction = await connection.begin()
+    try:
+        session = AsyncSession(bind=connection, expire_on_commit=False, join_transaction_mode="create_savepoint")
+        synthetic = SyntheticData(PRESETS["small"])
+        raw = await (await session.connection()).get_raw_connection()
+        await load(raw.driver_connection, synthetic)
+        await connection.execute(text(CLEAN_GIN_PENDING_LISTS))
+        result = await connection.execute(text(LARGE_TABLES), {"rows": LARGE_TABLE_ROWS})
+        data = Dataset(
+            connection=connection,
+            session=session,
+            large_tables=dict(result.all()),
+            ids=sample_ids(synthetic),
+        )
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if data.recording and statement.lstrip().upper().startswith(EXPLAINED_STATEMENTS):
+                # Every parameter set of an executemany gets the same plan
+                data.statements.append((statement, parameters[0] if executemany else parameters))
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            yield data
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+            await data.session.close()
+    finally:
+        await transaction.rollback()
+        await connection.close()
+        await engine.dispose()
+
+
+@pytest.fixture(scope="module")
+async def client(dataset: Dataset) -> AsyncIterator[httpx.AsyncClient]:
+    async def seeded_db() -> AsyncIterator[AsyncSession]:
+        yield dataset.session
+
+    def export_session() -> AsyncSession:
+        return AsyncSession(bind=dataset.connection, join_transaction_mode="create_savepoint")
+
+    app.dependency_overrides[get_db] = seeded_db
+    try:
+        with pytest.MonkeyPatch.context() as patch:
+            # Exports open their own session; give them the seeded connection
+            patch.setattr(export, "AsyncSessionLocal", export_session)
+            async with httpx.AsyncClient(app=app, base_url=f"http://test{settings.API_PREFIX}") as client:
+                yield client
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+async def call(client: httpx.AsyncClient, dataset: Dataset, case: Case) -> List[Tuple[str, Any]]:
+    """Call the endpoint of a case, cold, and return the statements it ran."""
+    cache.clear_all()
+    for crud in (politician, bill, vote, contribution):
+        crud._count_cache.clear()
+    dataset.session.expunge_all()
+    dataset.statements.clear()
+
+    dataset.recording = True
+    try:
+        path = case.path.format(**dataset.ids)
+        params = {name: value.format(**dataset.ids) for name, value in case.params.items()}
+        body = None
+        if case.body is not None:
+            body = {
+                name: value.format(**dataset.ids) if isinstance(value, str) else value
+                for name, value in case.body.items()
+            }
+        if case.batch:
+            batch = dataset.ids["batches"][case.batch]
+            if case.method == "POST":
+                body = {"ids": batch}
+            else:
+                params["ids"] = ",".join(batch)
+        response = await client.request(case.method, path, params=params, json=body)
+        assert response.status_code == case.status, response.text
+        if case.next_page:
+            cursor = response.json().get("next_cursor")
+            assert cursor, f"{path} returned a single page"
+            response = await client.get(path, params={**params, "cursor": cursor})
+            assert response.status_code == 200, response.text
+    finally:
+        dataset.recording = False
+    return list(dataset.statements)
+
+
+async def explain(connection: AsyncConnection, statement: str, parameters: Any) -> Dict[str, Any]:
+    """Root node of the plan of a captured statement."""
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+@pytest.mark.parametrize("case", [pytest.param(case, id=name) for name, case in CASES.items()])
+async def test_query_plan(client: httpx.AsyncClient, dataset: Dataset, case: Case):
+    statements = await call(client, dataset, case)
+    assert statements, f"No statement captured for {case.path}"
+
+    failures = []
+    for statement, parameters in statements:
+        plan = await explain(dataset.connection, statement, parameters)
+        expected = check_plan(
+            plan,
+            large_tables=dataset.large_tables,
+            max_rows=case.max_rows,
+            full_scans=case.full_scans,
+            sorts=case.sorts,
+        )
+        if expected:
+            failures.append(plan_diff(statement, plan, expected))
+    assert not failures, f"{case.method} {case.path} {case.params}\n\n" + "\n\n".join(failures)
+
+
+def test_every_route_has_a_case():
+    routes = [
+        route
+        for route in app.routes
+        if isinstance(route, APIRoute) and route.path.startswith(settings.API_PREFIX)
+    ]
+
+    def route_of(case: Case) -> Optional[APIRoute]:
+        # The first matching route, as the router resolves it
+        path = settings.API_PREFIX + case.path.format_map(PLACEHOLDER_IDS)
+        for route in routes:
+            if case.method in route.methods and route.path_regex.match(path):
+                return route
+        return None
+
+    unmatched = [name for name, case in CASES.items() if route_of(case) is None]
+    assert not unmatched, f"Cases matching no route: {unmatched}"
+
+    covered = {(case.method, route_of(case).path) for case in CASES.values()}
+    missing = [
+        f"{method} {route.path}"
+        for route in routes
+        for method in sorted(route.methods)
+        if not route.path.startswith(settings.API_PREFIX + UNCHECKED_PREFIX)
+        and not route.path.endswith(UNCHECKED_SUFFIX)
+        and (method, route.path) not in covered
+    ]
+    assert not missing, f"Routes without a query plan case: {missing}"
+
+
+def test_failing_plan_reads_as_a_diff():
+    plan = {
+        "Node Type": "Limit",
+        "Plan Rows": 21,
+        "Plans": [
+            {
+                "Node Type": "Sort",
+                "Parent Relationship": "Outer",
+                "Sort Key": ["vote.vote_date DESC"],
+                "Plan Rows": 240000,
+                "Plans": [
+                    {
+                        "Node Type": "Seq Scan",
+                        "Parent Relationship": "Outer",
+                        "Relation Name": "vote",
+                        "Plan Rows": 240000,
+                    }
+                ],
+            }
+        ],
+    }
+    expected = check_plan(plan, large_tables={"vote": "vote"}, max_rows=21)
+
+    assert plan_diff("SELECT * FROM vote", plan, expected).splitlines() == [
+        "SELECT * FROM vote",
+        "--- expected",
+        "+++ actual",
+        "@@ -1,3 +1,3 @@",
+        " Limit rows=21",
+        "-  Sort by vote.vote_date DESC rows<=1000 (or read in index order)",
+        "-    Index Scan on vote (no Seq Scan of a large table)",
+        "+  Sort by vote.vote_date DESC rows=240000",
+        "+    Seq Scan on vote rows=240000",
+    ]
+    assert check_plan(plan, large_tables={"vote": "vote"}, max_rows=21, full_scans={"vote"}, sorts=True) == {}
@@ -0,0 +1,52 @@
+"""
+Fast serialization path of the list endpoints.
+
+With `FAST_LIST_SERIALIZATION` on or off, a list endpoint must send the
+same items.
+"""
+from typing import Any, AsyncIterator, Dict, List
+
+import httpx
+
+from app.core import cache
+from app.core.config import settings
+from app.db.session import get_db
+from app.main import app
+from app.models.bill import Bill
+from app.models.politician import Politician
+
+
+async def list_items(db, monkeypatch, path: str, params: Dict[str, str], fast: bool) -> List[Any]:
+    async def test_db() -> AsyncIterator[Any]:
+        yield db
+
+    monkeypatch.setattr(settings, "FAST_LIST_SERIALIZATION", fast)
+    cache.clear_all()
+    app.dependency_overrides[get_db] = test_db
+    try:
+        async with httpx.AsyncClient(app=app, base_url=f"http://test{settings.API_PREFIX}") as client:
+            response = await client.get(path, params=params)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+    assert response.status_code == 200, response.text
+    return response.json()["items"]
+
+
+async def test_fast_path_normalizes_urls_like_the_default_path(db, monkeypatch):
+    # Stored as written by an import, not normalized by the API schemas
+    subject = Politician(name="Url Test", country="Brasil", photo_url="HTTPS://Example.org")
+    db.add(subject)
+    await db.flush()
+    db.add(Bill(bill_number="PL 1/2024", title="Url", sponsor_id=subject.id, full_text_url="http://example.org:80"))
+    await db.flush()
+
+    for path, params in (
+        ("/politicians", {"name": "Url Test", "count_mode": "none"}),
+        ("/bills", {"sponsor_id": str(subject.id), "count_mode": "none"}),
+    ):
+        default = await list_items(db, monkeypatch, path, params, fast=False)
+        fast = await list_items(db, monkeypatch, path, params, fast=True)
+        assert fast == default
+        assert len(fast) == 1
+
+    assert default[0]["full_text_url"] == "http://example.org/"
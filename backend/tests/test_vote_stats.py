@@ -0,0 +1,92 @@
+"""
+Trigger-maintained vote statistics under concurrent writes.
+
+Writes are committed by two connections at once, so this test cleans up
+after itself instead of rolling back, and expects the vote tables to hold
+no other committed rows it could disturb.
+"""
+import asyncio
+import uuid
+from datetime import date
+from typing import AsyncIterator, List
+
+import asyncpg
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.crud.crud_vote import vote
+
+INSERT_VOTE = """
+INSERT INTO vote (id, politician_id, bill_id, bill_title, vote_date, vote_position, vote_result)
+VALUES ($1, $2, $3, 'Concurrent', $4, $5, 'passed')
+"""
+
+
+@pytest.fixture
+async def connections() -> AsyncIterator[List[asyncpg.Connection]]:
+    dsn = str(settings.DATABASE_URL).replace("+asyncpg", "")
+    try:
+        opened = [await asyncpg.connect(dsn) for _ in range(2)]
+    except (OSError, ConnectionError) as e:
+        pytest.skip(f"PostgreSQL not available: {e}")
+    try:
+        yield opened
+    finally:
+        for conn in opened:
+            await conn.close()
+
+
+async def statistics_differences() -> int:
+    """Rows of the statistics differing from a recount, as `rebuild-vote-stats --check`."""
+    engine = create_async_engine(str(settings.DATABASE_URL), poolclass=NullPool)
+    try:
+        async with AsyncSession(engine) as db:
+            return await vote.rebuild_statistics(db, check=True)
+    finally:
+        await engine.dispose()
+
+
+async def test_concurrent_first_votes_on_a_bill_count_it_once(connections):
+    first, second = connections
+    politician_id, bill_id = uuid.uuid4(), uuid.uuid4()
+    await first.execute(
+        "INSERT INTO politician (id, name, country) VALUES ($1, 'Concurrent', 'Brasil')", politician_id
+    )
+    await first.execute(
+        "INSERT INTO bill (id, bill_number, title) VALUES ($1, 'PL 0/0000', 'Concurrent')", bill_id
+    )
+    try:
+        # Both transactions add the first vote of the politician on the bill
+        first_tx, second_tx = first.transaction(), second.transaction()
+        await first_tx.start()
+        await second_tx.start()
+        await first.execute(INSERT_VOTE, uuid.uuid4(), politician_id, bill_id, date(2024, 1, 1), "yea")
+        blocked = asyncio.create_task(
+            second.execute(INSERT_VOTE, uuid.uuid4(), politician_id, bill_id, date(2024, 1, 2), "nay")
+        )
+        await asyncio.sleep(0.5)
+        assert not blocked.done(), "The second vote did not wait for the first transaction's pair count"
+        await first_tx.commit()
+        await blocked
+        await second_tx.commit()
+
+        stats = await first.fetchrow(
+            "SELECT total_votes, yea_votes, nay_votes, bills_voted FROM politician_vote_stats "
+            "WHERE politician_id = $1",
+            politician_id,
+        )
+        assert dict(stats) == {"total_votes": 2, "yea_votes": 1, "nay_votes": 1, "bills_voted": 1}
+        assert await statistics_differences() == 0
+
+        # Deleting them one at a time takes the bill back to zero once
+        await first.execute("DELETE FROM vote WHERE politician_id = $1 AND vote_position = 'yea'", politician_id)
+        await second.execute("DELETE FROM vote WHERE politician_id = $1 AND vote_position = 'nay'", politician_id)
+        assert await first.fetchval(
+            "SELECT bills_voted FROM politician_vote_stats WHERE politician_id = $1", politician_id
+        ) == 0
+        assert await statistics_differences() == 0
+    finally:
+        await first.execute("DELETE FROM politician WHERE id = $1", politician_id)
+        await first.execute("DELETE FROM bill WHERE id = $1", bill_id)
@@ -4,6 +4,13 @@
 -- Enable necessary extensions
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS "pgcrypto";
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
+CREATE EXTENSION IF NOT EXISTS "unaccent";
+
+-- unaccent() is only STABLE; pinning the dictionary makes it usable in indexes
+CREATE OR REPLACE FUNCTION immutable_unaccent(text) RETURNS text AS $$
+    SELECT public.unaccent('public.unaccent'::regdictionary, $1)
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT;
 
 -- Create tables for political data
 
@@ -33,6 +40,14 @@ CREATE TABLE IF NOT EXISTS bill (
     status VARCHAR(100),
     sponsor_id UUID REFERENCES politician(id) ON DELETE SET NULL,
     full_text_url VARCHAR(255),
+    -- Full-text search: stemmed Portuguese (title A, description B) + unstemmed simple (C)
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('portuguese', immutable_unaccent(coalesce(title, ''))), 'A') ||
+        setweight(to_tsvector('portuguese', immutable_unaccent(coalesce(description, ''))), 'B') ||
+        setweight(to_tsvector('simple', immutable_unaccent(
+            bill_number || ' ' || coalesce(title, '') || ' ' || coalesce(description, '')
+        )), 'C')
+    ) STORED,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     deleted_at TIMESTAMP WITH TIME ZONE
@@ -52,9 +67,9 @@ CREATE TABLE IF NOT EXISTS vote (
     deleted_at TIMESTAMP WITH TIME ZONE
 );
 
--- Table: political_contributions
+-- Table: political_contributions, range-partitioned by year of contribution_date
 CREATE TABLE IF NOT EXISTS political_contribution (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
     politician_id UUID NOT NULL REFERENCES politician(id) ON DELETE CASCADE,
     contributor_name VARCHAR(255) NOT NULL,
     contributor_type VARCHAR(100), -- 'Partido', 'Associação', 'Grupo Industrial', etc.
@@ -62,25 +77,346 @@ CREATE TABLE IF NOT EXISTS political_contribution (
     contribution_date DATE NOT NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-    deleted_at TIMESTAMP WITH TIME ZONE
+    deleted_at TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id, contribution_date)
+) PARTITION BY RANGE (contribution_date);
+
+-- Yearly partitions political_contribution_y<year> between the two years;
+-- rows of such a year that went to the DEFAULT partition are moved into
+-- its new partition. Returns the number of partitions created.
+CREATE OR REPLACE FUNCTION ensure_contribution_partitions(
+    first_year int,
+    last_year int,
+    parent text DEFAULT 'political_contribution'
+) RETURNS int AS $$
+DECLARE
+    year int;
+    partition text;
+    default_partition regclass;
+    created int := 0;
+BEGIN
+    SELECT nullif(partdefid, 0)::regclass INTO default_partition
+    FROM pg_partitioned_table
+    WHERE partrelid = parent::regclass;
+
+    FOR year IN first_year..last_year LOOP
+        partition := format('political_contribution_y%s', year);
+        CONTINUE WHEN to_regclass(partition) IS NOT NULL;
+
+        IF default_partition IS NOT NULL THEN
+            EXECUTE format('CREATE TEMP TABLE moved_contributions AS SELECT * FROM %s WITH NO DATA',
+                           default_partition);
+            EXECUTE format($sql$
+                WITH moved AS (
+                    DELETE FROM %s WHERE contribution_date >= %L AND contribution_date < %L
+                    RETURNING *
+                )
+                INSERT INTO moved_contributions SELECT * FROM moved
+            $sql$, default_partition, make_date(year, 1, 1), make_date(year + 1, 1, 1));
+        END IF;
+
+        EXECUTE format('CREATE TABLE %I PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',
+                       partition, parent::regclass, make_date(year, 1, 1), make_date(year + 1, 1, 1));
+
+        IF default_partition IS NOT NULL THEN
+            -- Straight into the partition: the rows only move, so the rollup
+            -- triggers on the parent must not see them
+            EXECUTE format('INSERT INTO %I SELECT * FROM moved_contributions', partition);
+            DROP TABLE moved_contributions;
+        END IF;
+        created := created + 1;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TABLE IF NOT EXISTS political_contribution_default PARTITION OF political_contribution DEFAULT;
+SELECT ensure_contribution_partitions(
+    extract(year FROM current_date)::int - 10,
+    extract(year FROM current_date)::int + 2
 );
 
 -- Create indexes for better query performance
-CREATE INDEX IF NOT EXISTS idx_politician_name ON politician(name);
 CREATE INDEX IF NOT EXISTS idx_politician_party ON politician(party);
 CREATE INDEX IF NOT EXISTS idx_politician_country ON politician(country);
 CREATE INDEX IF NOT EXISTS idx_politician_state_province ON politician(state_province);
 
-CREATE INDEX IF NOT EXISTS idx_bill_bill_number ON bill(bill_number);
 CREATE INDEX IF NOT EXISTS idx_bill_introduced_date ON bill(introduced_date);
 CREATE INDEX IF NOT EXISTS idx_bill_status ON bill(status);
-CREATE INDEX IF NOT EXISTS idx_bill_sponsor_id ON bill(sponsor_id);
-
-CREATE INDEX IF NOT EXISTS idx_vote_politician_id ON vote(politician_id);
-CREATE INDEX IF NOT EXISTS idx_vote_bill_id ON vote(bill_id);
-CREATE INDEX IF NOT EXISTS idx_vote_vote_date ON vote(vote_date);
+CREATE INDEX IF NOT EXISTS ix_bill_search_vector ON bill USING gin (search_vector);
 
-CREATE INDEX IF NOT EXISTS idx_contribution_politician_id ON political_contribution(politician_id);
 CREATE INDEX IF NOT EXISTS idx_contribution_contributor_name ON political_contribution(contributor_name);
-CREATE INDEX IF NOT EXISTS idx_contribution_amount ON political_contribution(amount);
-CREATE INDEX IF NOT EXISTS idx_contribution_date ON political_contribution(contribution_date);
+
+-- Composite indexes backing keyset pagination (sort key + id)
+CREATE INDEX IF NOT EXISTS ix_politician_name_id ON politician(name, id);
+CREATE INDEX IF NOT EXISTS ix_politician_created_at_id ON politician(created_at, id);
+CREATE INDEX IF NOT EXISTS ix_bill_created_at_id ON bill(created_at, id);
+CREATE INDEX IF NOT EXISTS ix_bill_bill_number_id ON bill(bill_number, id);
+CREATE INDEX IF NOT EXISTS ix_vote_vote_date_id ON vote(vote_date, id);
+CREATE INDEX IF NOT EXISTS ix_vote_created_at_id ON vote(created_at, id);
+CREATE INDEX IF NOT EXISTS ix_political_contribution_contribution_date_id ON political_contribution(contribution_date, id);
+CREATE INDEX IF NOT EXISTS ix_political_contribution_amount_id ON political_contribution(amount, id);
+CREATE INDEX IF NOT EXISTS ix_political_contribution_created_at_id ON political_contribution(created_at, id);
+
+-- Indexes answering ETag/Last-Modified version lookups
+CREATE INDEX IF NOT EXISTS ix_politician_id_updated_at ON politician(id) INCLUDE (updated_at);
+CREATE INDEX IF NOT EXISTS ix_bill_id_updated_at ON bill(id) INCLUDE (updated_at);
+CREATE INDEX IF NOT EXISTS ix_vote_id_updated_at ON vote(id) INCLUDE (updated_at);
+CREATE INDEX IF NOT EXISTS ix_political_contribution_id_updated_at ON political_contribution(id) INCLUDE (updated_at);
+CREATE INDEX IF NOT EXISTS ix_politician_updated_at ON politician(updated_at);
+CREATE INDEX IF NOT EXISTS ix_bill_updated_at ON bill(updated_at);
+CREATE INDEX IF NOT EXISTS ix_vote_updated_at ON vote(updated_at);
+CREATE INDEX IF NOT EXISTS ix_political_contribution_updated_at ON political_contribution(updated_at);
+CREATE INDEX IF NOT EXISTS ix_bill_sponsor_id_updated_at ON bill(sponsor_id, updated_at);
+CREATE INDEX IF NOT EXISTS ix_vote_politician_id_updated_at ON vote(politician_id, updated_at);
+CREATE INDEX IF NOT EXISTS ix_vote_bill_id_updated_at ON vote(bill_id, updated_at);
+CREATE INDEX IF NOT EXISTS ix_political_contribution_politician_id_updated_at ON political_contribution(politician_id, updated_at);
+
+-- Pages of one politician's votes, bills and contributions
+CREATE INDEX IF NOT EXISTS ix_vote_politician_id_vote_date_id ON vote(politician_id, vote_date, id);
+CREATE INDEX IF NOT EXISTS ix_vote_politician_id_created_at_id ON vote(politician_id, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_bill_sponsor_id_created_at_id ON bill(sponsor_id, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_bill_sponsor_id_bill_number_id ON bill(sponsor_id, bill_number, id);
+CREATE INDEX IF NOT EXISTS ix_political_contribution_politician_id_contribution_date_id ON political_contribution(politician_id, contribution_date, id) INCLUDE (amount);
+CREATE INDEX IF NOT EXISTS ix_political_contribution_politician_id_amount_id ON political_contribution(politician_id, amount, id);
+CREATE INDEX IF NOT EXISTS ix_political_contribution_politician_id_created_at_id ON political_contribution(politician_id, created_at, id);
+
+-- Votes on a bill by position, a sponsor's bills by introduction date
+CREATE INDEX IF NOT EXISTS ix_vote_bill_id_vote_position_vote_date_id ON vote(bill_id, vote_position, vote_date, id);
+CREATE INDEX IF NOT EXISTS ix_bill_sponsor_id_introduced_date_id ON bill(sponsor_id, introduced_date, id);
+
+-- Trigram indexes for accent-insensitive partial and fuzzy name search
+CREATE INDEX IF NOT EXISTS ix_politician_name_trgm ON politician USING gin (immutable_unaccent(name) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_political_contribution_contributor_name_trgm ON political_contribution USING gin (immutable_unaccent(contributor_name) gin_trgm_ops);
+
+-- Whether a politician still has votes on a bill (vote statistics triggers)
+CREATE INDEX IF NOT EXISTS ix_vote_politician_id_bill_id ON vote(politician_id, bill_id);
+
+-- Vote counts per politician, maintained by statement-level triggers on vote
+CREATE TABLE IF NOT EXISTS politician_vote_stats (
+    politician_id UUID PRIMARY KEY REFERENCES politician(id) ON DELETE CASCADE,
+    total_votes BIGINT NOT NULL DEFAULT 0,
+    yea_votes BIGINT NOT NULL DEFAULT 0,
+    nay_votes BIGINT NOT NULL DEFAULT 0,
+    bills_voted BIGINT NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_politician_vote_stats_total_votes ON politician_vote_stats(total_votes, politician_id);
+
+-- Adds the signed deltas of the rows a statement moved in or out of vote
+CREATE OR REPLACE FUNCTION politician_vote_stats_apply() RETURNS trigger AS $$
+DECLARE
+    delta text;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        delta := 'SELECT politician_id, bill_id, vote_position, 1 AS sign FROM new_rows';
+    ELSIF TG_OP = 'DELETE' THEN
+        delta := 'SELECT politician_id, bill_id, vote_position, -1 AS sign FROM old_rows';
+    ELSE
+        delta := 'SELECT politician_id, bill_id, vote_position, -1 AS sign FROM old_rows '
+              || 'UNION ALL SELECT politician_id, bill_id, vote_position, 1 FROM new_rows';
+    END IF;
+
+    EXECUTE format($sql$
+        WITH delta AS (%s),
+        counts AS (
+            SELECT politician_id,
+                   sum(sign) AS total_votes,
+                   coalesce(sum(sign) FILTER (WHERE vote_position = 'yea'), 0) AS yea_votes,
+                   coalesce(sum(sign) FILTER (WHERE vote_position = 'nay'), 0) AS nay_votes
+            FROM delta
+            GROUP BY politician_id
+        ),
+        bills AS (
+            SELECT pair.politician_id,
+                   sum((remaining.votes > 0)::int - (remaining.votes - pair.change > 0)::int) AS bills_voted
+            FROM (
+                SELECT politician_id, bill_id, sum(sign) AS change
+                FROM delta
+                GROUP BY politician_id, bill_id
+            ) AS pair
+            CROSS JOIN LATERAL (
+                SELECT count(*) AS votes
+                FROM vote
+                WHERE vote.politician_id = pair.politician_id AND vote.bill_id = pair.bill_id
+            ) AS remaining
+            GROUP BY pair.politician_id
+        )
+        INSERT INTO politician_vote_stats AS stats
+            (politician_id, total_votes, yea_votes, nay_votes, bills_voted)
+        SELECT counts.politician_id, counts.total_votes, counts.yea_votes,
+               counts.nay_votes, bills.bills_voted
+        FROM counts JOIN bills USING (politician_id)
+        WHERE (counts.total_votes, counts.yea_votes, counts.nay_votes, bills.bills_voted) <> (0, 0, 0, 0)
+          -- Votes deleted along with their politician leave nothing to count
+          AND EXISTS (SELECT 1 FROM politician WHERE politician.id = counts.politician_id)
+        ON CONFLICT (politician_id) DO UPDATE SET
+            total_votes = stats.total_votes + excluded.total_votes,
+            yea_votes = stats.yea_votes + excluded.yea_votes,
+            nay_votes = stats.nay_votes + excluded.nay_votes,
+            bills_voted = stats.bills_voted + excluded.bills_voted
+    $sql$, delta);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Truncating vote empties the statistics too
+CREATE OR REPLACE FUNCTION politician_vote_stats_truncate() RETURNS trigger AS $$
+BEGIN
+    TRUNCATE politician_vote_stats;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER vote_stats_insert AFTER INSERT ON vote
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION politician_vote_stats_apply();
+CREATE OR REPLACE TRIGGER vote_stats_update AFTER UPDATE ON vote
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION politician_vote_stats_apply();
+CREATE OR REPLACE TRIGGER vote_stats_delete AFTER DELETE ON vote
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION politician_vote_stats_apply();
+CREATE OR REPLACE TRIGGER vote_stats_truncate AFTER TRUNCATE ON vote
+    FOR EACH STATEMENT EXECUTE FUNCTION politician_vote_stats_truncate();
+
+-- Contribution rollups, maintained by statement-level triggers on political_contribution
+-- (a NULL contributor_type is stored as '' so it can be part of the keys)
+CREATE TABLE IF NOT EXISTS contributor_monthly_totals (
+    contributor_name VARCHAR(255) NOT NULL,
+    contributor_type VARCHAR(100) NOT NULL DEFAULT '',
+    politician_id UUID NOT NULL,
+    month DATE NOT NULL,
+    total_amount NUMERIC(18, 2) NOT NULL DEFAULT 0,
+    contribution_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (contributor_name, contributor_type, politician_id, month)
+);
+CREATE INDEX IF NOT EXISTS ix_contributor_monthly_totals_politician_id_month ON contributor_monthly_totals(politician_id, month);
+CREATE INDEX IF NOT EXISTS ix_contributor_monthly_totals_contributor_type_month ON contributor_monthly_totals(contributor_type, month);
+CREATE INDEX IF NOT EXISTS ix_contributor_monthly_totals_month ON contributor_monthly_totals(month);
+CREATE INDEX IF NOT EXISTS ix_contributor_monthly_totals_empty ON contributor_monthly_totals(contribution_count) WHERE contribution_count = 0;
+
+CREATE TABLE IF NOT EXISTS contributor_totals (
+    contributor_name VARCHAR(255) NOT NULL,
+    contributor_type VARCHAR(100) NOT NULL DEFAULT '',
+    total_amount NUMERIC(18, 2) NOT NULL DEFAULT 0,
+    contribution_count BIGINT NOT NULL DEFAULT 0,
+    politicians_supported BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (contributor_name, contributor_type)
+);
+CREATE INDEX IF NOT EXISTS ix_contributor_totals_total_amount ON contributor_totals(total_amount);
+CREATE INDEX IF NOT EXISTS ix_contributor_totals_empty ON contributor_totals(contribution_count) WHERE contribution_count = 0;
+
+-- Adds the signed deltas of a statement to the monthly buckets, then to the per-contributor totals
+CREATE OR REPLACE FUNCTION contributor_totals_apply() RETURNS trigger AS $$
+DECLARE
+    delta text;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        delta := 'SELECT contributor_name, coalesce(contributor_type, '''') AS contributor_type, '
+              || 'politician_id, contribution_date, amount, 1 AS sign FROM new_rows';
+    ELSIF TG_OP = 'DELETE' THEN
+        delta := 'SELECT contributor_name, coalesce(contributor_type, '''') AS contributor_type, '
+              || 'politician_id, contribution_date, amount, -1 AS sign FROM old_rows';
+    ELSE
+        delta := 'SELECT contributor_name, coalesce(contributor_type, '''') AS contributor_type, '
+              || 'politician_id, contribution_date, amount, -1 AS sign FROM old_rows '
+              || 'UNION ALL SELECT contributor_name, coalesce(contributor_type, ''''), '
+              || 'politician_id, contribution_date, amount, 1 FROM new_rows';
+    END IF;
+
+    EXECUTE format($sql$
+        INSERT INTO contributor_monthly_totals AS totals
+            (contributor_name, contributor_type, politician_id, month, total_amount, contribution_count)
+        SELECT contributor_name, contributor_type, politician_id,
+               date_trunc('month', contribution_date)::date, sum(sign * amount), sum(sign)
+        FROM (%s) AS delta
+        GROUP BY 1, 2, 3, 4
+        HAVING sum(sign) <> 0 OR sum(sign * amount) <> 0
+        ON CONFLICT (contributor_name, contributor_type, politician_id, month) DO UPDATE SET
+            total_amount = totals.total_amount + excluded.total_amount,
+            contribution_count = totals.contribution_count + excluded.contribution_count
+    $sql$, delta);
+    DELETE FROM contributor_monthly_totals WHERE contribution_count = 0;
+
+    EXECUTE format($sql$
+        WITH pair AS (
+            SELECT contributor_name, contributor_type, politician_id,
+                   sum(sign) AS change, sum(sign * amount) AS amount
+            FROM (%s) AS delta
+            GROUP BY contributor_name, contributor_type, politician_id
+        ),
+        changes AS (
+            SELECT pair.contributor_name, pair.contributor_type,
+                   sum(pair.amount) AS total_amount,
+                   sum(pair.change) AS contribution_count,
+                   sum((remaining.contributions > 0)::int
+                       - (remaining.contributions - pair.change > 0)::int) AS politicians_supported
+            FROM pair
+            CROSS JOIN LATERAL (
+                SELECT coalesce(sum(contribution_count), 0) AS contributions
+                FROM contributor_monthly_totals AS bucket
+                WHERE bucket.contributor_name = pair.contributor_name
+                  AND bucket.contributor_type = pair.contributor_type
+                  AND bucket.politician_id = pair.politician_id
+            ) AS remaining
+            GROUP BY pair.contributor_name, pair.contributor_type
+        )
+        INSERT INTO contributor_totals AS totals
+            (contributor_name, contributor_type, total_amount, contribution_count, politicians_supported)
+        SELECT contributor_name, contributor_type, total_amount, contribution_count, politicians_supported
+        FROM changes
+        WHERE (total_amount, contribution_count, politicians_supported) <> (0, 0, 0)
+        ON CONFLICT (contributor_name, contributor_type) DO UPDATE SET
+            total_amount = totals.total_amount + excluded.total_amount,
+            contribution_count = totals.contribution_count + excluded.contribution_count,
+            politicians_supported = totals.politicians_supported + excluded.politicians_supported
+    $sql$, delta);
+    DELETE FROM contributor_totals WHERE contribution_count = 0;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Truncating political_contribution empties the rollups too
+CREATE OR REPLACE FUNCTION contributor_totals_truncate() RETURNS trigger AS $$
+BEGIN
+    TRUNCATE contributor_monthly_totals, contributor_totals;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER contributor_totals_insert AFTER INSERT ON political_contribution
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION contributor_totals_apply();
+CREATE OR REPLACE TRIGGER contributor_totals_update AFTER UPDATE ON political_contribution
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION contributor_totals_apply();
+CREATE OR REPLACE TRIGGER contributor_totals_delete AFTER DELETE ON political_contribution
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION contributor_totals_apply();
+CREATE OR REPLACE TRIGGER contributor_totals_truncate AFTER TRUNCATE ON political_contribution
+    FOR EACH STATEMENT EXECUTE FUNCTION contributor_totals_truncate();
+
+-- When each materialized view was last refreshed (see app/db/matviews.py)
+CREATE TABLE IF NOT EXISTS materialized_view_refresh (
+    view_name VARCHAR(63) PRIMARY KEY,
+    refreshed_at TIMESTAMP WITH TIME ZONE,
+    duration_ms DOUBLE PRECISION,
+    last_error TEXT,
+    last_error_at TIMESTAMP WITH TIME ZONE
+);
+
+-- Contributions per party and month, refreshed CONCURRENTLY by the API workers
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_party_contributions_monthly AS
+SELECT coalesce(politician.party, '') AS party,
+       date_trunc('month', political_contribution.contribution_date)::date AS month,
+       sum(political_contribution.amount) AS total_amount,
+       count(*) AS contribution_count,
+       count(DISTINCT political_contribution.politician_id) AS politicians_supported,
+       count(DISTINCT political_contribution.contributor_name) AS contributors
+FROM political_contribution
+JOIN politician ON politician.id = political_contribution.politician_id
+GROUP BY 1, 2
+WITH DATA;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_mv_party_contributions_monthly ON mv_party_contributions_monthly(party, month);
+CREATE INDEX IF NOT EXISTS ix_mv_party_contributions_monthly_month ON mv_party_contributions_monthly(month);
@@ -72,5 +72,5 @@ BEGIN
         (lula_id, 'Federação Brasil da Esperança', 'Partido', 500000.00, DATE '2023-01-05'),
         (lira_id, 'Associação Brasileira do Agronegócio', 'Associação', 750000.00, DATE '2023-01-10'),
         (tebet_id, 'Confederação Nacional da Indústria', 'Grupo Industrial', 1000000.00, DATE '2023-02-05')
-    ON CONFLICT (id) DO NOTHING;
+    ON CONFLICT (id, contribution_date) DO NOTHING;
 END $$;
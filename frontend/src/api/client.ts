@@ -70,6 +70,8 @@ export interface PaginationParams {
     skip?: number;
     limit?: number;
     page?: number;
+    cursor?: string;
+    sort?: string;
 }
 
 // Type for common filter params
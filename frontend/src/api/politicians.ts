@@ -24,9 +24,16 @@ export interface Politician {
 export interface PoliticianPage {
     items: Politician[];
     total: number;
+    total_exact: boolean;
     page: number;
     size: number;
     pages: number;
+    next_cursor: string | null;
+}
+
+export interface PoliticianBatch {
+    items: Politician[];
+    missing: string[];
 }
 
 export interface PoliticianCreate {
@@ -94,6 +101,20 @@ export const getPolitician = async (id: string): Promise<Politician> => {
     }
 };
 
+export const getPoliticiansByIds = async (
+    ids: string[],
+): Promise<PoliticianBatch> => {
+    try {
+        const response = await apiClient.post<PoliticianBatch>(
+            "/politicians/batch-get",
+            { ids },
+        );
+        return response.data;
+    } catch (error) {
+        throw new Error(handleApiError(error));
+    }
+};
+
 export const getPoliticianWithRelations = async (id: string): Promise<any> => {
     try {
         const response = await apiClient.get<any>(`/politicians/${id}/details`);